@@ -10,9 +10,14 @@ from .api import (
     yaml_file_to_svg_file,
     dict_to_svg,
     dict_to_svg_file,
+    compile_template,
+    render_batch,
     yaml_to_png,
+    yaml_to_png_bytes,
     yaml_to_video,
+    yaml_to_video_bytes,
 )
+from .renderer import Renderer
 
 __all__ = [
     "yaml_to_svg",
@@ -21,6 +26,11 @@ __all__ = [
     "yaml_file_to_svg_file",
     "dict_to_svg",
     "dict_to_svg_file",
+    "compile_template",
+    "render_batch",
     "yaml_to_png",
+    "yaml_to_png_bytes",
     "yaml_to_video",
+    "yaml_to_video_bytes",
+    "Renderer",
 ]
\ No newline at end of file
@@ -0,0 +1,194 @@
+"""Asyncio API for SVG, PNG and video generation.
+
+Async counterparts of the functions in `api`, for use from asyncio
+applications. SVG generation runs in a worker thread, so the event loop
+stays responsive. PNG and video rendering uses Playwright's async API on
+the loop's shared browser pool. Concurrent renders on one loop therefore
+share a single warm browser, and at most `browser_pool.size` of them use
+it at once.
+
+Example usage:
+    import asyncio
+    from mcp_svg_animator import aio
+
+    async def main():
+        await aio.gather_render(
+            (aio.yaml_to_png(spec, f"out/{i}.png") for i, spec in enumerate(specs)),
+            limit=8,
+        )
+        await aio.shutdown()
+
+    asyncio.run(main())
+"""
+
+import asyncio
+from pathlib import Path
+from typing import Awaitable, Iterable, TypeVar, Union
+
+from .generators.yaml_loader import create_diagram_from_yaml
+
+T = TypeVar("T")
+
+
+async def yaml_to_svg(yaml_spec: str, backend: str = "drawsvg") -> str:
+    """Generate SVG content from a YAML specification string.
+
+    Args:
+        yaml_spec: YAML string containing the diagram specification.
+        backend: SVG backend, "drawsvg" (default) or "fast".
+
+    Returns:
+        SVG content as a string.
+
+    Raises:
+        ValueError: If the specification is invalid.
+        yaml.YAMLError: If the YAML is malformed.
+    """
+    return await asyncio.to_thread(create_diagram_from_yaml, yaml_spec, backend)
+
+
+async def yaml_to_png(
+    yaml_spec: str,
+    output_path: Union[str, Path],
+    width: int | None = None,
+    height: int | None = None,
+    backend: str = "drawsvg",
+) -> Path:
+    """Generate a PNG image from a YAML specification.
+
+    Args:
+        yaml_spec: YAML string containing the diagram specification.
+        output_path: Path where the PNG file will be written.
+        width: Image width (defaults to SVG width or 800).
+        height: Image height (defaults to SVG height or 600).
+        backend: SVG backend, "drawsvg" (default) or "fast".
+
+    Returns:
+        Path object pointing to the created PNG file.
+    """
+    from .generators.png_generator import create_png_from_svg_async
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    svg_content = await yaml_to_svg(yaml_spec, backend)
+    await create_png_from_svg_async(svg_content, str(output_path), width=width, height=height)
+    return output_path
+
+
+async def yaml_to_png_bytes(
+    yaml_spec: str,
+    width: int | None = None,
+    height: int | None = None,
+    backend: str = "drawsvg",
+) -> bytes:
+    """Render a YAML specification to PNG data without writing a file.
+
+    Args:
+        yaml_spec: YAML string containing the diagram specification.
+        width: Image width (defaults to SVG width or 800).
+        height: Image height (defaults to SVG height or 600).
+        backend: SVG backend, "drawsvg" (default) or "fast".
+
+    Returns:
+        The PNG image.
+    """
+    from .generators.png_generator import render_png_from_svg_async
+
+    svg_content = await yaml_to_svg(yaml_spec, backend)
+    return await render_png_from_svg_async(svg_content, width=width, height=height)
+
+
+async def yaml_to_video(
+    yaml_spec: str,
+    output_path: Union[str, Path],
+    duration_ms: int = 3000,
+    fps: int | None = None,
+    workers: int = 1,
+    backend: str = "drawsvg",
+) -> Path:
+    """Generate a video from an animated YAML specification.
+
+    Args:
+        yaml_spec: YAML string containing the animated diagram specification.
+        output_path: Path where the .webm video will be written.
+        duration_ms: Duration of the video in milliseconds (default 3000).
+        fps: If given, step through the animation timeline at this frame
+            rate instead of recording in real time. Requires ffmpeg.
+        workers: With `fps`, capture this many chunks of frames in parallel.
+        backend: SVG backend, "drawsvg" (default) or "fast".
+
+    Returns:
+        Path object pointing to the created video file.
+    """
+    from .generators.video_generator import create_video_from_svg_async
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    svg_content = await yaml_to_svg(yaml_spec, backend)
+    await create_video_from_svg_async(
+        svg_content,
+        str(output_path),
+        duration_ms=duration_ms,
+        fps=fps,
+        workers=workers,
+    )
+    return output_path
+
+
+async def gather_render(
+    renders: Iterable[Awaitable[T]],
+    limit: int | None = None,
+    return_exceptions: bool = False,
+) -> list[Union[T, BaseException]]:
+    """Run render coroutines concurrently, at most `limit` at a time.
+
+    Args:
+        renders: Awaitables such as `yaml_to_png(...)` calls.
+        limit: Maximum number of renders in progress at once (defaults to
+            the `browser_pool.size` setting).
+        return_exceptions: If true, a failed render's exception is returned
+            in its place; otherwise the first failure is raised and the
+            remaining renders are cancelled.
+
+    Returns:
+        The results, in the order of `renders`.
+
+    Raises:
+        ValueError: If limit is less than 1.
+    """
+    if limit is None:
+        from .config import get_browser_pool_settings
+
+        concurrency = int(get_browser_pool_settings()["size"])
+    else:
+        concurrency = limit
+    if concurrency < 1:
+        raise ValueError("gather_render limit must be at least 1")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(render: Awaitable[T]) -> T:
+        try:
+            async with semaphore:
+                return await render
+        finally:
+            # Close renders cancelled before they started, so they don't
+            # warn about never being awaited
+            if asyncio.iscoroutine(render):
+                render.close()
+
+    tasks = [asyncio.ensure_future(bounded(render)) for render in renders]
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def shutdown() -> None:
+    """Close the running event loop's shared browser, if one was started."""
+    from .generators.browser_pool import shutdown_async_browser_pool
+
+    await shutdown_async_browser_pool()
+
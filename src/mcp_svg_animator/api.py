@@ -28,16 +28,38 @@ Example usage:
 
     svg_content = yaml_file_to_svg("diagram.yaml")
     yaml_file_to_svg_file("diagram.yaml", "output.svg")
+
+    # Parse a template once and render it with different parameters
+    from mcp_svg_animator.api import compile_template
+
+    template = compile_template('''
+    elements:
+      - type: text
+        x: 10
+        y: 20
+        text: "${label}"
+    ''')
+    svg_content = template.render({"label": "Hello"})
+
+    # Render many diagrams in parallel
+    from mcp_svg_animator.api import render_batch
+
+    results = render_batch(list(Path("diagrams").glob("*.yaml")), output_dir="out")
 """
 
 from pathlib import Path
-from typing import Union
+from typing import Callable, Iterable, Union
 
-from .generators.yaml_loader import create_diagram_from_yaml
+from .batch import BatchItem, BatchResult
+from .batch import render_batch as _render_batch
+from .generators.yaml_loader import create_diagram_from_yaml, write_diagram_from_yaml
 from .generators.animations import create_animated_diagram
+from .generators.svg_emitter import open_replacing, stream_diagram
+from .generators.templates import DiagramTemplate
+from .generators.templates import compile_template as _compile_template
 
 
-def yaml_to_svg(yaml_spec: str) -> str:
+def yaml_to_svg(yaml_spec: str, backend: str = "drawsvg") -> str:
     """Generate SVG content from a YAML specification string.
 
     Args:
@@ -48,6 +70,8 @@ def yaml_to_svg(yaml_spec: str) -> str:
             - definitions: Optional dict of reusable element definitions
             - libraries: Optional list of library file paths to import
             - elements: List of shape specifications
+        backend: SVG backend. "drawsvg" (default) builds the document with
+            drawsvg; "fast" writes equivalent markup directly.
 
     Returns:
         SVG content as a string.
@@ -68,18 +92,23 @@ def yaml_to_svg(yaml_spec: str) -> str:
         ...     fill: red
         ... ''')
     """
-    return create_diagram_from_yaml(yaml_spec)
+    return create_diagram_from_yaml(yaml_spec, backend)
 
 
 def yaml_to_svg_file(
     yaml_spec: str,
     output_path: Union[str, Path],
+    stream: bool = False,
 ) -> Path:
     """Generate SVG from YAML and save to a file.
 
     Args:
         yaml_spec: YAML string containing the diagram specification.
         output_path: Path where the SVG file will be written.
+        stream: If True, write each element to the file as it is generated,
+            with the fast backend, instead of building the whole document in
+            memory first. The file is only replaced once it is complete. Use
+            this for very large diagrams.
 
     Returns:
         Path object pointing to the created SVG file.
@@ -103,6 +132,10 @@ def yaml_to_svg_file(
     """
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    if stream:
+        with open_replacing(output_path) as out:
+            write_diagram_from_yaml(yaml_spec, out)
+        return output_path
     svg_content = create_diagram_from_yaml(yaml_spec)
     output_path.write_text(svg_content)
     return output_path
@@ -133,12 +166,16 @@ def yaml_file_to_svg(yaml_path: Union[str, Path]) -> str:
 def yaml_file_to_svg_file(
     yaml_path: Union[str, Path],
     output_path: Union[str, Path],
+    stream: bool = False,
 ) -> Path:
     """Load a YAML file and save the generated SVG to a file.
 
     Args:
         yaml_path: Path to the YAML specification file.
         output_path: Path where the SVG file will be written.
+        stream: If True, write each element to the file as it is generated,
+            with the fast backend, instead of building the whole document in
+            memory first. The file is only replaced once it is complete.
 
     Returns:
         Path object pointing to the created SVG file.
@@ -156,12 +193,16 @@ def yaml_file_to_svg_file(
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     yaml_content = yaml_path.read_text()
+    if stream:
+        with open_replacing(output_path) as out:
+            write_diagram_from_yaml(yaml_content, out)
+        return output_path
     svg_content = create_diagram_from_yaml(yaml_content)
     output_path.write_text(svg_content)
     return output_path
 
 
-def dict_to_svg(spec: dict) -> str:
+def dict_to_svg(spec: dict, backend: str = "drawsvg") -> str:
     """Generate SVG content from a Python dictionary specification.
 
     This is useful when you want to build the specification programmatically
@@ -173,6 +214,7 @@ def dict_to_svg(spec: dict) -> str:
             - width: Canvas width (default 400)
             - height: Canvas height (default 300)
             - elements: List of shape specifications
+        backend: SVG backend, "drawsvg" (default) or "fast".
 
     Returns:
         SVG content as a string.
@@ -186,18 +228,22 @@ def dict_to_svg(spec: dict) -> str:
         ...     ]
         ... })
     """
-    return create_animated_diagram(spec)
+    return create_animated_diagram(spec, backend)
 
 
 def dict_to_svg_file(
     spec: dict,
     output_path: Union[str, Path],
+    stream: bool = False,
 ) -> Path:
     """Generate SVG from a dictionary and save to a file.
 
     Args:
         spec: Dictionary containing the diagram specification.
         output_path: Path where the SVG file will be written.
+        stream: If True, write each element to the file as it is generated,
+            with the fast backend, instead of building the whole document in
+            memory first. The file is only replaced once it is complete.
 
     Returns:
         Path object pointing to the created SVG file.
@@ -213,16 +259,100 @@ def dict_to_svg_file(
     """
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    if stream:
+        with open_replacing(output_path) as out:
+            stream_diagram(spec, out)
+        return output_path
     svg_content = create_animated_diagram(spec)
     output_path.write_text(svg_content)
     return output_path
 
 
+def compile_template(yaml_spec: str, backend: str = "drawsvg") -> DiagramTemplate:
+    """Compile a YAML template for rendering many variants.
+
+    String values in the specification may contain `${name}` placeholders.
+    A value that is exactly one placeholder takes the parameter's value as
+    is (so numbers stay numbers); otherwise the placeholder is replaced by
+    the parameter's text. An optional top-level `parameters` mapping gives
+    defaults.
+
+    The YAML is parsed, definitions are expanded and elements without
+    placeholders are validated once; each render substitutes the
+    parameters, resolves positions, validates the elements that changed
+    and generates the SVG. Edited libraries are picked up on the next render.
+
+    Args:
+        yaml_spec: YAML string containing the template.
+        backend: SVG backend, "drawsvg" (default) or "fast".
+
+    Returns:
+        A DiagramTemplate. Call its render(params) method to get SVG content.
+
+    Raises:
+        ValueError: If a definition is unknown or the backend is invalid.
+        yaml.YAMLError: If the YAML is malformed.
+
+    Example:
+        >>> template = compile_template('''
+        ... parameters:
+        ...   color: red
+        ... elements:
+        ...   - type: circle
+        ...     cx: "${x}"
+        ...     cy: 50
+        ...     r: 20
+        ...     fill: "${color}"
+        ... ''')
+        >>> svg = template.render({"x": 100, "color": "blue"})
+    """
+    return _compile_template(yaml_spec, backend)
+
+
+def render_batch(
+    items: Iterable[BatchItem],
+    output_dir: Union[str, Path, None] = None,
+    workers: int | None = None,
+    backend: str = "drawsvg",
+    chunksize: int | None = None,
+    progress: Callable[[BatchResult, int, int], None] | None = None,
+) -> list[BatchResult]:
+    """Render many diagrams in parallel across worker processes.
+
+    Args:
+        items: YAML strings, paths to YAML files, or spec dicts.
+        output_dir: If given, each SVG is written to this directory and the
+            result records its path; otherwise the result holds the SVG.
+        workers: Number of worker processes (default: CPU count).
+        backend: SVG backend, "drawsvg" (default) or "fast".
+        chunksize: Items sent to a worker at a time (default: about four
+            chunks per worker).
+        progress: Called after each result with (result, done, total).
+
+    Returns:
+        One result per item, in input order. A failed item has `ok` False
+        and its error in `error`; the other items are still rendered.
+
+    Example:
+        >>> results = render_batch([Path("a.yaml"), Path("b.yaml")], "out")
+        >>> [r.output_path for r in results if r.ok]
+    """
+    return _render_batch(
+        items,
+        output_dir=output_dir,
+        workers=workers,
+        chunksize=chunksize,
+        backend=backend,
+        progress=progress,
+    )
+
+
 def yaml_to_png(
     yaml_spec: str,
     output_path: Union[str, Path],
     width: int | None = None,
     height: int | None = None,
+    reuse_page: bool = False,
 ) -> Path:
     """Generate a PNG image from a YAML specification.
 
@@ -234,6 +364,8 @@ def yaml_to_png(
         output_path: Path where the PNG file will be written.
         width: Image width (defaults to SVG width or 800).
         height: Image height (defaults to SVG height or 600).
+        reuse_page: Render into a page kept open on the shared browser,
+            swapping in only the SVG. Faster when rendering many images.
 
     Returns:
         Path object pointing to the created PNG file.
@@ -255,14 +387,39 @@ def yaml_to_png(
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     svg_content = create_diagram_from_yaml(yaml_spec)
-    create_png_from_svg(svg_content, str(output_path), width=width, height=height)
+    create_png_from_svg(
+        svg_content, str(output_path), width=width, height=height, reuse_page=reuse_page
+    )
     return output_path
 
 
+def yaml_to_png_bytes(
+    yaml_spec: str,
+    width: int | None = None,
+    height: int | None = None,
+) -> bytes:
+    """Render a YAML specification to PNG data without writing a file.
+
+    Args:
+        yaml_spec: YAML string containing the diagram specification.
+        width: Image width (defaults to SVG width or 800).
+        height: Image height (defaults to SVG height or 600).
+
+    Returns:
+        The PNG image.
+    """
+    from .generators.png_generator import render_png_from_svg
+
+    svg_content = create_diagram_from_yaml(yaml_spec)
+    return render_png_from_svg(svg_content, width=width, height=height)
+
+
 def yaml_to_video(
     yaml_spec: str,
     output_path: Union[str, Path],
     duration_ms: int = 3000,
+    fps: int | None = None,
+    workers: int = 1,
 ) -> Path:
     """Generate a video from an animated YAML specification.
 
@@ -273,6 +430,11 @@ def yaml_to_video(
         yaml_spec: YAML string containing the animated diagram specification.
         output_path: Path where the .webm video will be written.
         duration_ms: Duration of the video in milliseconds (default 3000).
+        fps: If given, step through the animation timeline at this frame
+            rate instead of recording in real time. Output is deterministic.
+            Requires ffmpeg.
+        workers: With `fps`, split the frames into this many chunks and
+            capture them in parallel (bounded by the browser pool size).
 
     Returns:
         Path object pointing to the created video file.
@@ -299,5 +461,37 @@ def yaml_to_video(
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     svg_content = create_diagram_from_yaml(yaml_spec)
-    create_video_from_svg(svg_content, str(output_path), duration_ms=duration_ms)
+    create_video_from_svg(
+        svg_content,
+        str(output_path),
+        duration_ms=duration_ms,
+        fps=fps,
+        workers=workers,
+    )
     return output_path
+
+
+def yaml_to_video_bytes(
+    yaml_spec: str,
+    duration_ms: int = 3000,
+    fps: int | None = None,
+    workers: int = 1,
+) -> bytes:
+    """Render an animated YAML specification to .webm video data.
+
+    Args:
+        yaml_spec: YAML string containing the animated diagram specification.
+        duration_ms: Duration of the video in milliseconds (default 3000).
+        fps: If given, step through the animation timeline at this frame
+            rate instead of recording in real time. Requires ffmpeg.
+        workers: With `fps`, capture this many chunks of frames in parallel.
+
+    Returns:
+        The .webm video.
+    """
+    from .generators.video_generator import render_video_from_svg
+
+    svg_content = create_diagram_from_yaml(yaml_spec)
+    return render_video_from_svg(
+        svg_content, duration_ms=duration_ms, fps=fps, workers=workers
+    )
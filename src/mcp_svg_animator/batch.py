@@ -0,0 +1,218 @@
+"""Render many diagrams at once across a pool of worker processes.
+
+Example usage:
+    from mcp_svg_animator.batch import render_batch
+
+    results = render_batch(Path("diagrams").glob("*.yaml"), output_dir="out")
+    failed = [r for r in results if not r.ok]
+
+Or from the command line:
+    svg-animator-batch diagrams/*.yaml --output-dir out --workers 8
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Union
+
+BatchItem = Union[str, Path, dict]
+
+# (index, item, output path or None, backend)
+_Task = tuple[int, BatchItem, Union[str, None], str]
+
+
+class BatchResult:
+    """The outcome of rendering one item of a batch.
+
+    Attributes:
+        index: Position of the item in the batch.
+        source: The item's file path, or "<spec N>" for YAML strings and dicts.
+        svg: SVG content, when no output directory was given.
+        output_path: Path of the written SVG, when an output directory was given.
+        error: "ExceptionType: message" if rendering failed, else None.
+    """
+
+    __slots__ = ("index", "source", "svg", "output_path", "error")
+
+    def __init__(
+        self,
+        index: int,
+        source: str,
+        svg: str | None = None,
+        output_path: Path | None = None,
+        error: str | None = None,
+    ):
+        self.index = index
+        self.source = source
+        self.svg = svg
+        self.output_path = output_path
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item rendered successfully."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"BatchResult({self.index}, {self.source!r}, {status})"
+
+
+def iter_render_batch(
+    items: Iterable[BatchItem],
+    output_dir: str | Path | None = None,
+    workers: int | None = None,
+    chunksize: int | None = None,
+    backend: str = "drawsvg",
+) -> Iterator[BatchResult]:
+    """Render diagrams in parallel, yielding results in input order as they finish.
+
+    Args:
+        items: YAML strings, paths to YAML files, or spec dicts.
+        output_dir: If given, each SVG is written here (named after its
+            YAML file, or "diagram-N.svg") instead of being returned.
+        workers: Number of worker processes (default: CPU count). With 1,
+            items are rendered in this process.
+        chunksize: Items sent to a worker at a time (default: spread the
+            batch over about four chunks per worker).
+        backend: SVG backend, "drawsvg" (default) or "fast".
+
+    Yields:
+        A BatchResult per item, in the order of `items`. Failures are
+        reported in the result rather than raised.
+    """
+    tasks = _tasks(list(items), output_dir, backend)
+    if output_dir is not None:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(tasks))
+    if workers <= 1:
+        for task in tasks:
+            yield _render_task(task)
+        return
+
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_render_task, tasks, chunksize=chunksize)
+
+
+def render_batch(
+    items: Iterable[BatchItem],
+    output_dir: str | Path | None = None,
+    workers: int | None = None,
+    chunksize: int | None = None,
+    backend: str = "drawsvg",
+    progress: Callable[[BatchResult, int, int], None] | None = None,
+) -> list[BatchResult]:
+    """Render many diagrams in parallel.
+
+    Args:
+        items: YAML strings, paths to YAML files, or spec dicts.
+        output_dir: If given, each SVG is written here instead of returned.
+        workers: Number of worker processes (default: CPU count).
+        chunksize: Items sent to a worker at a time.
+        backend: SVG backend, "drawsvg" (default) or "fast".
+        progress: Called after each result with (result, done, total).
+
+    Returns:
+        A BatchResult per item, in the order of `items`.
+    """
+    items = list(items)
+    results = []
+    for result in iter_render_batch(items, output_dir, workers, chunksize, backend):
+        results.append(result)
+        if progress is not None:
+            progress(result, len(results), len(items))
+    return results
+
+
+def _tasks(items: list[BatchItem], output_dir: str | Path | None, backend: str) -> list[_Task]:
+    """Pair each item with its output path, keeping output names unique."""
+    tasks: list[_Task] = []
+    used: set[str] = set()
+    for index, item in enumerate(items):
+        output_path = None
+        if output_dir is not None:
+            name = f"{item.stem}.svg" if isinstance(item, Path) else f"diagram-{index}.svg"
+            if name in used:
+                stem = Path(name).stem
+                suffix = index
+                while (name := f"{stem}-{suffix}.svg") in used:
+                    suffix += 1
+            used.add(name)
+            output_path = str(Path(output_dir) / name)
+        tasks.append((index, item, output_path, backend))
+    return tasks
+
+
+def _render_task(task: _Task) -> BatchResult:
+    """Render one item; runs in a worker process."""
+    from .generators.animations import create_animated_diagram
+    from .generators.yaml_loader import create_diagram_from_yaml
+
+    index, item, output_path, backend = task
+    source = str(item) if isinstance(item, Path) else f"<spec {index}>"
+    try:
+        if isinstance(item, Path):
+            svg_content = create_diagram_from_yaml(item.read_text(), backend)
+        elif isinstance(item, dict):
+            svg_content = create_animated_diagram(item, backend)
+        else:
+            svg_content = create_diagram_from_yaml(item, backend)
+        if output_path is None:
+            return BatchResult(index, source, svg=svg_content)
+        Path(output_path).write_text(svg_content)
+        return BatchResult(index, source, output_path=Path(output_path))
+    except Exception as e:
+        return BatchResult(index, source, error=f"{type(e).__name__}: {e}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point: render YAML files to SVG files in parallel."""
+    parser = argparse.ArgumentParser(
+        prog="svg-animator-batch",
+        description="Render many YAML diagram specifications to SVG files in parallel.",
+    )
+    parser.add_argument("paths", nargs="+", type=Path, help="YAML files to render")
+    parser.add_argument(
+        "-o", "--output-dir", type=Path, default=Path("."),
+        help="directory for the SVG files (default: current directory)",
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=None,
+        help="number of worker processes (default: CPU count)",
+    )
+    parser.add_argument("--chunksize", type=int, default=None, help="items per worker task")
+    parser.add_argument(
+        "--backend", choices=["drawsvg", "fast"], default="drawsvg", help="SVG backend",
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="only report failures")
+    args = parser.parse_args(argv)
+
+    def report(result: BatchResult, done: int, total: int) -> None:
+        if not result.ok:
+            print(f"[{done}/{total}] {result.source}: {result.error}", file=sys.stderr)
+        elif not args.quiet:
+            print(f"[{done}/{total}] {result.source} -> {result.output_path}", file=sys.stderr)
+
+    results = render_batch(
+        args.paths,
+        output_dir=args.output_dir,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        backend=args.backend,
+        progress=report,
+    )
+    failures = sum(1 for result in results if not result.ok)
+    if failures:
+        print(f"{failures} of {len(results)} diagrams failed", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,10 @@
 """Configuration for file output permissions."""
 
 import fnmatch
+import os
 from pathlib import Path
 
-import yaml
+from .spec_parser import safe_load
 
 _config_cache: dict | None = None
 
@@ -13,6 +14,12 @@ def _get_config_path() -> Path:
     return Path.home() / ".config" / "mcp-svg-animator" / "config.yaml"
 
 
+def _default_cache_directory() -> str:
+    """The render cache directory under $XDG_CACHE_HOME (default ~/.cache)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or "~/.cache"
+    return os.path.join(cache_home, "mcp-svg-animator", "renders")
+
+
 def load_config() -> dict:
     """Load configuration from file.
 
@@ -30,7 +37,7 @@ def load_config() -> dict:
         return _config_cache
 
     content = config_path.read_text()
-    loaded = yaml.safe_load(content)
+    loaded = safe_load(content)
     if not isinstance(loaded, dict):
         loaded = {}
 
@@ -44,6 +51,52 @@ def load_config() -> dict:
     return _config_cache
 
 
+def get_browser_pool_settings() -> dict:
+    """Get browser pool settings from the configuration file.
+
+    Returns:
+        Dict with 'size' (number of warm browsers) and 'max_renders'
+        (renders before a browser is recycled), using defaults for
+        anything not configured.
+    """
+    settings = load_config().get("browser_pool") or {}
+    return {
+        "size": int(settings.get("size", 2)),
+        "max_renders": int(settings.get("max_renders", 100)),
+    }
+
+
+def get_render_cache_settings() -> dict:
+    """Get render cache settings from the configuration file.
+
+    Returns:
+        Dict with 'enabled', 'directory' (on-disk store for PNG and video
+        output), 'max_bytes' (size limit of that store) and 'svg_max_bytes'
+        (size limit of the SVG strings kept in memory), using defaults for
+        anything not configured.
+    """
+    settings = load_config().get("render_cache") or {}
+    return {
+        "enabled": bool(settings.get("enabled", True)),
+        "directory": str(settings.get("directory") or _default_cache_directory()),
+        "max_bytes": int(settings.get("max_bytes", 512 * 1024 * 1024)),
+        "svg_max_bytes": int(settings.get("svg_max_bytes", 64 * 1024 * 1024)),
+    }
+
+
+def get_video_settings() -> dict:
+    """Get video rendering settings from the configuration file.
+
+    Returns:
+        Dict with 'scratch_dir', the directory in which each video job gets
+        a private working directory, or None to use the output file's
+        directory (so finished videos are renamed, not copied, into place).
+    """
+    settings = load_config().get("video") or {}
+    scratch_dir = settings.get("scratch_dir")
+    return {"scratch_dir": str(scratch_dir) if scratch_dir else None}
+
+
 def clear_config_cache() -> None:
     """Clear the cached configuration. Useful for testing."""
     global _config_cache
@@ -1,6 +1,9 @@
 """Animated SVG diagram generator using drawsvg."""
 
-from typing import cast
+import hashlib
+import re
+from functools import lru_cache
+from typing import Callable, cast
 
 import drawsvg as draw
 
@@ -16,9 +19,17 @@ from .specs.rectangle_spec import RectangleSpec
 from .specs.text_spec import TextSpec
 from .specs.transform_animation_spec import TransformAnimationSpec
 from .specs.connection_spec import ConnectionSpec
+from .specs.validation import validate_elements
 
 
-def create_animated_diagram(arguments: dict) -> str:
+BACKENDS = ("drawsvg", "fast")
+
+
+def create_animated_diagram(
+    arguments: dict,
+    backend: str = "drawsvg",
+    validate: Callable[[list[dict]], list] = validate_elements,
+) -> str:
     """Create an animated SVG diagram.
 
     Args:
@@ -27,10 +38,26 @@ def create_animated_diagram(arguments: dict) -> str:
             - height: Canvas height (default 300)
             - elements: List of shape specifications. Position attributes
                 can use relative references like "element_id.x + 70".
+        backend: "drawsvg" builds a drawsvg object tree and serializes it;
+            "fast" writes equivalent markup straight from the specs, which
+            is much cheaper for diagrams with many elements.
+        validate: Turns the resolved element dicts into element specs, as
+            validate_elements does. Compiled templates pass one that reuses
+            the specs of their static elements.
 
     Returns:
         SVG content as a string.
+
+    Raises:
+        ValueError: If the backend is unknown or an element is invalid.
     """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+    if backend == "fast":
+        from .svg_emitter import emit_diagram
+
+        return emit_diagram(arguments, validate)
+
     width = arguments.get("width", 400)
     height = arguments.get("height", 300)
     elements = arguments.get("elements", [])
@@ -40,9 +67,8 @@ def create_animated_diagram(arguments: dict) -> str:
 
     d = draw.Drawing(width, height)
 
-    for element in resolved_elements:
-        shape = _create_element(element)
-        d.append(shape)
+    for spec in validate(resolved_elements):
+        d.append(_create_element(spec))
 
     return cast(str, d.as_svg())
 
@@ -90,9 +116,28 @@ def _create_rectangle(spec: RectangleSpec):
     return draw.Rectangle(spec.x, spec.y, spec.width, spec.height, **kwargs)
 
 
+def _marker_id(shape: str, color: str) -> str:
+    """Get the id shared by all markers of one shape and color.
+
+    Colors that aren't valid in an id (e.g. "#333") are stripped down and
+    suffixed with a short hash, so distinct colors never share an id.
+    """
+    safe = re.sub(r"[^A-Za-z0-9_-]", "", color)
+    if safe != color:
+        safe = f"{safe}-{hashlib.sha1(color.encode()).hexdigest()[:8]}"
+    return f"{shape}-{safe}"
+
+
+@lru_cache(maxsize=256)
 def _create_arrow_marker(color: str = "black"):
-    """Create an arrow marker for line endings."""
-    arrow = draw.Marker(-0.1, -0.5, 0.9, 0.5, scale=4, orient="auto", id="arrow")
+    """Create an arrow marker for line endings.
+
+    Markers are cached per color, and drawsvg writes each marker object
+    only once, so every arrow of a color shares one definition.
+    """
+    arrow = draw.Marker(
+        -0.1, -0.5, 0.9, 0.5, scale=4, orient="auto", id=_marker_id("arrow", color)
+    )
     arrow.append(draw.Lines(-0.1, -0.5, -0.1, 0.5, 0.9, 0, fill=color, close=True))
     return arrow
 
@@ -106,7 +151,8 @@ def _create_line(spec: LineSpec):
     return draw.Line(spec.x1, spec.y1, spec.x2, spec.y2, **kwargs)
 
 
-def _create_text(spec: TextSpec):
+def _build_text_kwargs(spec: TextSpec) -> dict:
+    """Build kwargs dict for text attributes."""
     kwargs: dict = {"fill": spec.fill}
     if spec.text_anchor:
         kwargs["text_anchor"] = spec.text_anchor
@@ -120,6 +166,11 @@ def _create_text(spec: TextSpec):
         kwargs["dominant_baseline"] = spec.dominant_baseline
     if spec.transform:
         kwargs["transform"] = spec.transform
+    return kwargs
+
+
+def _create_text(spec: TextSpec):
+    kwargs = _build_text_kwargs(spec)
 
     text_element = draw.Text(spec.text, spec.font_size, spec.x, spec.y, **kwargs)
 
@@ -127,19 +178,7 @@ def _create_text(spec: TextSpec):
     if spec.background:
         group = draw.Group()
 
-        # Create background rectangle
-        # Approximate text dimensions based on font size and text length
-        padding = spec.background_padding
-        char_width = spec.font_size * 0.6  # Approximate character width
-        text_width = len(spec.text) * char_width
-        text_height = spec.font_size
-
-        # Position rect behind text (text y is baseline, rect needs top-left)
-        rect_x = spec.x - padding
-        rect_y = spec.y - text_height + padding / 2
-        rect_width = text_width + 2 * padding
-        rect_height = text_height + padding
-
+        rect_x, rect_y, rect_width, rect_height = spec.background_box()
         background_rect = draw.Rectangle(
             rect_x, rect_y, rect_width, rect_height,
             fill=spec.background, stroke="none"
@@ -156,12 +195,8 @@ def _create_path(spec: PathSpec):
     return draw.Path(d=spec.get_path_data(), **kwargs)
 
 
-def _create_connection(spec: ConnectionSpec, resolved_dict: dict):
-    """Create a connection element as a line between two elements.
-
-    The resolved_dict contains x1, y1, x2, y2 coordinates calculated
-    by resolve_positions from the centers of the from/to elements.
-    """
+def _build_connection_kwargs(spec: ConnectionSpec) -> dict:
+    """Build kwargs dict for connection line attributes (excluding markers)."""
     kwargs: dict = {
         "stroke": spec.stroke,
         "stroke_width": spec.stroke_width,
@@ -172,25 +207,39 @@ def _create_connection(spec: ConnectionSpec, resolved_dict: dict):
         kwargs["stroke_dasharray"] = spec.stroke_dasharray
     if spec.stroke_linecap:
         kwargs["stroke_linecap"] = spec.stroke_linecap
+    return kwargs
+
+
+def _connection_endpoints(spec: ConnectionSpec) -> tuple[float, float, float, float]:
+    """Get the x1, y1, x2, y2 coordinates added by resolve_positions."""
+    if spec.x1 is None or spec.y1 is None or spec.x2 is None or spec.y2 is None:
+        raise ValueError(
+            f"Connection from {spec.from_id} to {spec.to_id} has unresolved endpoints"
+        )
+    return spec.x1, spec.y1, spec.x2, spec.y2
+
+
+def _create_connection(spec: ConnectionSpec):
+    """Create a connection element as a line between two elements.
+
+    The x1, y1, x2, y2 coordinates are calculated by resolve_positions
+    from the centers of the from/to elements.
+    """
+    kwargs = _build_connection_kwargs(spec)
     if spec.marker_end == "arrow":
         kwargs["marker_end"] = _create_arrow_marker(spec.stroke)
 
-    # Use coordinates from resolved dict (added by resolve_positions)
-    x1 = resolved_dict["x1"]
-    y1 = resolved_dict["y1"]
-    x2 = resolved_dict["x2"]
-    y2 = resolved_dict["y2"]
-
-    return draw.Line(x1, y1, x2, y2, **kwargs)
+    return draw.Line(*_connection_endpoints(spec), **kwargs)
 
 
 _ELEMENT_CREATORS = {
-    "circle": (CircleSpec, _create_circle),
-    "ellipse": (EllipseSpec, _create_ellipse),
-    "rectangle": (RectangleSpec, _create_rectangle),
-    "line": (LineSpec, _create_line),
-    "text": (TextSpec, _create_text),
-    "path": (PathSpec, _create_path),
+    "circle": _create_circle,
+    "ellipse": _create_ellipse,
+    "rectangle": _create_rectangle,
+    "line": _create_line,
+    "text": _create_text,
+    "path": _create_path,
+    "connection": _create_connection,
 }
 
 
@@ -215,9 +264,8 @@ def _create_group(spec: GroupSpec):
 
     group = draw.Group(**kwargs)
 
-    for child_dict in spec.elements:
-        child = _create_element(child_dict)
-        group.append(child)
+    for child_spec in spec.elements:
+        group.append(_create_element(child_spec))
 
     # Apply transform animations
     for anim in spec.transform_animations:
@@ -228,6 +276,11 @@ def _create_group(spec: GroupSpec):
 
 def _create_transform_animation(spec: TransformAnimationSpec):
     """Create an animateTransform element."""
+    return draw.Raw(_transform_animation_markup(spec))
+
+
+def _transform_animation_markup(spec: TransformAnimationSpec) -> str:
+    """Build the markup for an animateTransform element."""
     attrs = [
         'attributeName="transform"',
         f'type="{spec.type}"',
@@ -244,35 +297,16 @@ def _create_transform_animation(spec: TransformAnimationSpec):
     if spec.additive:
         attrs.append(f'additive="{spec.additive}"')
 
-    return draw.Raw(f'<animateTransform {" ".join(attrs)}/>')
-
+    return f'<animateTransform {" ".join(attrs)}/>'
 
-def _create_element(spec_dict: dict):
-    """Create a single SVG element from a specification."""
-    element_type = spec_dict.get("type")
-    if element_type is None:
-        raise ValueError("Element spec missing 'type' key")
 
+def _create_element(spec):
+    """Create a single SVG element from a validated specification."""
     # Handle groups specially due to recursive nature
-    if element_type == "group":
-        spec = GroupSpec.model_validate(spec_dict)
+    if isinstance(spec, GroupSpec):
         return _create_group(spec)
 
-    # Handle connections specially - they need the resolved dict for coordinates
-    if element_type == "connection":
-        spec = ConnectionSpec.model_validate(spec_dict)
-        element = _create_connection(spec, spec_dict)
-        if spec.animations:
-            _apply_animations(element, spec.animations)
-        return element
-
-    creator_info = _ELEMENT_CREATORS.get(element_type)
-    if creator_info is None:
-        raise ValueError(f"Unknown element type: {element_type}")
-
-    spec_class, creator = creator_info
-    spec = spec_class.model_validate(spec_dict)
-    element = creator(spec)
+    element = _ELEMENT_CREATORS[spec.type](spec)
 
     if spec.animations:
         _apply_animations(element, spec.animations)
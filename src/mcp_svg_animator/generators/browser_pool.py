@@ -0,0 +1,364 @@
+"""Pool of warm Chromium browsers shared by the PNG and video generators."""
+
+import asyncio
+import atexit
+import queue
+import threading
+import weakref
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, TypeVar
+
+from playwright.async_api import Browser as AsyncBrowser
+from playwright.async_api import BrowserContext as AsyncBrowserContext
+from playwright.async_api import Page as AsyncPage
+from playwright.async_api import Playwright as AsyncPlaywright
+from playwright.async_api import async_playwright
+from playwright.sync_api import Browser, Playwright, sync_playwright
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_RENDERS = 100
+
+T = TypeVar("T")
+
+
+class BrowserSlot:
+    """A warm browser owned by a single pool worker thread.
+
+    Playwright's sync API can only be used from the thread that started it,
+    so each slot is created, used and closed on its own worker thread.
+    """
+
+    def __init__(self, max_renders: int):
+        self.max_renders = max_renders
+        self.renders = 0
+        # Per-browser state for render jobs (e.g. preloaded pages).
+        # Cleared whenever the browser is recycled.
+        self.cache: dict[str, Any] = {}
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+
+    @property
+    def browser(self) -> Browser:
+        """The slot's browser, launched on first use."""
+        if self._browser is None:
+            self._launch()
+        assert self._browser is not None
+        return self._browser
+
+    def ensure_healthy(self) -> None:
+        """Relaunch the browser if it has disconnected or is due for recycling."""
+        if self._browser is None:
+            return
+        if not self._browser.is_connected() or self.renders >= self.max_renders:
+            self._close_browser()
+
+    def close(self) -> None:
+        """Close the browser and stop the Playwright driver."""
+        self._close_browser()
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+    def _launch(self) -> None:
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+        self._browser = self._playwright.chromium.launch()
+        self.renders = 0
+
+    def _close_browser(self) -> None:
+        self.cache.clear()
+        browser, self._browser = self._browser, None
+        if browser is not None and browser.is_connected():
+            browser.close()
+
+
+class BrowserPool:
+    """A fixed number of worker threads, each holding a warm browser.
+
+    Render jobs are callables that receive a BrowserSlot as their first
+    argument. Jobs are queued and run on whichever worker is free, so at
+    most `size` renders are in flight at once.
+
+    Args:
+        size: Number of browsers (and worker threads) in the pool.
+        max_renders: Recycle a browser after this many render jobs.
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        max_renders: int = DEFAULT_MAX_RENDERS,
+    ):
+        if size < 1:
+            raise ValueError("Browser pool size must be at least 1")
+        if max_renders < 1:
+            raise ValueError("Browser pool max_renders must be at least 1")
+        self.size = size
+        self.max_renders = max_renders
+        self._jobs: queue.SimpleQueue = queue.SimpleQueue()
+        self._workers: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """Queue a render job and return a future for its result.
+
+        Args:
+            fn: Callable invoked as fn(slot, *args, **kwargs) on a worker thread.
+
+        Raises:
+            RuntimeError: If the pool has been closed.
+        """
+        future: Future[T] = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Browser pool is closed")
+            # Workers (and their browsers) are started lazily, one per
+            # submitted job, up to the pool size.
+            if len(self._workers) < self.size:
+                self._start_worker()
+            self._jobs.put((future, fn, args, kwargs))
+        return future
+
+    def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a render job on the pool and wait for its result."""
+        return self.submit(fn, *args, **kwargs).result()
+
+    def close(self) -> None:
+        """Stop all workers, closing their browsers. Safe to call twice."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+        for _ in workers:
+            self._jobs.put(None)
+        for worker in workers:
+            if worker is not threading.current_thread():
+                worker.join()
+
+    def __enter__(self) -> "BrowserPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _start_worker(self) -> None:
+        worker = threading.Thread(
+            target=self._work,
+            name=f"browser-pool-{len(self._workers)}",
+            daemon=True,
+        )
+        self._workers.append(worker)
+        worker.start()
+
+    def _work(self) -> None:
+        slot = BrowserSlot(self.max_renders)
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    break
+                future, fn, args, kwargs = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    slot.ensure_healthy()
+                    result = fn(slot, *args, **kwargs)
+                except BaseException as exc:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+                finally:
+                    slot.renders += 1
+        finally:
+            slot.close()
+
+
+_shared_pool: BrowserPool | None = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get the process-wide browser pool, creating it on first use.
+
+    Pool size and recycling are read from the `browser_pool` section of
+    the configuration file.
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            from ..config import get_browser_pool_settings
+
+            settings = get_browser_pool_settings()
+            _shared_pool = BrowserPool(
+                size=settings["size"],
+                max_renders=settings["max_renders"],
+            )
+        return _shared_pool
+
+
+def shutdown_browser_pool() -> None:
+    """Close the process-wide browser pool, if one has been created."""
+    global _shared_pool
+    with _shared_pool_lock:
+        pool, _shared_pool = _shared_pool, None
+    if pool is not None:
+        pool.close()
+
+
+atexit.register(shutdown_browser_pool)
+
+
+class AsyncBrowserPool:
+    """A warm browser shared by concurrent renders on one event loop.
+
+    All renders share a single Playwright driver and browser; each render
+    gets its own browser context, and at most `size` run at once. After
+    `max_renders` renders the browser is replaced, and the old one is closed
+    once its in-flight renders have finished.
+
+    Args:
+        size: Maximum number of concurrent renders.
+        max_renders: Replace the browser after this many renders.
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        max_renders: int = DEFAULT_MAX_RENDERS,
+    ):
+        if size < 1:
+            raise ValueError("Browser pool size must be at least 1")
+        if max_renders < 1:
+            raise ValueError("Browser pool max_renders must be at least 1")
+        self.size = size
+        self.max_renders = max_renders
+        self._semaphore = asyncio.Semaphore(size)
+        self._lock = asyncio.Lock()
+        self._playwright: AsyncPlaywright | None = None
+        self._browser: AsyncBrowser | None = None
+        self._renders = 0
+        # id(browser) -> (browser, renders in flight)
+        self._leases: dict[int, tuple[AsyncBrowser, int]] = {}
+        self._closed = False
+
+    @asynccontextmanager
+    async def context(self, **options: Any) -> AsyncIterator[AsyncBrowserContext]:
+        """Check out a fresh browser context, closing it afterwards.
+
+        Args:
+            **options: Passed to Browser.new_context (viewport, record_video_dir...).
+
+        Raises:
+            RuntimeError: If the pool has been closed.
+        """
+        async with self._semaphore:
+            browser = await self._checkout()
+            try:
+                context = await browser.new_context(**options)
+                try:
+                    yield context
+                finally:
+                    await context.close()
+            finally:
+                await self._checkin(browser)
+
+    @asynccontextmanager
+    async def page(self, **options: Any) -> AsyncIterator[AsyncPage]:
+        """Check out a page in a fresh browser context."""
+        async with self.context(**options) as context:
+            yield await context.new_page()
+
+    async def close(self) -> None:
+        """Close all browsers and stop the Playwright driver."""
+        async with self._lock:
+            self._closed = True
+            browsers = [browser for browser, _ in self._leases.values()]
+            if self._browser is not None:
+                browsers.append(self._browser)
+            self._browser = None
+            self._leases.clear()
+            for browser in browsers:
+                if browser.is_connected():
+                    await browser.close()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    async def _checkout(self) -> AsyncBrowser:
+        async with self._lock:
+            if self._closed:
+                raise RuntimeError("Browser pool is closed")
+            browser = self._browser
+            if (
+                browser is None
+                or not browser.is_connected()
+                or self._renders >= self.max_renders
+            ):
+                if browser is not None:
+                    await self._retire(browser)
+                browser = await self._launch()
+            self._renders += 1
+            _, in_flight = self._leases.get(id(browser), (browser, 0))
+            self._leases[id(browser)] = (browser, in_flight + 1)
+            return browser
+
+    async def _checkin(self, browser: AsyncBrowser) -> None:
+        async with self._lock:
+            lease = self._leases.get(id(browser))
+            if lease is None:
+                return
+            in_flight = lease[1] - 1
+            if in_flight > 0:
+                self._leases[id(browser)] = (browser, in_flight)
+                return
+            del self._leases[id(browser)]
+            if browser is not self._browser and browser.is_connected():
+                await browser.close()
+
+    async def _launch(self) -> AsyncBrowser:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch()
+        self._renders = 0
+        return self._browser
+
+    async def _retire(self, browser: AsyncBrowser) -> None:
+        """Stop handing out a browser; close it now if nothing is using it."""
+        self._browser = None
+        if id(browser) not in self._leases and browser.is_connected():
+            await browser.close()
+
+
+_async_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncBrowserPool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_browser_pool() -> AsyncBrowserPool:
+    """Get the browser pool for the running event loop, creating it on first use.
+
+    Playwright's async objects are bound to the loop that created them,
+    so each event loop gets its own pool.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _async_pools.get(loop)
+    if pool is None:
+        from ..config import get_browser_pool_settings
+
+        settings = get_browser_pool_settings()
+        pool = AsyncBrowserPool(
+            size=settings["size"],
+            max_renders=settings["max_renders"],
+        )
+        _async_pools[loop] = pool
+    return pool
+
+
+async def shutdown_async_browser_pool() -> None:
+    """Close the running event loop's browser pool, if one has been created."""
+    pool = _async_pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.close()
@@ -0,0 +1,196 @@
+"""Compiled position expressions.
+
+Position attributes can be arithmetic expressions over other elements'
+attributes, such as "box1.x + 70" or "(a.cx + b.cx) / 2". Each distinct
+expression is parsed once into a tree of closures and cached, so templated
+diagrams that repeat the same expression only pay for a dictionary lookup
+and the arithmetic.
+
+Grammar:
+    expression := term (("+" | "-") term)*
+    term       := factor (("*" | "/") factor)*
+    factor     := ("+" | "-") factor | number | reference | "(" expression ")"
+    reference  := element_id "." attribute
+"""
+
+import operator
+import re
+from functools import lru_cache
+from typing import Callable
+
+# Gets the value of an attribute of an element: lookup(element_id, attr)
+Lookup = Callable[[str, str], float]
+
+_Evaluator = Callable[[Lookup], float]
+
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:(?P<reference>\w+\.[A-Za-z_]\w*)"
+    r"|(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)"
+    r"|(?P<op>[-+*/()]))"
+)
+
+_OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+}
+
+
+class CompiledExpression:
+    """A parsed position expression.
+
+    Attributes:
+        source: The expression text.
+        references: The (element_id, attribute) pairs the expression reads,
+            in order of first appearance.
+    """
+
+    __slots__ = ("source", "references", "_evaluate")
+
+    def __init__(self, source: str, references: tuple[tuple[str, str], ...], evaluate: _Evaluator):
+        self.source = source
+        self.references = references
+        self._evaluate = evaluate
+
+    def evaluate(self, lookup: Lookup) -> float:
+        """Evaluate the expression.
+
+        Args:
+            lookup: Function returning the value of an element's attribute.
+
+        Returns:
+            The value of the expression.
+
+        Raises:
+            ValueError: If the expression divides by zero.
+        """
+        try:
+            return self._evaluate(lookup)
+        except ZeroDivisionError:
+            raise ValueError(f"Division by zero in position expression: {self.source}") from None
+
+
+@lru_cache(maxsize=4096)
+def compile_expression(expr: str) -> CompiledExpression:
+    """Parse a position expression, caching the result.
+
+    Args:
+        expr: Expression text, e.g. "box1.x + 70" or "(a.x + b.x) / 2".
+
+    Returns:
+        The compiled expression.
+
+    Raises:
+        ValueError: If the expression is malformed.
+    """
+    tokens = _tokenize(expr)
+    parser = _Parser(expr, tokens)
+    evaluate = parser.expression()
+    if parser.position != len(tokens):
+        raise ValueError(f"Invalid position expression: {expr}")
+    return CompiledExpression(expr, tuple(dict.fromkeys(parser.references)), evaluate)
+
+
+def _tokenize(expr: str) -> list[tuple[str, str]]:
+    tokens: list[tuple[str, str]] = []
+    position = 0
+    end = len(expr.rstrip())
+    while position < end:
+        match = _TOKEN_PATTERN.match(expr, position)
+        if not match:
+            raise ValueError(f"Invalid position expression: {expr}")
+        kind = match.lastgroup
+        assert kind is not None
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive descent parser producing closures."""
+
+    def __init__(self, source: str, tokens: list[tuple[str, str]]):
+        self.source = source
+        self.tokens = tokens
+        self.position = 0
+        self.references: list[tuple[str, str]] = []
+
+    def _peek(self) -> str | None:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position][1]
+        return None
+
+    def _error(self) -> ValueError:
+        return ValueError(f"Invalid position expression: {self.source}")
+
+    def expression(self) -> _Evaluator:
+        left = self.term()
+        while self._peek() in ("+", "-"):
+            op = _OPERATORS[self.tokens[self.position][1]]
+            self.position += 1
+            left = _binary(op, left, self.term())
+        return left
+
+    def term(self) -> _Evaluator:
+        left = self.factor()
+        while self._peek() in ("*", "/"):
+            op = _OPERATORS[self.tokens[self.position][1]]
+            self.position += 1
+            left = _binary(op, left, self.factor())
+        return left
+
+    def factor(self) -> _Evaluator:
+        if self.position >= len(self.tokens):
+            raise self._error()
+        kind, text = self.tokens[self.position]
+        self.position += 1
+
+        if kind == "number":
+            return _constant(float(text))
+        if kind == "reference":
+            element_id, attr = text.split(".", 1)
+            self.references.append((element_id, attr))
+            return lambda lookup: lookup(element_id, attr)
+        if text in ("+", "-"):
+            operand = self.factor()
+            if text == "+":
+                return operand
+            if isinstance(operand, _Constant):
+                return _constant(-operand.value)
+            return lambda lookup: -operand(lookup)
+        if text == "(":
+            inner = self.expression()
+            if self._peek() != ")":
+                raise self._error()
+            self.position += 1
+            return inner
+        raise self._error()
+
+
+class _Constant:
+    """Evaluator for a constant, kept distinguishable for folding."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: float):
+        self.value = value
+
+    def __call__(self, lookup: Lookup) -> float:
+        return self.value
+
+
+def _constant(value: float) -> _Evaluator:
+    return _Constant(value)
+
+
+def _binary(op: Callable[[float, float], float], left: _Evaluator, right: _Evaluator) -> _Evaluator:
+    if isinstance(left, _Constant) and isinstance(right, _Constant):
+        try:
+            return _Constant(op(left.value, right.value))
+        except ZeroDivisionError:
+            pass
+    if isinstance(right, _Constant):
+        value = right.value
+        return lambda lookup: op(left(lookup), value)
+    return lambda lookup: op(left(lookup), right(lookup))
@@ -0,0 +1,523 @@
+"""Path geometry: centroids, bounding boxes and lengths of SVG paths.
+
+Path data (a `d` string or a list of segment dicts) is parsed into absolute
+coordinates held in NumPy arrays. Runs of the same command are converted in
+one step, so long polylines such as map outlines or traced images cost a few
+array operations rather than a Python loop per vertex.
+
+All commands are supported, absolute and relative: M, L, H, V, C, S, Q, T,
+A and Z.
+"""
+
+import re
+
+import numpy as np
+
+# Curves are flattened to this many line segments for centroids and lengths
+FLATTEN_STEPS = 32
+
+_COMMAND_SPLIT = re.compile(r"([MmLlHhVvCcSsQqTtAaZz])")
+_NUMBER_PATTERN = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+# Numbers taken by each command
+_ARITY = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2, "A": 7, "Z": 0}
+
+_SEGMENT_COMMANDS = {
+    "move_to": ("M", ("x", "y")),
+    "line_to": ("L", ("x", "y")),
+    "cubic_bezier": ("C", ("x1", "y1", "x2", "y2", "x", "y")),
+    "quadratic_bezier": ("Q", ("x1", "y1", "x", "y")),
+    "arc": ("A", ("rx", "ry", "rotation", "large_arc", "sweep", "x", "y")),
+    "close": ("Z", ()),
+}
+
+_SEGMENT_DEFAULTS = {"rotation": 0, "large_arc": False, "sweep": True}
+
+_EMPTY_POINTS = np.empty((0, 2))
+
+_COMMAND_LETTERS = "MmLlHhVvCcSsQqTtAaZz"
+_TO_SPACE = str.maketrans({letter: " " for letter in _COMMAND_LETTERS + ","})
+
+# Byte lookup tables for finding commands and tokens in path data
+_IS_COMMAND = np.zeros(256, dtype=bool)
+_IS_COMMAND[list(_COMMAND_LETTERS.encode())] = True
+_IS_MOVE_OR_CLOSE = np.zeros(256, dtype=bool)
+_IS_MOVE_OR_CLOSE[list(b"MmZz")] = True
+_IS_SEPARATOR = np.zeros(256, dtype=bool)
+_IS_SEPARATOR[list(b" \t\n\r\f\v,")] = True
+
+
+class PathGeometry:
+    """Geometry of a parsed path, in absolute coordinates.
+
+    Attributes:
+        vertices: On-curve points (segment end points), shape (n, 2).
+        outlines: One array per subpath with its outline, curves flattened
+            into line segments and the closing segment included.
+        closed: Whether the path ends by closing its last subpath.
+    """
+
+    def __init__(
+        self,
+        vertices: np.ndarray,
+        outlines: list[np.ndarray],
+        closed: bool,
+        extrema: np.ndarray,
+    ):
+        self.vertices = vertices
+        self.outlines = outlines
+        self.closed = closed
+        # Points where curves reach their furthest extent
+        self._extrema = extrema
+
+    def centroid(self) -> tuple[float, float]:
+        """Get the area centroid of the shape the path encloses.
+
+        Subpaths are weighted by their signed area, so holes drawn in the
+        opposite direction are subtracted. If the path encloses no area
+        (e.g. all points on a line), the mean of the vertices is used.
+
+        Raises:
+            ValueError: If the path has no coordinates.
+        """
+        if not len(self.vertices):
+            raise ValueError("Path has no coordinates")
+
+        area2 = 0.0
+        moment_x = 0.0
+        moment_y = 0.0
+        for outline in self.outlines:
+            if len(outline) < 3:
+                continue
+            x, y = outline[:, 0], outline[:, 1]
+            x_next, y_next = np.roll(x, -1), np.roll(y, -1)
+            cross = x * y_next - x_next * y
+            area2 += cross.sum()
+            moment_x += ((x + x_next) * cross).sum()
+            moment_y += ((y + y_next) * cross).sum()
+
+        if abs(area2) <= 1e-12 * max(1.0, float(np.abs(self.vertices).max()) ** 2):
+            cx, cy = self.vertices.mean(axis=0)
+            return (float(cx), float(cy))
+        return (float(moment_x / (3 * area2)), float(moment_y / (3 * area2)))
+
+    def bounds(self) -> tuple[float, float, float, float]:
+        """Get the exact bounding box, including curve and arc extents.
+
+        Returns:
+            Tuple of (min_x, min_y, max_x, max_y).
+
+        Raises:
+            ValueError: If the path has no coordinates.
+        """
+        if not len(self.vertices):
+            raise ValueError("Path has no coordinates")
+        points = np.concatenate([self.vertices, self._extrema])
+        min_x, min_y = points.min(axis=0)
+        max_x, max_y = points.max(axis=0)
+        return (float(min_x), float(min_y), float(max_x), float(max_y))
+
+    def length(self) -> float:
+        """Get the length of the path, with curves measured along their flattened outline."""
+        return float(sum(
+            np.hypot(*np.diff(outline, axis=0).T).sum() for outline in self.outlines
+        ))
+
+
+def parse_path_data(d: str) -> PathGeometry:
+    """Parse raw SVG path data.
+
+    Args:
+        d: Path data string, e.g. "M 0 0 L 10 0 l 0 10 Z".
+
+    Returns:
+        The path's geometry.
+    """
+    try:
+        commands = _tokenize_fast(d)
+    except ValueError:
+        # Compact number forms such as "10-5" or ".5.5" need the full pattern
+        commands = _tokenize(d)
+    return _build(commands)
+
+
+def _tokenize(d: str) -> list[tuple[str, np.ndarray]]:
+    """Split path data into command runs with a regular expression per run."""
+    parts = _COMMAND_SPLIT.split(d)
+    runs: list[tuple[str, list[str]]] = []
+    for index in range(1, len(parts), 2):
+        command, chunk = parts[index], parts[index + 1]
+        if runs and runs[-1][0] == command and command not in "MmZz":
+            runs[-1][1].append(chunk)
+        else:
+            runs.append((command, [chunk]))
+    return [
+        (command, np.array(_NUMBER_PATTERN.findall(" ".join(chunks)), dtype=float))
+        for command, chunks in runs
+    ]
+
+
+def _tokenize_fast(d: str) -> list[tuple[str, np.ndarray]]:
+    """Split path data whose numbers are separated by whitespace or commas.
+
+    Numbers are converted in one call and command positions are found with
+    array operations, so the cost per vertex stays in C.
+
+    Raises:
+        ValueError: If a token is not a plain number.
+    """
+    numbers = np.array(d.translate(_TO_SPACE).split(), dtype=float)
+
+    data = np.frombuffer(d.encode(), dtype=np.uint8)
+    command_positions = np.flatnonzero(_IS_COMMAND[data])
+    if not len(command_positions):
+        return []
+
+    # Token starts in the translated text, where commands are separators too
+    separator = _IS_SEPARATOR[data] | _IS_COMMAND[data]
+    token_starts = np.flatnonzero(~separator & np.concatenate([[True], separator[:-1]]))
+    if len(token_starts) != len(numbers):
+        raise ValueError("Path data has unexpected separators")
+
+    # Numbers per command: tokens between one command letter and the next
+    first_tokens = np.searchsorted(token_starts, np.append(command_positions, len(data)))
+    counts = np.diff(first_tokens)
+
+    letters = data[command_positions]
+    # Repeated commands continue the previous run ("L 1 2 L 3 4" == "L 1 2 3 4")
+    starts_run = np.ones(len(letters), dtype=bool)
+    starts_run[1:] = (letters[1:] != letters[:-1]) | _IS_MOVE_OR_CLOSE[letters[1:]]
+    run_starts = np.flatnonzero(starts_run)
+    run_counts = np.add.reduceat(counts, run_starts)
+
+    offset = int(first_tokens[0])
+    commands: list[tuple[str, np.ndarray]] = []
+    for letter, count in zip(letters[run_starts].tolist(), run_counts.tolist()):
+        commands.append((chr(letter), numbers[offset:offset + count]))
+        offset += count
+    return commands
+
+
+def parse_segments(segments: list[dict], element_id: str | None = None) -> PathGeometry:
+    """Parse a segment-based path definition.
+
+    Args:
+        segments: Segment dicts as accepted by the path element
+            (move_to, line_to, cubic_bezier, quadratic_bezier, arc, close).
+        element_id: Id of the path element, for naming it in errors.
+
+    Returns:
+        The path's geometry.
+
+    Raises:
+        ValueError: If a segment has an unknown type or lacks a coordinate.
+    """
+    where = f"path '{element_id}'" if element_id else "path"
+    commands: list[tuple[str, np.ndarray]] = []
+    for number, segment in enumerate(segments, start=1):
+        segment_type = segment.get("type")
+        if segment_type not in _SEGMENT_COMMANDS:
+            raise ValueError(
+                f"Unknown segment type {segment_type!r} in segment {number} of {where}"
+            )
+        command, keys = _SEGMENT_COMMANDS[segment_type]
+        values = []
+        for key in keys:
+            value = segment.get(key, _SEGMENT_DEFAULTS.get(key))
+            if value is None:
+                raise ValueError(
+                    f"Segment {number} ({segment_type}) of {where} is missing '{key}'"
+                )
+            values.append(float(value))
+        commands.append((command, np.array(values, dtype=float)))
+    return _build(commands)
+
+
+def path_geometry(element: dict) -> PathGeometry:
+    """Get the geometry of a path element dict.
+
+    Raises:
+        ValueError: If the element has neither 'd' nor 'segments', or if a
+            segment is malformed.
+    """
+    segments = element.get("segments")
+    d = element.get("d")
+
+    if segments:
+        return parse_segments(segments, element.get("id"))
+    elif d:
+        return parse_path_data(d)
+    else:
+        raise ValueError("Path element requires either 'd' or 'segments'")
+
+
+class _PathBuilder:
+    """Tracks the pen while converting command runs to absolute geometry."""
+
+    def __init__(self):
+        self.current = np.zeros(2)
+        self.start = np.zeros(2)
+        # Last control point, for the reflections of S and T
+        self.cubic_control: np.ndarray | None = None
+        self.quad_control: np.ndarray | None = None
+        self.vertices: list[np.ndarray] = []
+        self.extrema: list[np.ndarray] = []
+        self.outlines: list[np.ndarray] = []
+        self.subpath: list[np.ndarray] = []
+        self.closed = False
+
+    def end_subpath(self) -> None:
+        if len(self.subpath) > 1 or (self.subpath and len(self.subpath[0]) > 1):
+            self.outlines.append(np.concatenate(self.subpath))
+        self.subpath = []
+
+    def move(self, points: np.ndarray) -> None:
+        self.end_subpath()
+        self.start = points[0]
+        self.subpath = [points[:1]]
+        self.vertices.append(points[:1])
+        self.current = points[0]
+        if len(points) > 1:
+            self.line(points[1:])
+
+    def line(self, ends: np.ndarray) -> None:
+        if not self.subpath:
+            self.subpath = [self.current[None, :]]
+        self.subpath.append(ends)
+        self.vertices.append(ends)
+        self.current = ends[-1]
+
+    def curve(self, controls: np.ndarray) -> None:
+        """Add Bezier curves; controls has shape (n, order + 1, 2), start point first."""
+        if not self.subpath:
+            self.subpath = [self.current[None, :]]
+        self.subpath.append(_flatten_bezier(controls))
+        self.vertices.append(controls[:, -1])
+        self.extrema.append(_bezier_extrema(controls))
+        self.current = controls[-1, -1]
+
+    def arc(self, starts: np.ndarray, params: np.ndarray) -> None:
+        if not self.subpath:
+            self.subpath = [self.current[None, :]]
+        outline, extrema = _arc_geometry(starts, params)
+        self.subpath.append(outline)
+        self.vertices.append(params[:, 5:7])
+        self.extrema.append(extrema)
+        self.current = params[-1, 5:7]
+
+    def close(self) -> None:
+        if self.subpath:
+            self.subpath.append(self.start[None, :])
+        self.end_subpath()
+        self.current = self.start
+        self.closed = True
+
+
+def _build(commands: list[tuple[str, np.ndarray]]) -> PathGeometry:
+    """Convert parsed commands to absolute geometry."""
+    builder = _PathBuilder()
+
+    for command, numbers in commands:
+        upper = command.upper()
+        relative = command != upper
+        if upper == "Z":
+            builder.close()
+            builder.cubic_control = builder.quad_control = None
+            continue
+
+        arity = _ARITY[upper]
+        count = len(numbers) // arity
+        if not count:
+            continue
+        values = numbers[: count * arity].reshape(count, arity)
+        builder.closed = False
+        cubic_control = quad_control = None
+
+        if upper in "ML":
+            points = _chain(values, builder.current, relative)
+            if upper == "M":
+                builder.move(points)
+            else:
+                builder.line(points)
+        elif upper in "HV":
+            axis = 0 if upper == "H" else 1
+            coords = values[:, 0]
+            if relative:
+                coords = np.cumsum(coords) + builder.current[axis]
+            points = np.repeat(builder.current[None, :], count, axis=0)
+            points[:, axis] = coords
+            builder.line(points)
+        elif upper in "CQ":
+            order = 3 if upper == "C" else 2
+            pairs = values.reshape(count, order, 2)
+            ends = _chain(pairs[:, -1], builder.current, relative)
+            starts = np.vstack([builder.current, ends[:-1]])
+            controls = pairs[:, :-1] + starts[:, None, :] if relative else pairs[:, :-1]
+            builder.curve(np.concatenate([starts[:, None], controls, ends[:, None]], axis=1))
+            if upper == "C":
+                cubic_control = controls[-1, -1]
+            else:
+                quad_control = controls[-1, -1]
+        elif upper == "S":
+            pairs = values.reshape(count, 2, 2)
+            ends = _chain(pairs[:, 1], builder.current, relative)
+            starts = np.vstack([builder.current, ends[:-1]])
+            second = pairs[:, 0] + starts if relative else pairs[:, 0]
+            # The first control reflects the previous curve's second control,
+            # or is the start point if the previous command wasn't a cubic
+            previous = np.vstack([
+                builder.current if builder.cubic_control is None else builder.cubic_control,
+                second[:-1],
+            ])
+            first = 2 * starts - previous
+            builder.curve(np.stack([starts, first, second, ends], axis=1))
+            cubic_control = second[-1]
+        elif upper == "T":
+            ends = _chain(values, builder.current, relative)
+            starts = np.vstack([builder.current, ends[:-1]])
+            controls = np.empty_like(starts)
+            control = builder.quad_control
+            # Each control depends on the previous one, so this runs in order
+            for index in range(count):
+                control = starts[index] if control is None else 2 * starts[index] - control
+                controls[index] = control
+            builder.curve(np.stack([starts, controls, ends], axis=1))
+            quad_control = controls[-1]
+        else:  # upper == "A"
+            params = values.copy()
+            params[:, 5:7] = _chain(values[:, 5:7], builder.current, relative)
+            starts = np.vstack([builder.current, params[:-1, 5:7]])
+            builder.arc(starts, params)
+
+        builder.cubic_control = cubic_control
+        builder.quad_control = quad_control
+
+    builder.end_subpath()
+    vertices = np.concatenate(builder.vertices) if builder.vertices else _EMPTY_POINTS
+    extrema = np.concatenate(builder.extrema) if builder.extrema else _EMPTY_POINTS
+    return PathGeometry(vertices, builder.outlines, builder.closed, extrema)
+
+
+def _chain(points: np.ndarray, current: np.ndarray, relative: bool) -> np.ndarray:
+    """Convert a run of end points to absolute coordinates."""
+    if relative:
+        return np.cumsum(points, axis=0) + current
+    return points
+
+
+def _bezier_points(controls: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Evaluate Bezier curves of shape (n, order + 1, 2) at parameters t of shape (n, k)."""
+    t = t[..., None]
+    s = 1 - t
+    p = controls[:, None]
+    if controls.shape[1] == 4:
+        return (
+            s**3 * p[:, :, 0] + 3 * s**2 * t * p[:, :, 1]
+            + 3 * s * t**2 * p[:, :, 2] + t**3 * p[:, :, 3]
+        )
+    return s**2 * p[:, :, 0] + 2 * s * t * p[:, :, 1] + t**2 * p[:, :, 2]
+
+
+def _flatten_bezier(controls: np.ndarray) -> np.ndarray:
+    """Sample Bezier curves into an outline, excluding the shared start point."""
+    t = np.linspace(0, 1, FLATTEN_STEPS + 1)[1:]
+    points = _bezier_points(controls, np.broadcast_to(t, (len(controls), FLATTEN_STEPS)))
+    return points.reshape(-1, 2)
+
+
+def _bezier_extrema(controls: np.ndarray) -> np.ndarray:
+    """Get the points where Bezier curves turn in x or y."""
+    p0, p1 = controls[:, 0], controls[:, 1]
+    if controls.shape[1] == 4:
+        p2, p3 = controls[:, 2], controls[:, 3]
+        # Derivative roots of a t^2 + b t + c, per axis
+        a = -p0 + 3 * p1 - 3 * p2 + p3
+        b = 2 * (p0 - 2 * p1 + p2)
+        c = p1 - p0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            disc = np.sqrt(b * b - 4 * a * c)
+            quadratic = np.abs(a) > 1e-12
+            roots = np.concatenate([
+                np.where(quadratic, (-b + disc) / (2 * a), -c / b),
+                np.where(quadratic, (-b - disc) / (2 * a), np.nan),
+            ], axis=1)
+    else:
+        p2 = controls[:, 2]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            roots = (p0 - p1) / (p0 - 2 * p1 + p2)
+
+    valid = np.isfinite(roots) & (roots > 0) & (roots < 1)
+    if not valid.any():
+        return _EMPTY_POINTS
+    points = _bezier_points(controls, np.where(valid, roots, 0))
+    return points[valid]
+
+
+def _arc_geometry(starts: np.ndarray, params: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Flatten elliptical arcs and find their extreme points.
+
+    Uses the endpoint-to-center conversion from the SVG specification
+    (appendix B.2.4). Arcs with a zero radius are straight lines, and arcs
+    that end where they start are omitted, as in SVG rendering.
+    """
+    ends = params[:, 5:7]
+    rx = np.abs(params[:, 0])
+    ry = np.abs(params[:, 1])
+    phi = np.radians(params[:, 2])
+    large = params[:, 3] != 0
+    sweep = params[:, 4] != 0
+    cos, sin = np.cos(phi), np.sin(phi)
+
+    half = (starts - ends) / 2
+    x1p = cos * half[:, 0] + sin * half[:, 1]
+    y1p = -sin * half[:, 0] + cos * half[:, 1]
+
+    degenerate = (rx == 0) | (ry == 0) | ((x1p == 0) & (y1p == 0))
+    rx = np.where(degenerate, 1.0, rx)
+    ry = np.where(degenerate, 1.0, ry)
+
+    # Scale up radii that are too small to reach the end point
+    scale = np.sqrt(np.maximum(x1p**2 / rx**2 + y1p**2 / ry**2, 1.0))
+    rx, ry = rx * scale, ry * scale
+
+    numerator = rx**2 * ry**2 - rx**2 * y1p**2 - ry**2 * x1p**2
+    denominator = rx**2 * y1p**2 + ry**2 * x1p**2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        coefficient = np.sqrt(np.maximum(numerator, 0) / denominator)
+    coefficient = np.where(degenerate, 0.0, coefficient)
+    coefficient = np.where(large == sweep, -coefficient, coefficient)
+    cxp = coefficient * rx * y1p / ry
+    cyp = -coefficient * ry * x1p / rx
+    cx = cos * cxp - sin * cyp + (starts[:, 0] + ends[:, 0]) / 2
+    cy = sin * cxp + cos * cyp + (starts[:, 1] + ends[:, 1]) / 2
+
+    theta1 = np.arctan2((y1p - cyp) / ry, (x1p - cxp) / rx)
+    theta2 = np.arctan2((-y1p - cyp) / ry, (-x1p - cxp) / rx)
+    delta = theta2 - theta1
+    delta = np.where(~sweep & (delta > 0), delta - 2 * np.pi, delta)
+    delta = np.where(sweep & (delta < 0), delta + 2 * np.pi, delta)
+
+    def point_at(theta: np.ndarray) -> np.ndarray:
+        c, s = np.cos(theta), np.sin(theta)
+        x = cx[:, None] + rx[:, None] * cos[:, None] * c - ry[:, None] * sin[:, None] * s
+        y = cy[:, None] + rx[:, None] * sin[:, None] * c + ry[:, None] * cos[:, None] * s
+        return np.stack([x, y], axis=-1)
+
+    fraction = np.linspace(0, 1, FLATTEN_STEPS + 1)[1:]
+    outline = point_at(theta1[:, None] + delta[:, None] * fraction)
+    straight = starts[:, None] + (ends - starts)[:, None] * fraction[:, None]
+    outline = np.where(degenerate[:, None, None], straight, outline)
+
+    # Angles where dx/dtheta or dy/dtheta is zero, repeated every half turn
+    base = np.stack([
+        np.arctan2(-ry * sin, rx * cos),
+        np.arctan2(ry * cos, rx * sin),
+    ], axis=1)
+    turns = np.arange(-4, 5) * np.pi
+    candidates = (base[:, :, None] + turns).reshape(len(params), -1)
+    low = np.minimum(theta1, theta1 + delta)[:, None]
+    high = np.maximum(theta1, theta1 + delta)[:, None]
+    valid = (candidates > low) & (candidates < high) & ~degenerate[:, None]
+    extrema = point_at(candidates)[valid]
+
+    return outline.reshape(-1, 2), extrema
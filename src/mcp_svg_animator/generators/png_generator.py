@@ -1,6 +1,15 @@
-"""Generate PNG files from SVG content using Playwright."""
+"""Generate PNG images from SVG content using Playwright."""
 
-from playwright.sync_api import sync_playwright
+import asyncio
+
+from .browser_pool import (
+    AsyncBrowserPool,
+    BrowserPool,
+    BrowserSlot,
+    get_async_browser_pool,
+    get_browser_pool,
+)
+from .render_cache import cache_key, get_file_cache
 
 
 def create_png_from_svg(
@@ -8,23 +17,246 @@ def create_png_from_svg(
     output_path: str,
     width: int | None = None,
     height: int | None = None,
+    pool: BrowserPool | None = None,
+    reuse_page: bool = False,
 ) -> None:
     """Create a PNG file from SVG content.
 
     Uses Playwright to render the SVG in a headless browser and take a screenshot.
+    If the same SVG has been rendered at the same size before, the cached PNG
+    is copied to output_path instead.
+
+    Args:
+        svg_content: The SVG content as a string.
+        output_path: Path where the PNG file will be saved.
+        width: Image width (defaults to SVG width or 800).
+        height: Image height (defaults to SVG height or 600).
+        pool: Browser pool to render with (defaults to the shared pool).
+        reuse_page: Keep one page per pooled browser with the HTML wrapper
+            loaded, and only swap in the SVG for each image. Much faster
+            for many small images.
+    """
+    if width is None:
+        width = _extract_dimension(svg_content, "width") or 800
+    if height is None:
+        height = _extract_dimension(svg_content, "height") or 600
+
+    file_cache = get_file_cache()
+    key = cache_key("png", svg_content, width, height)
+    if file_cache is not None and file_cache.fetch(key, output_path):
+        return
+
+    _screenshot(svg_content, output_path, width, height, pool, reuse_page)
+
+    if file_cache is not None:
+        file_cache.store(key, output_path)
+
+
+def render_png_from_svg(
+    svg_content: str,
+    width: int | None = None,
+    height: int | None = None,
+    pool: BrowserPool | None = None,
+    reuse_page: bool = False,
+    use_file_cache: bool = True,
+) -> bytes:
+    """Render SVG content to PNG data in memory.
+
+    Same as create_png_from_svg, but returns the image instead of writing
+    it to a file.
+
+    Args:
+        svg_content: The SVG content as a string.
+        width: Image width (defaults to SVG width or 800).
+        height: Image height (defaults to SVG height or 600).
+        pool: Browser pool to render with (defaults to the shared pool).
+        reuse_page: Render into a page kept open on the pooled browser.
+        use_file_cache: Look up and store the image in the on-disk render
+            cache. Disable for throwaway previews.
+
+    Returns:
+        The PNG image.
+    """
+    if width is None:
+        width = _extract_dimension(svg_content, "width") or 800
+    if height is None:
+        height = _extract_dimension(svg_content, "height") or 600
+
+    file_cache = get_file_cache() if use_file_cache else None
+    key = cache_key("png", svg_content, width, height)
+    if file_cache is not None:
+        cached = file_cache.read(key)
+        if cached is not None:
+            return cached
+
+    png_data = _screenshot(svg_content, None, width, height, pool, reuse_page)
+
+    if file_cache is not None:
+        file_cache.store_bytes(key, png_data)
+    return png_data
+
+
+async def create_png_from_svg_async(
+    svg_content: str,
+    output_path: str,
+    width: int | None = None,
+    height: int | None = None,
+    pool: AsyncBrowserPool | None = None,
+) -> None:
+    """Create a PNG file from SVG content without leaving the event loop.
+
+    Async counterpart of create_png_from_svg, built on Playwright's async API.
+    Concurrent calls on the same loop share one driver and one browser.
 
     Args:
         svg_content: The SVG content as a string.
         output_path: Path where the PNG file will be saved.
         width: Image width (defaults to SVG width or 800).
         height: Image height (defaults to SVG height or 600).
+        pool: Async browser pool to render with (defaults to the loop's pool).
     """
     if width is None:
         width = _extract_dimension(svg_content, "width") or 800
     if height is None:
         height = _extract_dimension(svg_content, "height") or 600
 
-    html_content = f"""<!DOCTYPE html>
+    file_cache = get_file_cache()
+    key = cache_key("png", svg_content, width, height)
+    if file_cache is not None and await asyncio.to_thread(file_cache.fetch, key, output_path):
+        return
+
+    await _screenshot_async(svg_content, output_path, width, height, pool)
+
+    if file_cache is not None:
+        await asyncio.to_thread(file_cache.store, key, output_path)
+
+
+async def render_png_from_svg_async(
+    svg_content: str,
+    width: int | None = None,
+    height: int | None = None,
+    pool: AsyncBrowserPool | None = None,
+    use_file_cache: bool = True,
+) -> bytes:
+    """Render SVG content to PNG data in memory without leaving the event loop.
+
+    Args:
+        svg_content: The SVG content as a string.
+        width: Image width (defaults to SVG width or 800).
+        height: Image height (defaults to SVG height or 600).
+        pool: Async browser pool to render with (defaults to the loop's pool).
+        use_file_cache: Look up and store the image in the on-disk render
+            cache. Disable for throwaway previews.
+
+    Returns:
+        The PNG image.
+    """
+    if width is None:
+        width = _extract_dimension(svg_content, "width") or 800
+    if height is None:
+        height = _extract_dimension(svg_content, "height") or 600
+
+    file_cache = get_file_cache() if use_file_cache else None
+    key = cache_key("png", svg_content, width, height)
+    if file_cache is not None:
+        cached = await asyncio.to_thread(file_cache.read, key)
+        if cached is not None:
+            return cached
+
+    png_data = await _screenshot_async(svg_content, None, width, height, pool)
+
+    if file_cache is not None:
+        await asyncio.to_thread(file_cache.store_bytes, key, png_data)
+    return png_data
+
+
+def _screenshot(
+    svg_content: str,
+    output_path: str | None,
+    width: int,
+    height: int,
+    pool: BrowserPool | None,
+    reuse_page: bool,
+) -> bytes:
+    """Render SVG content on a pooled browser, optionally saving the PNG."""
+    if pool is None:
+        pool = get_browser_pool()
+    if reuse_page:
+        return pool.run(_render_png_on_kept_page, svg_content, output_path, width, height)
+    html_content = _build_html(svg_content, width, height)
+    return pool.run(_render_png, html_content, output_path, width, height)
+
+
+async def _screenshot_async(
+    svg_content: str,
+    output_path: str | None,
+    width: int,
+    height: int,
+    pool: AsyncBrowserPool | None,
+) -> bytes:
+    """Render SVG content on a page of an async pool, optionally saving the PNG."""
+    html_content = _build_html(svg_content, width, height)
+
+    if pool is None:
+        pool = get_async_browser_pool()
+    async with pool.page(viewport={"width": width, "height": height}) as page:
+        await page.set_content(html_content)
+        return await page.screenshot(path=output_path, type="png")
+
+
+def _render_png(
+    slot: BrowserSlot,
+    html_content: str,
+    output_path: str | None,
+    width: int,
+    height: int,
+) -> bytes:
+    """Screenshot an HTML page on a pooled browser, optionally saving it."""
+    page = slot.browser.new_page(viewport={"width": width, "height": height})
+    try:
+        page.set_content(html_content)
+        return page.screenshot(path=output_path, type="png")
+    finally:
+        page.close()
+
+
+def _render_png_on_kept_page(
+    slot: BrowserSlot,
+    svg_content: str,
+    output_path: str | None,
+    width: int,
+    height: int,
+) -> bytes:
+    """Screenshot SVG content in the slot's long-lived PNG page.
+
+    The page loads the HTML wrapper once. Each render only resizes the
+    viewport if needed and swaps in the new SVG markup, which avoids
+    parsing and laying out a whole new document.
+    """
+    page = slot.cache.get("png_page")
+    if page is None or page.is_closed():
+        page = slot.cache["png_page"] = slot.browser.new_page(
+            viewport={"width": width, "height": height}
+        )
+        page.set_content(_build_html("", width, height))
+    elif page.viewport_size != {"width": width, "height": height}:
+        page.set_viewport_size({"width": width, "height": height})
+    page.evaluate(_SWAP_SVG_SCRIPT, [svg_content, width, height])
+    return page.screenshot(path=output_path, type="png")
+
+
+# Replace the body's content and size, as _build_html would have set them
+_SWAP_SVG_SCRIPT = """([markup, width, height]) => {
+    const body = document.body;
+    body.style.width = width + 'px';
+    body.style.height = height + 'px';
+    body.innerHTML = markup;
+}"""
+
+
+def _build_html(svg_content: str, width: int, height: int) -> str:
+    """Wrap SVG content in an HTML page sized to the viewport."""
+    return f"""<!DOCTYPE html>
 <html>
 <head>
     <style>
@@ -49,13 +281,6 @@ def create_png_from_svg(
 </body>
 </html>"""
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch()
-        page = browser.new_page(viewport={"width": width, "height": height})
-        page.set_content(html_content)
-        page.screenshot(path=output_path, type="png")
-        browser.close()
-
 
 def _extract_dimension(svg_content: str, attr: str) -> int | None:
     """Extract a dimension attribute from SVG content."""
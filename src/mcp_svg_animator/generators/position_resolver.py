@@ -1,20 +1,23 @@
 """Resolve relative position references in element specifications."""
 
-import re
-from copy import deepcopy
-
-# Pattern to match expressions like "box1.x", "box1.x + 70", "box1.cx - 30"
-EXPR_PATTERN = re.compile(
-    r"^(?P<element_id>\w+)\.(?P<attr>\w+)(?:\s*(?P<op>[+-])\s*(?P<offset>\d+(?:\.\d+)?))?$"
-)
-
-# Pattern to extract coordinates from SVG path commands
-# Matches command letter followed by coordinate pairs
-PATH_COORD_PATTERN = re.compile(r"[MmLlHhVvCcSsQqTtAaZz]|[-+]?\d*\.?\d+")
+from .expressions import compile_expression
+from .path_geometry import path_geometry
+from .transforms import IDENTITY, Matrix, apply, invert, multiply, parse_transform, scale_factor
 
 # Attributes that can be referenced for position calculations
 POSITION_ATTRS = {"x", "y", "cx", "cy", "x1", "y1", "x2", "y2", "width", "height", "r", "rx", "ry"}
 
+# Attributes derived from the bounding box, for elements that don't set them
+COMPUTED_ATTRS = {"left", "top", "right", "bottom", "cx", "cy", "width", "height"}
+
+# Coordinates that form points with each other; the rest are lengths
+POINT_PARTNERS = {
+    "x": "y", "y": "x", "cx": "cy", "cy": "cx",
+    "x1": "y1", "y1": "x1", "x2": "y2", "y2": "x2",
+    "left": "top", "top": "left", "right": "bottom", "bottom": "right",
+}
+X_ATTRS = {"x", "cx", "x1", "x2", "left", "right"}
+
 
 def get_element_center(element: dict) -> tuple[float, float]:
     """Calculate the center point of an element.
@@ -47,268 +50,458 @@ def get_element_center(element: dict) -> tuple[float, float]:
         raise ValueError(f"Cannot calculate center for element type: {element_type}")
 
 
-def _get_path_center(element: dict) -> tuple[float, float]:
-    """Calculate the centroid of a closed path.
+def get_element_bbox(element: dict) -> tuple[float, float, float, float]:
+    """Calculate the bounding box of an element.
+
+    Stroke width is not included. Text has no known extent, so its box is
+    the anchor point. Path boxes include the full extent of curves and arcs.
 
     Args:
-        element: Path element dict with either 'd' (raw path data) or 'segments'.
+        element: Element specification dict with a 'type' key.
 
     Returns:
-        Tuple of (center_x, center_y) - the centroid of the path vertices.
+        Tuple of (min_x, min_y, max_x, max_y).
 
     Raises:
-        ValueError: If the path is open (not closed with Z or close segment).
+        ValueError: If the element type doesn't support bounding boxes.
     """
-    segments = element.get("segments")
-    d = element.get("d")
+    element_type = element.get("type")
 
-    if segments:
-        return _get_path_center_from_segments(segments)
-    elif d:
-        return _get_path_center_from_d(d)
+    if element_type == "circle":
+        cx, cy, r = float(element["cx"]), float(element["cy"]), float(element["r"])
+        return (cx - r, cy - r, cx + r, cy + r)
+    elif element_type == "ellipse":
+        cx, cy = float(element["cx"]), float(element["cy"])
+        rx, ry = float(element["rx"]), float(element["ry"])
+        return (cx - rx, cy - ry, cx + rx, cy + ry)
+    elif element_type == "rectangle":
+        x = float(element["x"])
+        y = float(element["y"])
+        return (x, y, x + float(element["width"]), y + float(element["height"]))
+    elif element_type == "line":
+        x1, y1 = float(element["x1"]), float(element["y1"])
+        x2, y2 = float(element["x2"]), float(element["y2"])
+        return (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+    elif element_type == "text":
+        x, y = float(element["x"]), float(element["y"])
+        return (x, y, x, y)
+    elif element_type == "path":
+        return path_geometry(element).bounds()
     else:
-        raise ValueError("Path element requires either 'd' or 'segments'")
+        raise ValueError(f"Cannot calculate bounding box for element type: {element_type}")
 
 
-def _get_path_center_from_segments(segments: list[dict]) -> tuple[float, float]:
-    """Calculate centroid from segment-based path definition."""
-    # Check if path is closed
-    is_closed = any(seg.get("type") == "close" for seg in segments)
-    if not is_closed:
-        raise ValueError("Cannot calculate center for open path")
+def _get_path_center(element: dict) -> tuple[float, float]:
+    """Calculate the centroid of a closed path.
 
-    # Extract coordinates from segments
-    coords: list[tuple[float, float]] = []
-    for seg in segments:
-        seg_type = seg.get("type")
-        if seg_type in ("move_to", "line_to"):
-            coords.append((float(seg["x"]), float(seg["y"])))
-        elif seg_type == "cubic_bezier":
-            # Use end point only (control points are not vertices)
-            coords.append((float(seg["x"]), float(seg["y"])))
-        elif seg_type == "quadratic_bezier":
-            coords.append((float(seg["x"]), float(seg["y"])))
-        elif seg_type == "arc":
-            coords.append((float(seg["x"]), float(seg["y"])))
-        # close segment has no coordinates
-
-    if not coords:
-        raise ValueError("Path has no coordinates")
-
-    # Calculate centroid (average of all coordinates)
-    cx = sum(x for x, _ in coords) / len(coords)
-    cy = sum(y for _, y in coords) / len(coords)
-    return (cx, cy)
-
-
-def _get_path_center_from_d(d: str) -> tuple[float, float]:
-    """Calculate centroid from raw SVG path data."""
-    # Check if path is closed
-    if not d.rstrip().endswith(("Z", "z")):
-        raise ValueError("Cannot calculate center for open path")
+    Args:
+        element: Path element dict with either 'd' (raw path data) or 'segments'.
+
+    Returns:
+        Tuple of (center_x, center_y) - the area centroid of the path.
 
-    # Parse the path data to extract coordinates
-    tokens = PATH_COORD_PATTERN.findall(d)
-    coords: list[tuple[float, float]] = []
-    current_command = None
-    numbers: list[float] = []
-
-    for token in tokens:
-        if token in "MmLlHhVvCcSsQqTtAaZz":
-            # Process previous command's numbers
-            if current_command and numbers:
-                coords.extend(_extract_coords_from_command(current_command, numbers))
-            current_command = token
-            numbers = []
-        else:
-            # It's a number
-            try:
-                numbers.append(float(token))
-            except ValueError:
-                pass
-
-    # Process last command
-    if current_command and numbers:
-        coords.extend(_extract_coords_from_command(current_command, numbers))
-
-    if not coords:
-        raise ValueError("Path has no coordinates")
-
-    # Calculate centroid
-    cx = sum(x for x, _ in coords) / len(coords)
-    cy = sum(y for _, y in coords) / len(coords)
-    return (cx, cy)
-
-
-def _extract_coords_from_command(command: str, numbers: list[float]) -> list[tuple[float, float]]:
-    """Extract endpoint coordinates from a path command."""
-    coords: list[tuple[float, float]] = []
-
-    if command in "Mm":
-        # Move to: pairs of x,y
-        for i in range(0, len(numbers) - 1, 2):
-            coords.append((numbers[i], numbers[i + 1]))
-    elif command in "Ll":
-        # Line to: pairs of x,y
-        for i in range(0, len(numbers) - 1, 2):
-            coords.append((numbers[i], numbers[i + 1]))
-    elif command in "Hh":
-        # Horizontal line: x values only (we'll skip these for centroid)
-        pass
-    elif command in "Vv":
-        # Vertical line: y values only (we'll skip these for centroid)
-        pass
-    elif command in "Cc":
-        # Cubic bezier: x1,y1,x2,y2,x,y - take only endpoint
-        for i in range(0, len(numbers) - 5, 6):
-            coords.append((numbers[i + 4], numbers[i + 5]))
-    elif command in "Ss":
-        # Smooth cubic: x2,y2,x,y - take only endpoint
-        for i in range(0, len(numbers) - 3, 4):
-            coords.append((numbers[i + 2], numbers[i + 3]))
-    elif command in "Qq":
-        # Quadratic bezier: x1,y1,x,y - take only endpoint
-        for i in range(0, len(numbers) - 3, 4):
-            coords.append((numbers[i + 2], numbers[i + 3]))
-    elif command in "Tt":
-        # Smooth quadratic: x,y
-        for i in range(0, len(numbers) - 1, 2):
-            coords.append((numbers[i], numbers[i + 1]))
-    elif command in "Aa":
-        # Arc: rx,ry,rotation,large-arc,sweep,x,y - take only endpoint
-        for i in range(0, len(numbers) - 6, 7):
-            coords.append((numbers[i + 5], numbers[i + 6]))
-
-    return coords
+    Raises:
+        ValueError: If the path is open (not closed with Z or close segment).
+    """
+    geometry = path_geometry(element)
+    if not geometry.closed:
+        raise ValueError("Cannot calculate center for open path")
+    return geometry.centroid()
 
 
 def resolve_positions(elements: list[dict]) -> list[dict]:
     """Resolve relative position references in element specifications.
 
-    Uses two-phase processing:
-    1. Process all non-connection elements, building a registry of positions
-    2. Resolve connections using the full registry, prepend to element list
+    Elements may reference elements declared before or after them, and
+    anywhere in the group tree. All references are collected into a
+    dependency graph, which is sorted topologically so every element is
+    resolved after the ones it refers to, in a single pass that is linear
+    in elements plus references.
+
+    Connections are resolved last, once every element position is known.
 
     Args:
         elements: List of element specification dicts. String values in
             position attributes can reference other elements using syntax
-            like "element_id.attr" or "element_id.attr + offset".
+            like "element_id.attr" or "(a.x + b.x) / 2".
 
     Returns:
         New list of element dicts with all position references resolved
-        to numeric values. Connections appear first (so they render behind).
+        to numeric values, including inside groups. Within each list,
+        connections appear first (so they render behind), and the other
+        elements keep their original order. The input is not modified, but
+        elements and groups without references are returned as they are
+        rather than copied, so treat the result as read-only.
 
     Raises:
-        ValueError: If an expression references an unknown element or attribute.
+        ValueError: If an expression references an unknown element or
+            attribute, or if references form a cycle.
     """
-    # Phase 1: Separate connections from other elements
-    connections: list[dict] = []
-    other_elements: list[dict] = []
-
-    for element in elements:
-        if element.get("type") == "connection":
-            connections.append(element)
-        else:
-            other_elements.append(element)
-
-    # Phase 2: Process non-connection elements, build registry
-    resolved_others: list[dict] = []
-    element_registry: dict[str, dict] = {}
-
-    for element in other_elements:
-        resolved = _resolve_element(element, element_registry)
-        resolved_others.append(resolved)
-
-        element_id = resolved.get("id")
-        if element_id:
-            element_registry[element_id] = resolved
-
-    # Phase 3: Resolve connections using full registry
-    resolved_connections: list[dict] = []
-
-    for connection in connections:
-        resolved = _resolve_connection(connection, element_registry)
-        resolved_connections.append(resolved)
-
-    # Return connections first (render behind), then other elements
-    return resolved_connections + resolved_others
+    return PositionRegistry(elements).elements
 
 
-def _resolve_connection(connection: dict, registry: dict[str, dict]) -> dict:
-    """Resolve a connection element using the element registry.
+class _Scope:
+    """The coordinate space of the document or of one group.
 
-    Calculates center points of from/to elements and adds x1, y1, x2, y2.
+    Holds the transform from this space to document coordinates and the
+    ids declared directly in it. The group's transform is only parsed when
+    a reference crosses into or out of the space, so transforms of groups
+    that no reference crosses are passed through unchecked.
     """
-    from_id = connection.get("from")
-    to_id = connection.get("to")
 
-    if from_id not in registry:
-        raise ValueError(f"Unknown element reference: {from_id}")
-    if to_id not in registry:
-        raise ValueError(f"Unknown element reference: {to_id}")
+    __slots__ = ("ids", "_parent", "_transform", "_matrix", "_inverse")
 
-    from_element = registry[from_id]
-    to_element = registry[to_id]
+    def __init__(self, parent: "_Scope | None" = None, transform: str | None = None):
+        self.ids: dict[str, int] = {}
+        self._parent = parent
+        self._transform = transform
+        self._matrix: Matrix | None = None
+        self._inverse: Matrix | None = None
 
-    x1, y1 = get_element_center(from_element)
-    x2, y2 = get_element_center(to_element)
+    @property
+    def matrix(self) -> Matrix:
+        if self._matrix is None:
+            parent_matrix = IDENTITY if self._parent is None else self._parent.matrix
+            self._matrix = multiply(parent_matrix, parse_transform(self._transform))
+        return self._matrix
 
-    resolved = deepcopy(connection)
-    resolved["x1"] = x1
-    resolved["y1"] = y1
-    resolved["x2"] = x2
-    resolved["y2"] = y2
+    @property
+    def inverse(self) -> Matrix:
+        if self._inverse is None:
+            self._inverse = invert(self.matrix)
+        return self._inverse
 
-    return resolved
 
+class PositionRegistry:
+    """Resolved positions for every element in a diagram, including group children.
 
-def _resolve_element(element: dict, registry: dict[str, dict]) -> dict:
-    """Resolve position references in a single element."""
-    resolved = deepcopy(element)
-
-    for key, value in element.items():
-        if isinstance(value, str) and key in POSITION_ATTRS:
-            resolved[key] = _resolve_expression(value, registry)
-
-    return resolved
-
-
-def _resolve_expression(expr: str, registry: dict[str, dict]) -> float:
-    """Parse and resolve a position expression.
+    The element tree is walked once. Each group's transform is composed
+    with its parent's, so every element's local coordinates can be mapped
+    to absolute (document) coordinates. References are looked up in the
+    referencing element's own group first, then among all ids in the tree,
+    and values from another group are converted into the referencing
+    element's coordinate space.
 
     Args:
-        expr: Expression like "box1.x" or "box1.x + 70"
-        registry: Dict of element_id -> resolved element dict
-
-    Returns:
-        Resolved numeric value.
+        elements: List of element specification dicts.
 
     Raises:
-        ValueError: If the expression references an unknown element or attribute.
+        ValueError: If an expression references an unknown element or
+            attribute, if references form a cycle, or if a reference
+            crosses a malformed group transform.
     """
-    match = EXPR_PATTERN.match(expr.strip())
-    if not match:
-        raise ValueError(f"Invalid position expression: {expr}")
 
-    element_id = match.group("element_id")
-    attr = match.group("attr")
-    op = match.group("op")
-    offset_str = match.group("offset")
+    def __init__(self, elements: list[dict]):
+        self._elements: list[dict] = []
+        self._scopes: list[_Scope] = []
+        self._resolved: list[dict] = []
+        self._global_ids: dict[str, int] = {}
+        # Geometry is computed on first use, once per element
+        self._centers: dict[int, tuple[float, float]] = {}
+        self._bboxes: dict[int, tuple[float, float, float, float]] = {}
+
+        tree = self._collect(elements, _Scope())
+        # Elements without expressions are already resolved, as they are
+        self._resolved = list(self._elements)
+        self._expressions = [_expressions(element) for element in self._elements]
+
+        dependencies = [
+            self._dependencies(index) if expressions else []
+            for index, expressions in enumerate(self._expressions)
+        ]
+        pending = [index for index, expressions in enumerate(self._expressions) if expressions]
+        for index in _topological_order(dependencies, self._elements, pending):
+            self._resolved[index] = self._resolve_element(index)
+
+        self.elements = self._build(tree)
+
+    def local(self, element_id: str) -> dict:
+        """Get a resolved element in the coordinates of its own group.
+
+        Raises:
+            ValueError: If the id is unknown.
+        """
+        return self._resolved[self._global_index(element_id)]
+
+    def absolute(self, element_id: str) -> dict:
+        """Get an element's position attributes in document coordinates.
+
+        Points are transformed by the composed group transforms, and lengths
+        (width, height, r, rx, ry) are scaled by them.
+
+        Raises:
+            ValueError: If the id is unknown.
+        """
+        index = self._global_index(element_id)
+        document = _Scope()
+        return {
+            attr: self._value_in(index, attr, document)
+            for attr, value in self._resolved[index].items()
+            if attr in POSITION_ATTRS and isinstance(value, (int, float))
+        }
+
+    def center(self, element_id: str) -> tuple[float, float]:
+        """Get an element's center in the coordinates of its own group.
+
+        Raises:
+            ValueError: If the id is unknown or the element has no center.
+        """
+        return self._center(self._global_index(element_id))
+
+    def bbox(self, element_id: str) -> tuple[float, float, float, float]:
+        """Get an element's bounding box in the coordinates of its own group.
+
+        Returns:
+            Tuple of (min_x, min_y, max_x, max_y).
+
+        Raises:
+            ValueError: If the id is unknown or the element has no bounding box.
+        """
+        return self._bbox(self._global_index(element_id))
+
+    def _bbox(self, index: int) -> tuple[float, float, float, float]:
+        bbox = self._bboxes.get(index)
+        if bbox is None:
+            bbox = self._bboxes[index] = get_element_bbox(self._resolved[index])
+        return bbox
+
+    def _center(self, index: int) -> tuple[float, float]:
+        center = self._centers.get(index)
+        if center is None:
+            center = self._centers[index] = get_element_center(self._resolved[index])
+        return center
+
+    def _collect(self, elements: list[dict], scope: _Scope) -> list[tuple]:
+        """Register every element in a (sub)tree, returning its layout for _build."""
+        items: list[tuple] = []
+        for element in elements:
+            element_type = element.get("type")
+            if element_type == "connection":
+                items.append(("connection", element, scope))
+            elif element_type == "group":
+                group_scope = _Scope(scope, element.get("transform"))
+                children = self._collect(element.get("elements", []), group_scope)
+                items.append(("group", element, children))
+            else:
+                index = len(self._elements)
+                self._elements.append(element)
+                self._scopes.append(scope)
+                element_id = element.get("id")
+                if element_id:
+                    scope.ids[element_id] = index
+                    self._global_ids[element_id] = index
+                items.append(("element", index))
+        return items
+
+    def _build(self, items: list[tuple]) -> list[dict]:
+        """Rebuild a (sub)tree from resolved elements, connections first."""
+        connections: list[dict] = []
+        others: list[dict] = []
+        for item in items:
+            if item[0] == "element":
+                others.append(self._resolved[item[1]])
+            elif item[0] == "connection":
+                connections.append(self._resolve_connection(item[1], item[2]))
+            else:
+                group = item[1]
+                children = self._build(item[2])
+                # Share the group when nothing inside it changed
+                original = group.get("elements", [])
+                if len(children) != len(original) or any(
+                    new is not old for new, old in zip(children, original)
+                ):
+                    group = {**group, "elements": children}
+                others.append(group)
+        return connections + others
+
+    def _lookup(self, element_id: str, scope: _Scope) -> int:
+        index = scope.ids.get(element_id)
+        if index is None:
+            index = self._global_index(element_id)
+        return index
+
+    def _global_index(self, element_id: str) -> int:
+        index = self._global_ids.get(element_id)
+        if index is None:
+            raise ValueError(f"Unknown element reference: {element_id}")
+        return index
+
+    def _dependencies(self, index: int) -> list[int]:
+        """Get the indices of the elements referenced by an element's expressions."""
+        scope = self._scopes[index]
+        return [
+            self._lookup(element_id, scope)
+            for _, expr in self._expressions[index]
+            for element_id, _ in compile_expression(expr).references
+        ]
+
+    def _resolve_element(self, index: int) -> dict:
+        """Resolve position references in a single element.
+
+        Only the resolved attributes are copied: the result is a shallow
+        copy, sharing everything else (animations, segments) with the
+        original.
+        """
+        scope = self._scopes[index]
+        resolved = dict(self._elements[index])
+        for key, expr in self._expressions[index]:
+            resolved[key] = self._resolve_expression(expr, scope)
+        return resolved
+
+    def _resolve_expression(self, expr: str, scope: _Scope) -> float:
+        """Evaluate an expression like "(box1.x + box2.x) / 2" in the given coordinate space.
+
+        Raises:
+            ValueError: If the expression is malformed or references an
+                unknown element or attribute.
+        """
+        compiled = compile_expression(expr)
+        return compiled.evaluate(
+            lambda element_id, attr: self._reference_value(element_id, attr, scope)
+        )
+
+    def _reference_value(self, element_id: str, attr: str, scope: _Scope) -> float:
+        index = self._lookup(element_id, scope)
+        value = self._value_in(index, attr, scope)
+        if value is None:
+            raise ValueError(f"Unknown attribute '{attr}' on element '{element_id}'")
+        return value
+
+    def _attribute(self, index: int, attr: str) -> float | None:
+        """Get a resolved attribute, or compute it from the bounding box.
+
+        Returns:
+            The value, or None if the element has no such attribute.
+        """
+        value = self._resolved[index].get(attr)
+        if isinstance(value, (int, float)):
+            return float(value)
+        if attr not in COMPUTED_ATTRS:
+            return None
+
+        try:
+            min_x, min_y, max_x, max_y = self._bbox(index)
+        except (KeyError, ValueError):
+            return None
+        if attr == "left":
+            return min_x
+        if attr == "top":
+            return min_y
+        if attr == "right":
+            return max_x
+        if attr == "bottom":
+            return max_y
+        if attr == "cx":
+            return (min_x + max_x) / 2
+        if attr == "cy":
+            return (min_y + max_y) / 2
+        if attr == "width":
+            return max_x - min_x
+        return max_y - min_y
+
+    def _value_in(self, index: int, attr: str, scope: _Scope) -> float | None:
+        """Get an attribute of an element, converted into another scope.
+
+        Returns:
+            The value, or None if the element has no such attribute.
+        """
+        value = self._attribute(index, attr)
+        source = self._scopes[index]
+        if value is None or source is scope or source.matrix == scope.matrix:
+            return value
+
+        partner = POINT_PARTNERS.get(attr)
+        if partner is None:
+            # A length: scale by the ratio of the two spaces
+            return value * scale_factor(source.matrix) / scale_factor(scope.matrix)
+
+        is_x = attr in X_ATTRS
+        other = self._attribute(index, partner) or 0.0
+        point = (value, other) if is_x else (other, value)
+        x, y = apply(scope.inverse, *apply(source.matrix, *point))
+        return x if is_x else y
+
+    def _center_in(self, index: int, scope: _Scope) -> tuple[float, float]:
+        """Get the center of an element in the given coordinate space."""
+        x, y = self._center(index)
+        source = self._scopes[index]
+        if source is scope or source.matrix == scope.matrix:
+            return (x, y)
+        return apply(scope.inverse, *apply(source.matrix, x, y))
+
+    def _resolve_connection(self, connection: dict, scope: _Scope) -> dict:
+        """Resolve a connection, adding x1, y1, x2, y2 from the centers of its ends.
+
+        Raises:
+            ValueError: If an end is missing or references an unknown element.
+        """
+        from_id = connection.get("from")
+        to_id = connection.get("to")
+        if from_id is None or to_id is None:
+            raise ValueError("Connection requires both 'from' and 'to' element ids")
+        from_index = self._lookup(from_id, scope)
+        to_index = self._lookup(to_id, scope)
+
+        x1, y1 = self._center_in(from_index, scope)
+        x2, y2 = self._center_in(to_index, scope)
+
+        return {**connection, "x1": x1, "y1": y1, "x2": x2, "y2": y2}
+
+
+def _expressions(element: dict) -> list[tuple[str, str]]:
+    """Get the position attributes of an element that hold expressions."""
+    return [
+        (key, element[key])
+        for key in sorted(POSITION_ATTRS.intersection(element))
+        if isinstance(element[key], str)
+    ]
+
+
+def _topological_order(
+    dependencies: list[list[int]],
+    elements: list[dict],
+    pending: list[int],
+) -> list[int]:
+    """Order element indices so each comes after the elements it references.
+
+    Uses an iterative depth-first search, so long reference chains don't
+    hit the recursion limit. Unrelated elements keep their list order.
 
-    if element_id not in registry:
-        raise ValueError(f"Unknown element reference: {element_id}")
-
-    element = registry[element_id]
-    if attr not in element:
-        raise ValueError(f"Unknown attribute '{attr}' on element '{element_id}'")
-
-    base_value = float(element[attr])
-
-    if op and offset_str:
-        offset = float(offset_str)
-        if op == "+":
-            return base_value + offset
-        else:  # op == "-"
-            return base_value - offset
+    Args:
+        dependencies: For each element, the indices of elements it references.
+        elements: The elements, for naming them in errors.
+        pending: Indices of the elements to order. Elements that aren't
+            pending have no dependencies and are treated as finished.
 
-    return base_value
+    Raises:
+        ValueError: If the references form a cycle.
+    """
+    # 0 = not visited, 1 = on the current search path, 2 = finished
+    state = [2] * len(dependencies)
+    for index in pending:
+        state[index] = 0
+    order: list[int] = []
+
+    for root in pending:
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(dependencies[root]))]
+        while stack:
+            node, remaining = stack[-1]
+            for dependency in remaining:
+                if state[dependency] == 0:
+                    state[dependency] = 1
+                    stack.append((dependency, iter(dependencies[dependency])))
+                    break
+                if state[dependency] == 1:
+                    path = [index for index, _ in stack]
+                    cycle = path[path.index(dependency):] + [dependency]
+                    names = " -> ".join(elements[index]["id"] for index in cycle)
+                    raise ValueError(f"Circular position reference: {names}")
+            else:
+                state[node] = 2
+                order.append(node)
+                stack.pop()
+
+    return order
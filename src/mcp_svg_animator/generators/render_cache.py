@@ -0,0 +1,252 @@
+"""Content-addressed cache for rendered SVG, PNG and video output.
+
+SVG strings are kept in memory and PNG and video files in an on-disk store;
+both are evicted least-recently-used once they exceed a size limit.
+Keys are hashes of the normalized spec (or SVG) plus the render parameters,
+so identical requests are served without re-rendering or launching a browser.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable
+
+
+def cache_key(kind: str, *parts: Any) -> str:
+    """Build a cache key from an output kind and its inputs.
+
+    Dicts are serialized with sorted keys, so specs that differ only in key
+    order share a key.
+    """
+    payload = json.dumps(
+        [kind, *parts], sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SvgCache:
+    """In-memory cache of rendered SVG strings with size-bounded LRU eviction.
+
+    Args:
+        max_bytes: Total UTF-8 size of the cached strings above which old
+            entries are evicted. A single SVG larger than this is not cached.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        """Return the cached SVG for a key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, svg: str) -> None:
+        """Store an SVG, evicting the least recently used entries if full."""
+        size = len(svg.encode())
+        with self._lock:
+            replaced = self._entries.pop(key, None)
+            if replaced is not None:
+                self._total_bytes -= replaced[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (svg, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+class FileCache:
+    """On-disk store of rendered files with size-bounded LRU eviction.
+
+    Entry modification times record when they were last used. Hits are
+    copied to the output path rather than hard-linked, because the renderers
+    overwrite output files in place and would otherwise corrupt the entry.
+
+    The store's total size is counted once, on the first store, and then
+    kept as a running total; the directory is only scanned again when the
+    total exceeds max_bytes and entries must be evicted.
+
+    Args:
+        directory: Directory holding the cached files.
+        max_bytes: Total size above which old entries are evicted.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._total_bytes: int | None = None
+        self._lock = threading.Lock()
+
+    def fetch(self, key: str, output_path: str | Path) -> bool:
+        """Copy a cached file to output_path.
+
+        Returns:
+            True on a hit, False if the key is not cached.
+        """
+        entry = self.directory / key
+        try:
+            os.utime(entry)
+            shutil.copyfile(entry, output_path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def read(self, key: str) -> bytes | None:
+        """Return the content of a cached file, or None if the key is not cached."""
+        entry = self.directory / key
+        try:
+            os.utime(entry)
+            return entry.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def store(self, key: str, source_path: str | Path) -> None:
+        """Add a rendered file to the cache, then evict down to max_bytes."""
+        self._commit(key, lambda temp_path: shutil.copyfile(source_path, temp_path))
+
+    def store_bytes(self, key: str, data: bytes) -> None:
+        """Add rendered content to the cache, then evict down to max_bytes."""
+        self._commit(key, lambda temp_path: Path(temp_path).write_bytes(data))
+
+    def _commit(self, key: str, write: Callable[[str], Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write under a temporary name and rename, so concurrent readers never
+        # see a partially written entry.
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        os.close(fd)
+        entry = self.directory / key
+        try:
+            write(temp_path)
+            size = os.path.getsize(temp_path)
+            with self._lock:
+                if self._total_bytes is None:
+                    self._total_bytes = self._scan()[1]
+                replaced = _file_size(entry)
+                os.replace(temp_path, entry)
+                self._total_bytes += size - replaced
+                if self._total_bytes > self.max_bytes:
+                    self._evict()
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    def _scan(self) -> tuple[list[tuple[float, int, Path]], int]:
+        """List entries as (mtime, size, path) and total their sizes."""
+        entries = []
+        total = 0
+        for entry in self.directory.iterdir():
+            if entry.name.startswith(".tmp-"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+        return entries, total
+
+    def _evict(self) -> None:
+        # Rescan rather than trust the running total, which doesn't see
+        # entries added or removed by other processes sharing the directory
+        entries, total = self._scan()
+        entries.sort()
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+        self._total_bytes = total
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+_svg_cache: SvgCache | None = None
+_svg_cache_lock = threading.Lock()
+
+
+def get_svg_cache() -> SvgCache | None:
+    """Get the process-wide SVG cache, or None if caching is disabled.
+
+    The cache is replaced if the configured size limit changes.
+    """
+    global _svg_cache
+    from ..config import get_render_cache_settings
+
+    settings = get_render_cache_settings()
+    if not settings["enabled"]:
+        return None
+    with _svg_cache_lock:
+        if _svg_cache is None or _svg_cache.max_bytes != settings["svg_max_bytes"]:
+            _svg_cache = SvgCache(settings["svg_max_bytes"])
+        return _svg_cache
+
+
+_file_cache: FileCache | None = None
+_file_cache_lock = threading.Lock()
+
+
+def get_file_cache() -> FileCache | None:
+    """Get the process-wide on-disk render cache, or None if caching is disabled.
+
+    The cache is shared so that its running size total is too; it is
+    replaced if the configured directory or size limit changes.
+    """
+    global _file_cache
+    from ..config import get_render_cache_settings
+
+    settings = get_render_cache_settings()
+    if not settings["enabled"]:
+        return None
+    directory = Path(settings["directory"]).expanduser()
+    with _file_cache_lock:
+        if (
+            _file_cache is None
+            or _file_cache.directory != directory
+            or _file_cache.max_bytes != settings["max_bytes"]
+        ):
+            _file_cache = FileCache(directory, settings["max_bytes"])
+        return _file_cache
+
+
+def clear_svg_cache() -> None:
+    """Discard the process-wide SVG cache. Useful for testing."""
+    global _svg_cache
+    with _svg_cache_lock:
+        _svg_cache = None
+
+
+def clear_file_cache() -> None:
+    """Forget the process-wide file cache (its files are kept). Useful for testing."""
+    global _file_cache
+    with _file_cache_lock:
+        _file_cache = None
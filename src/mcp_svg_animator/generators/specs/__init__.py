@@ -5,7 +5,7 @@ from .circle_spec import CircleSpec
 from .connection_spec import ConnectionSpec
 from .element_spec import ElementSpec
 from .ellipse_spec import EllipseSpec
-from .group_spec import GroupSpec
+from .group_spec import AnyElementSpec, GroupSpec
 from .line_spec import LineSpec
 from .path_spec import PathSpec
 from .rectangle_spec import RectangleSpec
@@ -21,9 +21,11 @@ from .segment_specs import (
 )
 from .text_spec import TextSpec
 from .transform_animation_spec import TransformAnimationSpec
+from .validation import validate_element, validate_elements
 
 __all__ = [
     "AnimationSpec",
+    "AnyElementSpec",
     "ArcSpec",
     "CircleSpec",
     "CloseSpec",
@@ -42,4 +44,6 @@ __all__ = [
     "TextSpec",
     "TransformAnimationSpec",
     "segments_to_path_data",
+    "validate_element",
+    "validate_elements",
 ]
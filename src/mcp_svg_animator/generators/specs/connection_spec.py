@@ -19,3 +19,9 @@ class ConnectionSpec(ElementSpec):
     stroke: str = "black"
     stroke_width: float = Field(default=2, alias="stroke-width")
     marker_end: str | None = Field(default=None, alias="marker-end")
+
+    # Endpoints, filled in from the element centers by resolve_positions
+    x1: float | None = None
+    y1: float | None = None
+    x2: float | None = None
+    y2: float | None = None
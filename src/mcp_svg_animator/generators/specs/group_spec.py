@@ -1,9 +1,16 @@
 """Group element specification class."""
 
-from typing import Literal
+from typing import Annotated, Literal
 
 from pydantic import BaseModel, Field
 
+from .circle_spec import CircleSpec
+from .connection_spec import ConnectionSpec
+from .ellipse_spec import EllipseSpec
+from .line_spec import LineSpec
+from .path_spec import PathSpec
+from .rectangle_spec import RectangleSpec
+from .text_spec import TextSpec
 from .transform_animation_spec import TransformAnimationSpec
 
 
@@ -14,6 +21,21 @@ class GroupSpec(BaseModel):
     type: Literal["group"] = "group"
     transform: str | None = None
     transform_animations: list[TransformAnimationSpec] = Field(default_factory=list)
-    elements: list[dict] = Field(default_factory=list)
+    elements: list["AnyElementSpec"] = Field(default_factory=list)
 
     model_config = {"populate_by_name": True}
+
+
+AnyElementSpec = Annotated[
+    CircleSpec
+    | EllipseSpec
+    | RectangleSpec
+    | LineSpec
+    | TextSpec
+    | PathSpec
+    | ConnectionSpec
+    | GroupSpec,
+    Field(discriminator="type"),
+]
+
+GroupSpec.model_rebuild()
@@ -28,3 +28,21 @@ class TextSpec(ElementSpec):
     # Background panel
     background: str | None = None
     background_padding: float = Field(default=4, alias="background-padding")
+
+    def background_box(self) -> tuple[float, float, float, float]:
+        """Get the (x, y, width, height) of the background panel.
+
+        Text dimensions are approximated from the font size and text length.
+        """
+        padding = self.background_padding
+        char_width = self.font_size * 0.6  # Approximate character width
+        text_width = len(self.text) * char_width
+        text_height = self.font_size
+
+        # Position rect behind text (text y is baseline, rect needs top-left)
+        return (
+            self.x - padding,
+            self.y - text_height + padding / 2,
+            text_width + 2 * padding,
+            text_height + padding,
+        )
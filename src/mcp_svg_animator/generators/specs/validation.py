@@ -0,0 +1,75 @@
+"""Validate element specifications in bulk."""
+
+from functools import lru_cache
+
+from pydantic import TypeAdapter, ValidationError
+
+from .group_spec import AnyElementSpec
+
+
+@lru_cache(maxsize=None)
+def _element_adapter() -> TypeAdapter:
+    return TypeAdapter(AnyElementSpec)
+
+
+@lru_cache(maxsize=None)
+def _element_list_adapter() -> TypeAdapter:
+    return TypeAdapter(list[AnyElementSpec])
+
+
+def validate_elements(elements: list[dict]) -> list:
+    """Validate a list of element dicts, including nested group children.
+
+    The whole tree is validated in a single call to a cached pydantic
+    TypeAdapter over the discriminated union of element specs.
+
+    Args:
+        elements: Element specification dicts.
+
+    Returns:
+        List of element spec objects.
+
+    Raises:
+        ValueError: If an element is missing its 'type' key, has an unknown
+            type, or has invalid attributes.
+    """
+    try:
+        return _element_list_adapter().validate_python(elements)
+    except ValidationError as e:
+        _raise_type_error(e)
+        raise
+
+
+def validate_element(element: dict):
+    """Validate a single element dict, including nested group children.
+
+    Args:
+        element: Element specification dict.
+
+    Returns:
+        Element spec object.
+
+    Raises:
+        ValueError: If the element is missing its 'type' key, has an
+            unknown type, or has invalid attributes.
+    """
+    try:
+        return _element_adapter().validate_python(element)
+    except ValidationError as e:
+        _raise_type_error(e)
+        raise
+
+
+def _raise_type_error(error: ValidationError) -> None:
+    """Re-raise a missing or unknown element type with a plain message."""
+    for detail in error.errors():
+        loc = detail["loc"]
+        # Element tags sit at the top level or directly under a group's
+        # elements; tag errors elsewhere belong to path segments.
+        if len(loc) > 1 and loc[-2] != "elements":
+            continue
+        if detail["type"] == "union_tag_not_found":
+            raise ValueError("Element spec missing 'type' key") from None
+        if detail["type"] == "union_tag_invalid":
+            tag = (detail.get("ctx") or {}).get("tag")
+            raise ValueError(f"Unknown element type: {tag}") from None
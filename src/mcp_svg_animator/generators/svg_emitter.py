@@ -0,0 +1,345 @@
+"""Fast SVG backend that writes markup directly from element specs.
+
+Produces the same markup, byte for byte, as the drawsvg backend in
+animations.py, but without building a tree of drawsvg objects first.
+Attribute values are taken from the same kwargs builders, so the two
+backends stay in step.
+"""
+
+import io
+import os
+import secrets
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, TextIO
+from xml.sax.saxutils import escape
+
+from .animations import (
+    _build_common_kwargs,
+    _build_connection_kwargs,
+    _build_text_kwargs,
+    _connection_endpoints,
+    _marker_id,
+    _transform_animation_markup,
+)
+from .position_resolver import resolve_positions
+from .specs.animation_spec import AnimationSpec
+from .specs.circle_spec import CircleSpec
+from .specs.connection_spec import ConnectionSpec
+from .specs.ellipse_spec import EllipseSpec
+from .specs.group_spec import GroupSpec
+from .specs.line_spec import LineSpec
+from .specs.path_spec import PathSpec
+from .specs.rectangle_spec import RectangleSpec
+from .specs.text_spec import TextSpec
+from .specs.validation import validate_element, validate_elements
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+_ATTR_ENTITIES = {'"': "&quot;"}
+
+
+def emit_diagram(
+    arguments: dict,
+    validate: Callable[[list[dict]], list] = validate_elements,
+) -> str:
+    """Create an animated SVG diagram without drawsvg.
+
+    Args:
+        arguments: Same dictionary as create_animated_diagram accepts.
+        validate: Turns the resolved element dicts into element specs.
+
+    Returns:
+        SVG content as a string.
+    """
+    # Buffer the body so marker definitions can go first, as drawsvg does
+    body = io.StringIO()
+    writer = _SvgWriter(body.write)
+    elements = resolve_positions(arguments.get("elements", []))
+    for spec in validate(elements):
+        writer.element(spec)
+        body.write("\n")
+
+    out = io.StringIO()
+    _write_start(out.write, arguments)
+    _write_defs(out.write, writer.defs)
+    out.write(body.getvalue())
+    out.write("</svg>")
+    return out.getvalue()
+
+
+def stream_diagram(arguments: dict, out: TextIO) -> None:
+    """Write an animated SVG diagram to a file-like object as it is generated.
+
+    The header is written first, then each element as soon as it has been
+    created, then the footer, so the SVG document is never held in memory.
+    The element specs and their resolved positions still are: layout
+    references may point anywhere in the diagram, so every element is
+    resolved before the first is written. Marker definitions are only known
+    once their elements have been written, so they follow the elements
+    instead of preceding them; SVG references resolve across the whole
+    document either way.
+
+    Args:
+        arguments: Same dictionary as create_animated_diagram accepts.
+        out: Text stream to write the SVG to.
+    """
+    write = out.write
+    _write_start(write, arguments)
+    writer = _SvgWriter(write)
+    # Validate one element at a time so specs don't accumulate in memory
+    for element in resolve_positions(arguments.get("elements", [])):
+        writer.element(validate_element(element))
+        write("\n")
+    if writer.defs:
+        _write_defs(write, writer.defs)
+    write("</svg>")
+
+
+@contextmanager
+def open_replacing(output_path: str | Path) -> Iterator[TextIO]:
+    """Open a text file that replaces output_path once it is fully written.
+
+    The content goes to a temporary file in the same directory, which is
+    renamed over output_path when the block succeeds and removed if it
+    fails, so an interrupted stream never leaves a truncated file behind.
+
+    Args:
+        output_path: Path of the file to write.
+
+    Yields:
+        Text stream to write the new content to.
+    """
+    output_path = Path(output_path)
+    temp_path = output_path.with_name(f".{output_path.name}.{secrets.token_hex(4)}.tmp")
+    # Created like open() would, so the final file gets the usual permissions
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with open(fd, "w", encoding="utf-8") as out:
+            yield out
+        os.replace(temp_path, output_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def _write_start(write: Callable[[str], object], arguments: dict) -> None:
+    width = arguments.get("width", 400)
+    height = arguments.get("height", 300)
+    write(XML_HEADER)
+    write(
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        'xmlns:xlink="http://www.w3.org/1999/xlink"\n'
+        f'     width="{width}" height="{height}" viewBox="0 0 {width} {height}">\n'
+    )
+
+
+def _write_defs(write: Callable[[str], object], defs: list[str]) -> None:
+    write("<defs>\n")
+    for definition in defs:
+        write(definition)
+        write("\n")
+    write("</defs>\n")
+
+
+def _format_attrs(kwargs: dict) -> str:
+    """Format kwargs as SVG attributes, using drawsvg's naming (stroke_width -> stroke-width)."""
+    return "".join(
+        f' {key.replace("_", "-")}="{escape(str(value), _ATTR_ENTITIES)}"'
+        for key, value in kwargs.items()
+        if value is not None
+    )
+
+
+def _animate_markup(spec: AnimationSpec) -> str:
+    """Build the markup for an animate element."""
+    # Without a 'to' value, drawsvg treats the first value as a values list
+    if spec.to_value is None:
+        from_value, values = None, spec.from_value
+    else:
+        from_value, values = spec.from_value, None
+    attrs = {
+        "attributeName": spec.attribute,
+        "dur": spec.dur,
+        "from": from_value,
+        "to": spec.to_value,
+        "values": values,
+        "repeatCount": spec.repeat_count,
+    }
+    return f"<animate{_format_attrs(attrs)} />"
+
+
+def _arrow_marker_markup(marker_id: str, color: str) -> str:
+    """Build the markup for an arrowhead marker."""
+    fill = escape(color, _ATTR_ENTITIES)
+    return (
+        '<marker markerWidth="4.0" markerHeight="4.0" viewBox="-0.1 -0.5 1.0 1.0" '
+        f'orient="auto" id="{marker_id}">\n'
+        f'<path d="M-0.1,-0.5 L-0.1,0.5 L0.9,0 Z" fill="{fill}" />\n'
+        "</marker>"
+    )
+
+
+class _SvgWriter:
+    """Writes elements as SVG markup, collecting marker definitions."""
+
+    def __init__(self, write: Callable[[str], object]):
+        self.write = write
+        self.defs: list[str] = []
+        self._marker_ids: dict[str, str] = {}
+
+    def element(self, spec) -> None:
+        """Write a single element from a validated specification."""
+        if isinstance(spec, GroupSpec):
+            self._group(spec)
+        else:
+            _EMITTERS[spec.type](self, spec)
+
+    def _tag(
+        self,
+        tag: str,
+        attrs: dict,
+        animations: list[AnimationSpec],
+    ) -> None:
+        write = self.write
+        write(f"<{tag}{_format_attrs(attrs)}")
+        if not animations:
+            write(" />")
+            return
+        write(">\n")
+        for anim in animations:
+            write(_animate_markup(anim))
+            write("\n")
+        write(f"</{tag}>")
+
+    def _text_tag(self, spec: TextSpec, attrs: dict, animations: list[AnimationSpec]) -> None:
+        # drawsvg writes a text element's content and children inline, and
+        # splits multi-line text into one tspan per line
+        write = self.write
+        write(f"<text{_format_attrs(attrs)}>")
+        if "\n" in spec.text:
+            x = _format_attrs({"x": spec.x})
+            for index, line in enumerate(spec.text.splitlines()):
+                write(f'<tspan{x} dy="{0 if index == 0 else 1}em">{escape(line)}</tspan>')
+        else:
+            write(escape(spec.text))
+        for anim in animations:
+            write(_animate_markup(anim))
+        write("</text>")
+
+    def _marker_url(self, color: str) -> str:
+        # One definition per color, in order of first use
+        marker_id = self._marker_ids.get(color)
+        if marker_id is None:
+            marker_id = _marker_id("arrow", color)
+            self._marker_ids[color] = marker_id
+            self.defs.append(_arrow_marker_markup(marker_id, color))
+        return f"url(#{marker_id})"
+
+    def _circle(self, spec: CircleSpec) -> None:
+        attrs = {"cx": spec.cx, "cy": spec.cy, "r": spec.r, **_build_common_kwargs(spec)}
+        self._tag("circle", attrs, spec.animations)
+
+    def _ellipse(self, spec: EllipseSpec) -> None:
+        attrs = {
+            "cx": spec.cx,
+            "cy": spec.cy,
+            "rx": spec.rx,
+            "ry": spec.ry,
+            **_build_common_kwargs(spec),
+        }
+        self._tag("ellipse", attrs, spec.animations)
+
+    def _rectangle(self, spec: RectangleSpec) -> None:
+        attrs = {
+            "x": spec.x,
+            "y": spec.y,
+            "width": spec.width,
+            "height": spec.height,
+            **_build_common_kwargs(spec),
+        }
+        if spec.rx is not None:
+            attrs["rx"] = spec.rx
+        if spec.ry is not None:
+            attrs["ry"] = spec.ry
+        self._tag("rect", attrs, spec.animations)
+
+    def _line(self, spec: LineSpec) -> None:
+        kwargs = _build_common_kwargs(spec)
+        # Line doesn't use fill
+        del kwargs["fill"]
+        if spec.marker_end == "arrow":
+            kwargs["marker_end"] = self._marker_url(spec.stroke)
+        attrs = {"d": f"M{spec.x1},{spec.y1} L{spec.x2},{spec.y2}", **kwargs}
+        self._tag("path", attrs, spec.animations)
+
+    def _text(self, spec: TextSpec) -> None:
+        attrs = {
+            "x": spec.x,
+            "y": spec.y,
+            "font_size": spec.font_size,
+            **_build_text_kwargs(spec),
+        }
+        if not spec.background:
+            self._text_tag(spec, attrs, spec.animations)
+            return
+
+        # Background panel: group the rect and text, animating the group
+        rect_x, rect_y, rect_width, rect_height = spec.background_box()
+        write = self.write
+        write("<g>\n")
+        self._tag("rect", {
+            "x": rect_x,
+            "y": rect_y,
+            "width": rect_width,
+            "height": rect_height,
+            "fill": spec.background,
+            "stroke": "none",
+        }, [])
+        write("\n")
+        self._text_tag(spec, attrs, [])
+        write("\n")
+        for anim in spec.animations:
+            write(_animate_markup(anim))
+            write("\n")
+        write("</g>")
+
+    def _path(self, spec: PathSpec) -> None:
+        attrs = {"d": spec.get_path_data(), **_build_common_kwargs(spec)}
+        self._tag("path", attrs, spec.animations)
+
+    def _connection(self, spec: ConnectionSpec) -> None:
+        kwargs = _build_connection_kwargs(spec)
+        if spec.marker_end == "arrow":
+            kwargs["marker_end"] = self._marker_url(spec.stroke)
+        x1, y1, x2, y2 = _connection_endpoints(spec)
+        attrs = {"d": f"M{x1},{y1} L{x2},{y2}", **kwargs}
+        self._tag("path", attrs, spec.animations)
+
+    def _group(self, spec: GroupSpec) -> None:
+        write = self.write
+        attrs = {"transform": spec.transform} if spec.transform else {}
+        write(f"<g{_format_attrs(attrs)}>")
+        # Groups are containers, so drawsvg never self-closes them
+        if not spec.elements and not spec.transform_animations:
+            write("</g>")
+            return
+        write("\n")
+        for child_spec in spec.elements:
+            self.element(child_spec)
+            write("\n")
+        for anim in spec.transform_animations:
+            write(_transform_animation_markup(anim))
+            write("\n")
+        write("</g>")
+
+
+_EMITTERS: dict[str, Callable] = {
+    "circle": _SvgWriter._circle,
+    "ellipse": _SvgWriter._ellipse,
+    "rectangle": _SvgWriter._rectangle,
+    "line": _SvgWriter._line,
+    "text": _SvgWriter._text,
+    "path": _SvgWriter._path,
+    "connection": _SvgWriter._connection,
+}
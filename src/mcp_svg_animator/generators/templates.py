@@ -0,0 +1,263 @@
+"""Diagram templates: parse once, render many times with different parameters.
+
+A template is an ordinary diagram specification whose string values may
+contain `${name}` placeholders. A value that is exactly one placeholder is
+replaced by the parameter value itself, so numbers stay numbers; otherwise
+each placeholder is replaced by the parameter's text. Defaults come from an
+optional top-level `parameters` mapping.
+
+Compiling a template parses the YAML, loads libraries, expands definitions
+and validates the top-level elements that contain no placeholders, once.
+Each render only copies the containers on the paths to the placeholders,
+resolves positions (which may depend on parameters), validates the
+elements that changed and writes the diagram. Static elements without
+position references pass through resolution untouched, so their specs are
+reused.
+
+Libraries are checked on every render, as create_diagram_from_yaml does,
+and the template is expanded again when one has changed.
+"""
+
+import re
+from typing import Any
+
+from ..spec_parser import load_spec
+from .animations import BACKENDS, create_animated_diagram
+from .specs.validation import validate_element, validate_elements
+from .yaml_loader import _expand_definitions, _load_libraries
+
+PLACEHOLDER_PATTERN = re.compile(r"\$\{(\w+)\}")
+
+_Path = tuple[str | int, ...]
+
+
+class _Expansion:
+    """A template expanded against one version of its libraries.
+
+    Attributes:
+        libraries: The library definition dicts it was expanded with.
+        spec: The expanded specification, still containing placeholders.
+        slots: Path and template string of every placeholder value.
+        names: Names of the parameters used in the placeholders.
+        static_specs: Validated specs of the top-level elements without
+            placeholders, by id of the element dict (kept to pin the id).
+    """
+
+    __slots__ = ("libraries", "spec", "slots", "names", "static_specs")
+
+    def __init__(self, source: dict, libraries: list[dict]):
+        self.libraries = libraries
+        self.spec = _expand_definitions(source, libraries)
+        self.slots: list[tuple[_Path, str]] = []
+        _find_slots(self.spec, (), self.slots)
+        self.names = frozenset(
+            name
+            for _, template in self.slots
+            for name in PLACEHOLDER_PATTERN.findall(template)
+        )
+
+        touched = {path[1] for path, _ in self.slots if len(path) > 1 and path[0] == "elements"}
+        self.static_specs: dict[int, tuple[dict, Any]] = {}
+        for index, element in enumerate(self.spec.get("elements", [])):
+            if index in touched or not isinstance(element, dict):
+                continue
+            try:
+                self.static_specs[id(element)] = (element, validate_element(element))
+            except ValueError:
+                # Relative positions and connections are only valid once
+                # resolved, and invalid elements should fail at render time
+                continue
+
+    def is_current(self, libraries: list[dict]) -> bool:
+        """Whether the libraries are the ones this expansion was made with."""
+        return len(libraries) == len(self.libraries) and all(
+            new is old for new, old in zip(libraries, self.libraries)
+        )
+
+    def validate(self, elements: list[dict]) -> list:
+        """Validate resolved elements, reusing the specs of static elements."""
+        specs: list = []
+        changed: list[int] = []
+        for index, element in enumerate(elements):
+            entry = self.static_specs.get(id(element))
+            if entry is not None and entry[0] is element:
+                specs.append(entry[1])
+            else:
+                specs.append(None)
+                changed.append(index)
+        if len(changed) == len(elements):
+            return validate_elements(elements)
+        try:
+            validated = validate_elements([elements[index] for index in changed])
+        except ValueError:
+            # Validate the whole list, so the error gives the element's real index
+            validate_elements(elements)
+            raise
+        for index, spec in zip(changed, validated):
+            specs[index] = spec
+        return specs
+
+
+class DiagramTemplate:
+    """A compiled diagram template.
+
+    Args:
+        spec: Parsed diagram specification containing placeholders.
+        backend: SVG backend used by render, "drawsvg" or "fast".
+
+    Attributes:
+        defaults: Default parameter values from the `parameters` section.
+    """
+
+    def __init__(self, spec: dict, backend: str = "drawsvg"):
+        spec = dict(spec)
+        self.defaults: dict[str, Any] = dict(spec.pop("parameters", None) or {})
+        self.backend = backend
+        self._source = spec
+        self._expansion = _Expansion(spec, _load_libraries(spec))
+
+    @property
+    def names(self) -> frozenset[str]:
+        """Names of all parameters used in the template."""
+        return self._current().names | frozenset(self.defaults)
+
+    def spec(self, params: dict | None = None) -> dict:
+        """Build the diagram specification for a set of parameters.
+
+        The result shares every part of the template that has no
+        placeholders, so treat it as read-only.
+
+        Args:
+            params: Parameter values, overriding the defaults.
+
+        Returns:
+            The specification with all placeholders substituted.
+
+        Raises:
+            ValueError: If a parameter is unknown, or a used parameter has
+                neither a value nor a default.
+        """
+        return self._substitute(self._current(), params)
+
+    def render(self, params: dict | None = None) -> str:
+        """Render the template to SVG.
+
+        Args:
+            params: Parameter values, overriding the defaults.
+
+        Returns:
+            SVG content as a string.
+
+        Raises:
+            ValueError: If a parameter is unknown or missing, or the
+                resulting specification is invalid.
+        """
+        expansion = self._current()
+        return create_animated_diagram(
+            self._substitute(expansion, params), self.backend, expansion.validate
+        )
+
+    def _current(self) -> _Expansion:
+        """The expansion for the libraries as they are now on disk."""
+        expansion = self._expansion
+        if self._source.get("libraries"):
+            libraries = _load_libraries(self._source)
+            if not expansion.is_current(libraries):
+                expansion = self._expansion = _Expansion(self._source, libraries)
+        return expansion
+
+    def _substitute(self, expansion: _Expansion, params: dict | None) -> dict:
+        values = {**self.defaults, **(params or {})}
+        unknown = sorted(set(values) - expansion.names - set(self.defaults))
+        if unknown:
+            raise ValueError(f"Unknown template parameter: {unknown[0]}")
+
+        template_spec = expansion.spec
+        root = dict(template_spec)
+        # Copies made for this render, by id of the template container.
+        # Dict keys are str and list indices int, as _find_slots recorded them.
+        copies: dict[int, Any] = {id(template_spec): root}
+        for path, template in expansion.slots:
+            container: dict | list = root
+            original: dict | list = template_spec
+            for key in path[:-1]:
+                original = _child(original, key)
+                child = copies.get(id(original))
+                if child is None:
+                    child = copies[id(original)] = (
+                        list(original) if isinstance(original, list) else dict(original)
+                    )
+                _set_child(container, key, child)
+                container = child
+            _set_child(container, path[-1], _substitute(template, values))
+        return root
+
+
+def compile_template(yaml_content: str, backend: str = "drawsvg") -> DiagramTemplate:
+    """Compile a YAML (or JSON) diagram template.
+
+    Args:
+        yaml_content: Diagram specification with `${name}` placeholders.
+        backend: SVG backend used by render, "drawsvg" or "fast".
+
+    Returns:
+        The compiled template.
+
+    Raises:
+        ValueError: If a definition is unknown or the backend is invalid.
+        yaml.YAMLError: If the YAML is malformed.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+    spec = load_spec(yaml_content)
+    if not isinstance(spec, dict):
+        raise ValueError("Template must be a mapping")
+    return DiagramTemplate(spec, backend)
+
+
+def _find_slots(value: Any, path: _Path, slots: list[tuple[_Path, str]]) -> None:
+    """Record the path of every string containing a placeholder."""
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    else:
+        return
+    for key, item in items:
+        if isinstance(item, str):
+            if "${" in item and PLACEHOLDER_PATTERN.search(item):
+                slots.append(((*path, key), item))
+        else:
+            _find_slots(item, (*path, key), slots)
+
+
+def _child(container: dict | list, key: str | int) -> Any:
+    """Look up a path key: an index in a list, a key in a dict."""
+    if isinstance(container, list):
+        assert isinstance(key, int)
+        return container[key]
+    return container[key]
+
+
+def _set_child(container: dict | list, key: str | int, value: Any) -> None:
+    """Replace the value at a path key."""
+    if isinstance(container, list):
+        assert isinstance(key, int)
+        container[key] = value
+    else:
+        container[key] = value
+
+
+def _substitute(template: str, values: dict) -> Any:
+    """Fill in the placeholders of one template string."""
+    match = PLACEHOLDER_PATTERN.fullmatch(template)
+    if match:
+        return _value(match.group(1), values)
+    return PLACEHOLDER_PATTERN.sub(lambda m: str(_value(m.group(1), values)), template)
+
+
+def _value(name: str, values: dict) -> Any:
+    try:
+        return values[name]
+    except KeyError:
+        raise ValueError(f"Missing template parameter: {name}") from None
@@ -0,0 +1,122 @@
+"""Affine transforms for SVG transform attributes.
+
+Matrices use the SVG (a, b, c, d, e, f) form, mapping a point (x, y) to
+(a*x + c*y + e, b*x + d*y + f).
+"""
+
+import math
+import re
+
+Matrix = tuple[float, float, float, float, float, float]
+
+IDENTITY: Matrix = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+_FUNCTION_PATTERN = re.compile(r"\s*(\w+)\s*\(([^)]*)\)\s*,?")
+_NUMBER_PATTERN = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+def parse_transform(transform: str | None) -> Matrix:
+    """Parse an SVG transform attribute into a single matrix.
+
+    Supports matrix, translate, scale, rotate (with optional center),
+    skewX and skewY, in any sequence.
+
+    Args:
+        transform: Transform attribute value, or None for no transform.
+
+    Returns:
+        The composed matrix.
+
+    Raises:
+        ValueError: If the transform is malformed.
+    """
+    if not transform or not transform.strip():
+        return IDENTITY
+
+    result = IDENTITY
+    position = 0
+    while position < len(transform):
+        match = _FUNCTION_PATTERN.match(transform, position)
+        if not match:
+            if transform[position:].strip():
+                raise ValueError(f"Invalid transform: {transform}")
+            break
+        name, args = match.group(1), match.group(2)
+        values = [float(v) for v in _NUMBER_PATTERN.findall(args)]
+        result = multiply(result, _function_matrix(name, values, transform))
+        position = match.end()
+    return result
+
+
+def _function_matrix(name: str, values: list[float], transform: str) -> Matrix:
+    count = len(values)
+    if name == "matrix" and count == 6:
+        a, b, c, d, e, f = values
+        return (a, b, c, d, e, f)
+    if name == "translate" and count in (1, 2):
+        return (1.0, 0.0, 0.0, 1.0, values[0], values[1] if count == 2 else 0.0)
+    if name == "scale" and count in (1, 2):
+        sy = values[1] if count == 2 else values[0]
+        return (values[0], 0.0, 0.0, sy, 0.0, 0.0)
+    if name == "rotate" and count in (1, 3):
+        angle = math.radians(values[0])
+        cos, sin = math.cos(angle), math.sin(angle)
+        rotation = (cos, sin, -sin, cos, 0.0, 0.0)
+        if count == 1:
+            return rotation
+        cx, cy = values[1], values[2]
+        return multiply(
+            multiply((1.0, 0.0, 0.0, 1.0, cx, cy), rotation),
+            (1.0, 0.0, 0.0, 1.0, -cx, -cy),
+        )
+    if name == "skewX" and count == 1:
+        return (1.0, 0.0, math.tan(math.radians(values[0])), 1.0, 0.0, 0.0)
+    if name == "skewY" and count == 1:
+        return (1.0, math.tan(math.radians(values[0])), 0.0, 1.0, 0.0, 0.0)
+    raise ValueError(f"Invalid transform: {transform}")
+
+
+def multiply(m1: Matrix, m2: Matrix) -> Matrix:
+    """Compose two matrices; the result applies m2 first, then m1."""
+    a1, b1, c1, d1, e1, f1 = m1
+    a2, b2, c2, d2, e2, f2 = m2
+    return (
+        a1 * a2 + c1 * b2,
+        b1 * a2 + d1 * b2,
+        a1 * c2 + c1 * d2,
+        b1 * c2 + d1 * d2,
+        a1 * e2 + c1 * f2 + e1,
+        b1 * e2 + d1 * f2 + f1,
+    )
+
+
+def invert(m: Matrix) -> Matrix:
+    """Invert a matrix.
+
+    Raises:
+        ValueError: If the matrix is singular (e.g. scale(0)).
+    """
+    a, b, c, d, e, f = m
+    det = a * d - b * c
+    if det == 0:
+        raise ValueError("Transform is not invertible")
+    return (
+        d / det,
+        -b / det,
+        -c / det,
+        a / det,
+        (c * f - d * e) / det,
+        (b * e - a * f) / det,
+    )
+
+
+def apply(m: Matrix, x: float, y: float) -> tuple[float, float]:
+    """Transform a point."""
+    a, b, c, d, e, f = m
+    return (a * x + c * y + e, b * x + d * y + f)
+
+
+def scale_factor(m: Matrix) -> float:
+    """Get the uniform scale of a matrix (square root of its area scaling)."""
+    a, b, c, d, _, _ = m
+    return math.sqrt(abs(a * d - b * c))
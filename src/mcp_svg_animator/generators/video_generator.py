@@ -1,6 +1,29 @@
 """Generate video files from SVG animations using Playwright."""
 
-from playwright.sync_api import sync_playwright
+import asyncio
+import errno
+import math
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Awaitable, Callable, Iterator
+
+from .browser_pool import (
+    AsyncBrowserPool,
+    BrowserPool,
+    BrowserSlot,
+    get_async_browser_pool,
+    get_browser_pool,
+)
+from .render_cache import cache_key, get_file_cache
+
+# Frames each parallel chunk may capture ahead of the encoder
+CHUNK_BUFFER_FRAMES = 16
 
 
 def create_video_from_svg(
@@ -9,26 +32,684 @@ def create_video_from_svg(
     duration_ms: int = 3000,
     width: int | None = None,
     height: int | None = None,
+    pool: BrowserPool | None = None,
+    fps: int | None = None,
+    workers: int = 1,
 ) -> None:
     """Create a video file from an SVG animation.
 
     Uses Playwright to render the SVG in a headless browser and record it.
 
+    By default the animation is recorded in real time. If `fps` is given,
+    the SVG timeline is paused and seeked frame by frame instead: each frame
+    is screenshotted and the frames are encoded with ffmpeg. Frame-stepped
+    output does not depend on machine load, is identical across runs, and
+    can be produced faster than real time. With `workers` > 1 the frames
+    are split into contiguous chunks captured in parallel, each on its own
+    pooled browser, and stitched back together in order.
+
+    Videos already rendered with the same SVG and parameters are copied from
+    the render cache instead.
+
     Args:
         svg_content: The SVG content as a string.
         output_path: Path where the video file will be saved (.webm format).
         duration_ms: Duration of the video in milliseconds.
         width: Video width (defaults to SVG width or 800).
         height: Video height (defaults to SVG height or 600).
+        pool: Browser pool to record with (defaults to the shared pool).
+        fps: Frame rate for frame-stepped export (default: real-time recording).
+        workers: Number of chunks to capture in parallel when `fps` is given.
+            Parallelism is bounded by the pool size.
+
+    Raises:
+        ValueError: If fps is given but is not a positive integer.
+        RuntimeError: If frame-stepped export is requested and ffmpeg fails
+            or is not installed.
     """
+    _check_fps(fps)
     # Parse SVG dimensions if not provided
     if width is None:
         width = _extract_dimension(svg_content, "width") or 800
     if height is None:
         height = _extract_dimension(svg_content, "height") or 600
 
-    # Create HTML page with the SVG
-    html_content = f"""<!DOCTYPE html>
+    file_cache = get_file_cache()
+    key = cache_key("video", svg_content, duration_ms, width, height, fps)
+    if file_cache is not None and file_cache.fetch(key, output_path):
+        return
+
+    html_content = _build_html(svg_content, width, height)
+
+    if pool is None:
+        pool = get_browser_pool()
+    with _scratch_directory(output_path) as scratch:
+        video_path = os.path.join(scratch, "video.webm")
+        if fps is None:
+            pool.run(_record_video, html_content, scratch, video_path, duration_ms, width, height)
+        else:
+            _step_video(pool, html_content, video_path, duration_ms, fps, workers, width, height)
+        if os.path.exists(video_path):
+            _move_into_place(video_path, output_path)
+
+    if file_cache is not None and os.path.exists(output_path):
+        file_cache.store(key, output_path)
+
+
+def render_video_from_svg(
+    svg_content: str,
+    duration_ms: int = 3000,
+    width: int | None = None,
+    height: int | None = None,
+    pool: BrowserPool | None = None,
+    fps: int | None = None,
+    workers: int = 1,
+) -> bytes:
+    """Render an SVG animation to .webm video data in memory.
+
+    Same as create_video_from_svg, but returns the video instead of leaving
+    it at a caller-chosen path. Browsers and ffmpeg can only write video to
+    files, so it is recorded into a temporary directory and read back.
+
+    Returns:
+        The .webm video.
+
+    Raises:
+        RuntimeError: If frame-stepped export is requested and ffmpeg fails
+            or is not installed.
+    """
+    with _scratch_directory(None) as scratch:
+        output_path = os.path.join(scratch, "video.webm")
+        create_video_from_svg(
+            svg_content, output_path, duration_ms, width, height, pool, fps, workers
+        )
+        with open(output_path, "rb") as video_file:
+            return video_file.read()
+
+
+async def create_video_from_svg_async(
+    svg_content: str,
+    output_path: str,
+    duration_ms: int = 3000,
+    width: int | None = None,
+    height: int | None = None,
+    pool: AsyncBrowserPool | None = None,
+    fps: int | None = None,
+    workers: int = 1,
+) -> None:
+    """Create a video file from an SVG animation without leaving the event loop.
+
+    Async counterpart of create_video_from_svg, built on Playwright's async API.
+    Concurrent calls on the same loop share one driver and one browser.
+
+    Args:
+        svg_content: The SVG content as a string.
+        output_path: Path where the video file will be saved (.webm format).
+        duration_ms: Duration of the video in milliseconds.
+        width: Video width (defaults to SVG width or 800).
+        height: Video height (defaults to SVG height or 600).
+        pool: Async browser pool to record with (defaults to the loop's pool).
+        fps: Frame rate for frame-stepped export (default: real-time recording).
+        workers: Number of pages capturing chunks in parallel when `fps` is
+            given. Parallelism is bounded by the pool size.
+
+    Raises:
+        ValueError: If fps is given but is not a positive integer.
+        RuntimeError: If frame-stepped export is requested and ffmpeg fails
+            or is not installed.
+    """
+    _check_fps(fps)
+    if width is None:
+        width = _extract_dimension(svg_content, "width") or 800
+    if height is None:
+        height = _extract_dimension(svg_content, "height") or 600
+
+    file_cache = get_file_cache()
+    key = cache_key("video", svg_content, duration_ms, width, height, fps)
+    if file_cache is not None and await asyncio.to_thread(file_cache.fetch, key, output_path):
+        return
+
+    html_content = _build_html(svg_content, width, height)
+
+    if pool is None:
+        pool = get_async_browser_pool()
+    with _scratch_directory(output_path) as scratch:
+        video_path = os.path.join(scratch, "video.webm")
+        if fps is None:
+            await _record_video_async(
+                pool, html_content, scratch, video_path, duration_ms, width, height
+            )
+        else:
+            await _step_video_async(
+                pool, html_content, video_path, duration_ms, fps, workers, width, height
+            )
+        if os.path.exists(video_path):
+            await asyncio.to_thread(_move_into_place, video_path, output_path)
+
+    if file_cache is not None and os.path.exists(output_path):
+        await asyncio.to_thread(file_cache.store, key, output_path)
+
+
+async def render_video_from_svg_async(
+    svg_content: str,
+    duration_ms: int = 3000,
+    width: int | None = None,
+    height: int | None = None,
+    pool: AsyncBrowserPool | None = None,
+    fps: int | None = None,
+    workers: int = 1,
+) -> bytes:
+    """Render an SVG animation to .webm video data without leaving the event loop.
+
+    Async counterpart of render_video_from_svg.
+
+    Returns:
+        The .webm video.
+    """
+    with _scratch_directory(None) as scratch:
+        output_path = os.path.join(scratch, "video.webm")
+        await create_video_from_svg_async(
+            svg_content, output_path, duration_ms, width, height, pool, fps, workers
+        )
+        return await asyncio.to_thread(Path(output_path).read_bytes)
+
+
+async def _record_video_async(
+    pool: AsyncBrowserPool,
+    html_content: str,
+    scratch: str,
+    video_path: str,
+    duration_ms: int,
+    width: int,
+    height: int,
+) -> None:
+    """Record an HTML page in real time into a job's scratch directory."""
+    async with pool.context(
+        viewport={"width": width, "height": height},
+        record_video_dir=scratch,
+        record_video_size={"width": width, "height": height},
+    ) as context:
+        page = await context.new_page()
+        await page.set_content(html_content)
+
+        # Wait for the animation duration
+        await page.wait_for_timeout(duration_ms)
+
+    # Leaving the context block closes it, which finalizes the video
+    video = page.video
+    if video:
+        recorded_path = await video.path()
+        if recorded_path:
+            os.replace(recorded_path, video_path)
+
+
+def _record_video(
+    slot: BrowserSlot,
+    html_content: str,
+    scratch: str,
+    video_path: str,
+    duration_ms: int,
+    width: int,
+    height: int,
+) -> None:
+    """Record an HTML page on a pooled browser into a job's scratch directory."""
+    context = slot.browser.new_context(
+        viewport={"width": width, "height": height},
+        record_video_dir=scratch,
+        record_video_size={"width": width, "height": height},
+    )
+    try:
+        page = context.new_page()
+        page.set_content(html_content)
+
+        # Wait for the animation duration
+        page.wait_for_timeout(duration_ms)
+    finally:
+        # Close context to finalize video
+        context.close()
+
+    # Playwright names the recording itself; give it the job's name
+    video = page.video
+    if video:
+        recorded_path = video.path()
+        if recorded_path:
+            os.replace(recorded_path, video_path)
+
+
+@contextmanager
+def _scratch_directory(output_path: str | None) -> Iterator[str]:
+    """A private working directory for one video job, removed afterwards.
+
+    Jobs never share a directory, so concurrent recordings cannot pick up
+    each other's files, and nothing is left behind if a job fails. The
+    directory is created under the configured `video.scratch_dir` or, by
+    default, next to the output file, so the finished video is renamed
+    into place rather than copied.
+    """
+    from ..config import get_video_settings
+
+    base = get_video_settings()["scratch_dir"]
+    if base is not None:
+        base = os.path.expanduser(base)
+        os.makedirs(base, exist_ok=True)
+    elif output_path is not None:
+        base = os.path.dirname(os.path.abspath(output_path))
+    with tempfile.TemporaryDirectory(prefix=".svg-animator-", dir=base) as scratch:
+        yield scratch
+
+
+def _move_into_place(source_path: str, output_path: str) -> None:
+    """Atomically replace output_path with a finished video.
+
+    A rename when both are on the same filesystem. Otherwise the video is
+    copied next to the output under a temporary name and renamed from
+    there, so readers never see a partially written file.
+    """
+    try:
+        os.replace(source_path, output_path)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(output_path)), prefix=".tmp-", suffix=".webm"
+    )
+    os.close(fd)
+    try:
+        shutil.copyfile(source_path, temp_path)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _step_video(
+    pool: BrowserPool,
+    html_content: str,
+    output_path: str,
+    duration_ms: int,
+    fps: int,
+    workers: int,
+    width: int,
+    height: int,
+) -> None:
+    """Capture frames on pooled browsers, in parallel chunks, and encode them.
+
+    Each chunk streams its frames through a bounded buffer, which the
+    encoder drains chunk by chunk in order. A chunk that gets ahead of the
+    encoder waits for it, so at most CHUNK_BUFFER_FRAMES frames per chunk
+    are held in memory however long the video is.
+    """
+    chunks = _split_frames(_frame_times(duration_ms, fps), workers)
+    with _FrameEncoder(output_path, fps) as encoder:
+        if len(chunks) == 1:
+            # Stream frames straight into the encoder
+            pool.run(
+                _capture_frames, html_content, width, height, chunks[0], encoder.write
+            )
+            return
+        abandoned = threading.Event()
+        buffers = [_ChunkBuffer(abandoned) for _ in chunks]
+        futures = [
+            pool.submit(_capture_chunk, html_content, width, height, chunk, buffer)
+            for chunk, buffer in zip(chunks, buffers)
+        ]
+        try:
+            for buffer, future in zip(buffers, futures):
+                for frame in buffer:
+                    encoder.write(frame)
+                future.result()
+        except BaseException:
+            # Unblock chunks waiting on a full buffer so their jobs finish
+            abandoned.set()
+            raise
+
+
+async def _step_video_async(
+    pool: AsyncBrowserPool,
+    html_content: str,
+    output_path: str,
+    duration_ms: int,
+    fps: int,
+    workers: int,
+    width: int,
+    height: int,
+) -> None:
+    """Capture frames on pooled pages, in parallel chunks, and encode them.
+
+    As in _step_video, chunks stream through bounded queues that the
+    encoder drains in order.
+    """
+    chunks = _split_frames(_frame_times(duration_ms, fps), workers)
+    async with _AsyncFrameEncoder(output_path, fps) as encoder:
+        if len(chunks) == 1:
+            await _capture_frames_async(
+                pool, html_content, width, height, chunks[0], encoder.write
+            )
+            return
+        queues: list[asyncio.Queue[bytes | None]] = [
+            asyncio.Queue(maxsize=CHUNK_BUFFER_FRAMES) for _ in chunks
+        ]
+
+        async def capture(chunk: list[float], frames: "asyncio.Queue[bytes | None]") -> None:
+            try:
+                await _capture_frames_async(
+                    pool, html_content, width, height, chunk, frames.put
+                )
+            except asyncio.CancelledError:
+                # The encoder gave up and nothing drains the queue, so an end
+                # marker would wait for space forever
+                raise
+            except BaseException:
+                # End marker after a failure too; the task's result says which
+                await frames.put(None)
+                raise
+            await frames.put(None)
+
+        tasks = [
+            asyncio.ensure_future(capture(chunk, frames))
+            for chunk, frames in zip(chunks, queues)
+        ]
+        try:
+            for frames, task in zip(queues, tasks):
+                while (frame := await frames.get()) is not None:
+                    await encoder.write(frame)
+                await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _capture_frames(
+    slot: BrowserSlot,
+    html_content: str,
+    width: int,
+    height: int,
+    times: list[float],
+    on_frame: Callable[[bytes], None],
+) -> None:
+    """Capture a paused SVG at each timeline position on a pooled browser."""
+    page = slot.browser.new_page(viewport={"width": width, "height": height})
+    try:
+        page.set_content(html_content)
+        page.evaluate(_PAUSE_SCRIPT)
+        for seconds in times:
+            page.evaluate(_SEEK_SCRIPT, seconds)
+            on_frame(page.screenshot(type="png"))
+    finally:
+        page.close()
+
+
+def _capture_chunk(
+    slot: BrowserSlot,
+    html_content: str,
+    width: int,
+    height: int,
+    times: list[float],
+    buffer: "_ChunkBuffer",
+) -> None:
+    """Capture one chunk of frames into a buffer, then mark it finished."""
+    try:
+        _capture_frames(slot, html_content, width, height, times, buffer.put)
+    finally:
+        buffer.finish()
+
+
+class _ChunkBuffer:
+    """Bounded, iterable hand-off of one chunk's frames to the encoder thread.
+
+    Args:
+        abandoned: Set by the encoder thread if it gives up; pending and
+            later puts then raise instead of waiting for space.
+    """
+
+    _END = object()
+
+    def __init__(self, abandoned: threading.Event):
+        self._frames: queue.Queue = queue.Queue(maxsize=CHUNK_BUFFER_FRAMES)
+        self._abandoned = abandoned
+
+    def put(self, frame: bytes) -> None:
+        """Hand over a frame, waiting while the buffer is full."""
+        self._put(frame)
+
+    def finish(self) -> None:
+        """Mark the end of the chunk (also after a failed capture)."""
+        try:
+            self._put(self._END)
+        except RuntimeError:
+            pass
+
+    def _put(self, item: object) -> None:
+        while True:
+            if self._abandoned.is_set():
+                raise RuntimeError("Video encoding was abandoned")
+            try:
+                self._frames.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            frame = self._frames.get()
+            if frame is self._END:
+                return
+            yield frame
+
+
+async def _capture_frames_async(
+    pool: AsyncBrowserPool,
+    html_content: str,
+    width: int,
+    height: int,
+    times: list[float],
+    on_frame: Callable[[bytes], Awaitable[None]],
+) -> None:
+    """Capture a paused SVG at each timeline position on its own page."""
+    async with pool.page(viewport={"width": width, "height": height}) as page:
+        await page.set_content(html_content)
+        await page.evaluate(_PAUSE_SCRIPT)
+        for seconds in times:
+            await page.evaluate(_SEEK_SCRIPT, seconds)
+            await on_frame(await page.screenshot(type="png"))
+
+
+# Freeze every SVG timeline on the page so frames can be seeked explicitly
+_PAUSE_SCRIPT = """() => {
+    for (const svg of document.querySelectorAll('svg')) {
+        svg.pauseAnimations();
+        svg.setCurrentTime(0);
+    }
+}"""
+
+_SEEK_SCRIPT = """(seconds) => {
+    for (const svg of document.querySelectorAll('svg')) {
+        svg.setCurrentTime(seconds);
+    }
+}"""
+
+
+def _check_fps(fps: int | None) -> None:
+    """Reject frame rates that are not positive integers.
+
+    Raises:
+        ValueError: If fps is not None and not a positive integer.
+    """
+    if fps is None:
+        return
+    if isinstance(fps, bool) or not isinstance(fps, int) or fps <= 0:
+        raise ValueError(f"fps must be a positive integer, got {fps!r}")
+
+
+def _frame_times(duration_ms: int, fps: int) -> list[float]:
+    """Timeline positions, in seconds, of each frame in a video.
+
+    Raises:
+        ValueError: If fps is not positive.
+    """
+    if fps <= 0:
+        raise ValueError("fps must be positive")
+    frame_count = max(1, math.ceil(duration_ms * fps / 1000))
+    return [frame / fps for frame in range(frame_count)]
+
+
+def _split_frames(times: list[float], workers: int) -> list[list[float]]:
+    """Split frame times into at most `workers` contiguous, near-equal chunks.
+
+    Raises:
+        ValueError: If workers is less than 1.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    workers = min(workers, len(times))
+    size, extra = divmod(len(times), workers)
+    chunks = []
+    start = 0
+    for index in range(workers):
+        end = start + size + (1 if index < extra else 0)
+        chunks.append(times[start:end])
+        start = end
+    return chunks
+
+
+def _ffmpeg_command(output_path: str, fps: int) -> list[str]:
+    """The ffmpeg invocation that encodes piped PNG frames into a .webm video.
+
+    The encoder runs single-threaded with bitexact flags so that the same
+    frames always produce the same file.
+
+    Raises:
+        RuntimeError: If ffmpeg is not installed.
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("Frame-stepped video export requires ffmpeg on the PATH")
+    return [
+        ffmpeg, "-y", "-loglevel", "error",
+        "-f", "image2pipe", "-framerate", str(fps), "-c:v", "png", "-i", "-",
+        "-c:v", "libvpx-vp9", "-pix_fmt", "yuv420p", "-threads", "1",
+        "-fflags", "+bitexact", "-flags:v", "+bitexact",
+        "-f", "webm", output_path,
+    ]
+
+
+def _remove_partial_output(output_path: str) -> None:
+    try:
+        os.unlink(output_path)
+    except FileNotFoundError:
+        pass
+
+
+def _encoding_error(stderr: bytes) -> RuntimeError:
+    return RuntimeError(f"ffmpeg failed to encode video: {stderr.decode().strip()}")
+
+
+class _FrameEncoder:
+    """Pipe PNG frames into ffmpeg to produce a .webm video.
+
+    If encoding fails or is abandoned, the partial output file is removed.
+    """
+
+    def __init__(self, output_path: str, fps: int):
+        self.output_path = output_path
+        self.fps = fps
+        self._process: subprocess.Popen | None = None
+
+    def __enter__(self) -> "_FrameEncoder":
+        self._process = subprocess.Popen(
+            _ffmpeg_command(self.output_path, self.fps),
+            stdin=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        return self
+
+    def write(self, frame: bytes) -> None:
+        """Append one PNG frame to the video.
+
+        Raises:
+            RuntimeError: If ffmpeg has exited.
+        """
+        assert self._process is not None and self._process.stdin is not None
+        try:
+            self._process.stdin.write(frame)
+        except BrokenPipeError:
+            stderr = self._process.stderr.read() if self._process.stderr else b""
+            self._process.wait()
+            raise _encoding_error(stderr) from None
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        assert self._process is not None and self._process.stdin is not None
+        if exc_type is not None:
+            self._process.kill()
+            self._process.wait()
+            _remove_partial_output(self.output_path)
+            return
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        stderr = self._process.stderr.read() if self._process.stderr else b""
+        if self._process.wait() != 0:
+            _remove_partial_output(self.output_path)
+            raise _encoding_error(stderr)
+
+
+class _AsyncFrameEncoder:
+    """Pipe PNG frames into ffmpeg without blocking the event loop.
+
+    Async counterpart of _FrameEncoder: frames are written through an
+    asyncio subprocess pipe, waiting for ffmpeg to drain it as needed.
+    """
+
+    def __init__(self, output_path: str, fps: int):
+        self.output_path = output_path
+        self.fps = fps
+        self._process: asyncio.subprocess.Process | None = None
+
+    async def __aenter__(self) -> "_AsyncFrameEncoder":
+        self._process = await asyncio.create_subprocess_exec(
+            *_ffmpeg_command(self.output_path, self.fps),
+            stdin=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        return self
+
+    async def write(self, frame: bytes) -> None:
+        """Append one PNG frame to the video.
+
+        Raises:
+            RuntimeError: If ffmpeg has exited.
+        """
+        assert self._process is not None and self._process.stdin is not None
+        try:
+            self._process.stdin.write(frame)
+            await self._process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            stderr = await self._process.stderr.read() if self._process.stderr else b""
+            raise _encoding_error(stderr) from None
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        assert self._process is not None and self._process.stdin is not None
+        if exc_type is not None:
+            if self._process.returncode is None:
+                self._process.kill()
+            # wait() also waits for the pipes to close
+            self._process.stdin.close()
+            await self._process.wait()
+            _remove_partial_output(self.output_path)
+            return
+        self._process.stdin.close()
+        stderr = await self._process.stderr.read() if self._process.stderr else b""
+        if await self._process.wait() != 0:
+            _remove_partial_output(self.output_path)
+            raise _encoding_error(stderr)
+
+
+def _build_html(svg_content: str, width: int, height: int) -> str:
+    """Wrap SVG content in an HTML page sized to the viewport."""
+    return f"""<!DOCTYPE html>
 <html>
 <head>
     <style>
@@ -53,32 +734,6 @@ def create_video_from_svg(
 </body>
 </html>"""
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch()
-        context = browser.new_context(
-            viewport={"width": width, "height": height},
-            record_video_dir=".",
-            record_video_size={"width": width, "height": height},
-        )
-
-        page = context.new_page()
-        page.set_content(html_content)
-
-        # Wait for the animation duration
-        page.wait_for_timeout(duration_ms)
-
-        # Close context to finalize video
-        context.close()
-        browser.close()
-
-        # Move video to output path
-        video = page.video
-        if video:
-            video_path = video.path()
-            if video_path:
-                import shutil
-                shutil.move(video_path, output_path)
-
 
 def _extract_dimension(svg_content: str, attr: str) -> int | None:
     """Extract a dimension attribute from SVG content."""
@@ -1,39 +1,139 @@
 """Load SVG diagrams from YAML specifications."""
 
+import threading
+from collections import OrderedDict
 from pathlib import Path
+from typing import TextIO
 
-import yaml
-
+from ..spec_parser import load_spec
 from .animations import create_animated_diagram
+from .render_cache import cache_key, get_svg_cache
+
+
+class LibraryCache:
+    """Process-wide cache of parsed library files.
+
+    Entries are keyed by resolved path and checked against the file's
+    modification time and size on every lookup, so edited libraries are
+    reparsed. Least recently used entries are evicted once either the entry
+    count or the total size of the cached files exceeds its limit.
+
+    Cached definitions are shared between diagrams and must not be modified.
+
+    Args:
+        max_entries: Maximum number of libraries to keep.
+        max_bytes: Maximum total size, in bytes of YAML source, to keep.
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Path, tuple[tuple[int, int], dict]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def load(self, library_path: str | Path) -> dict:
+        """Get the definitions in a library file, parsing it if needed.
+
+        Raises:
+            FileNotFoundError: If the library file doesn't exist.
+        """
+        path = Path(library_path).resolve()
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Library file not found: {library_path}") from None
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # Parse outside the lock so other libraries can load meanwhile
+        definitions = load_spec(path.read_text()) or {}
+
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self._bytes -= previous[0][1]
+            self._entries[path] = (version, definitions)
+            self._bytes += stat.st_size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, (evicted_version, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_version[1]
+        return definitions
+
+    def stats(self) -> dict:
+        """Get hit and miss counts and current usage."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+_library_cache = LibraryCache()
+
+
+def get_library_cache() -> LibraryCache:
+    """Get the process-wide library cache."""
+    return _library_cache
 
 
 def _load_library(library_path: str | Path) -> dict:
     """Load definitions from a library file.
 
+    Files are parsed once and then served from the library cache until
+    they change on disk.
+
     Args:
         library_path: Path to the library YAML file.
 
     Returns:
-        Dictionary of definitions from the library.
+        Dictionary of definitions from the library. It is shared with
+        other callers, so don't modify it.
 
     Raises:
         FileNotFoundError: If the library file doesn't exist.
     """
-    path = Path(library_path)
-    if not path.exists():
-        raise FileNotFoundError(f"Library file not found: {library_path}")
+    return _library_cache.load(library_path)
 
-    content = path.read_text()
-    return yaml.safe_load(content) or {}
 
+def _load_libraries(spec: dict) -> list[dict]:
+    """Load the definitions of every library a specification lists, in order.
 
-def _load_all_definitions(spec: dict) -> dict:
+    The dicts come from the library cache, so the same dict is returned
+    until its file changes.
+    """
+    return [_load_library(library_path) for library_path in spec.get("libraries", [])]
+
+
+def _load_all_definitions(spec: dict, libraries: list[dict] | None = None) -> dict:
     """Load and merge definitions from libraries and local definitions.
 
     Libraries are loaded first, then local definitions override them.
 
     Args:
         spec: The parsed YAML specification.
+        libraries: The spec's library definitions, if already loaded.
 
     Returns:
         Merged dictionary of all definitions.
@@ -41,8 +141,9 @@ def _load_all_definitions(spec: dict) -> dict:
     definitions = {}
 
     # Load from library files first
-    for library_path in spec.get("libraries", []):
-        library_defs = _load_library(library_path)
+    if libraries is None:
+        libraries = _load_libraries(spec)
+    for library_defs in libraries:
         definitions.update(library_defs)
 
     # Local definitions override library definitions
@@ -51,8 +152,99 @@ def _load_all_definitions(spec: dict) -> dict:
     return definitions
 
 
+class _DefinitionExpander:
+    """Expands 'use' references throughout a document.
+
+    Definitions may themselves use other definitions, and 'use' may appear
+    at any depth inside group elements. Each definition is expanded once
+    per document and the result shared by every element that uses it;
+    overrides produce a shallow copy, so nothing is copied that isn't
+    changed.
+
+    Args:
+        definitions: Dictionary of available definitions.
+    """
+
+    def __init__(self, definitions: dict):
+        self.definitions = definitions
+        self._expanded: dict[str, dict] = {}
+        # Definitions being expanded, in order, for reporting cycles
+        self._in_progress: dict[str, None] = {}
+
+    def element(self, element: dict) -> dict:
+        """Expand an element and any elements nested in it.
+
+        Raises:
+            ValueError: If a referenced definition doesn't exist, or if
+                definitions use each other in a cycle.
+        """
+        if "use" not in element:
+            return self._children(element)
+        return self._merge(self.definition(element["use"]), element)
+
+    def definition(self, def_name: str) -> dict:
+        """Get a fully expanded definition.
+
+        Chains of definitions that use one another are followed in a loop,
+        so deep inheritance doesn't hit the recursion limit.
+
+        Raises:
+            ValueError: If the definition doesn't exist or is part of a cycle.
+        """
+        # Follow 'use' links down to an expanded or self-contained definition
+        chain: list[str] = []
+        name = def_name
+        while name not in self._expanded:
+            if name not in self.definitions:
+                raise ValueError(f"Unknown definition: {name}")
+            if name in self._in_progress:
+                cycle = [*self._in_progress, name]
+                cycle = cycle[cycle.index(name):]
+                raise ValueError(f"Circular definition reference: {' -> '.join(cycle)}")
+            self._in_progress[name] = None
+            chain.append(name)
+            if "use" not in self.definitions[name]:
+                break
+            name = self.definitions[name]["use"]
+
+        # Then expand back up the chain, each on top of the one it uses
+        try:
+            expanded = self._expanded.get(name)
+            for name in reversed(chain):
+                definition = self.definitions[name]
+                if expanded is None:
+                    expanded = self._children(definition)
+                else:
+                    expanded = self._merge(expanded, definition)
+                self._expanded[name] = expanded
+        finally:
+            for name in chain:
+                self._in_progress.pop(name, None)
+        return self._expanded[def_name]
+
+    def _merge(self, base: dict, element: dict) -> dict:
+        """Apply the overrides in a 'use' element to an expanded definition."""
+        overrides = {key: value for key, value in element.items() if key != "use"}
+        if not overrides:
+            return base
+        expanded = {**base, **overrides}
+        if "elements" in overrides:
+            expanded = self._children(expanded)
+        return expanded
+
+    def _children(self, element: dict) -> dict:
+        """Expand the elements of a group, copying the group only if one changes."""
+        children = element.get("elements")
+        if not isinstance(children, list):
+            return element
+        expanded = [self.element(child) for child in children]
+        if any(new is not old for new, old in zip(expanded, children)):
+            return {**element, "elements": expanded}
+        return element
+
+
 def _expand_element(element: dict, definitions: dict) -> dict:
-    """Expand a 'use' reference into a full element spec.
+    """Expand 'use' references in an element, including nested ones.
 
     Args:
         element: Element dict, possibly containing a 'use' key.
@@ -62,39 +254,26 @@ def _expand_element(element: dict, definitions: dict) -> dict:
         Expanded element dict with definition merged with overrides.
 
     Raises:
-        ValueError: If the referenced definition doesn't exist.
+        ValueError: If a referenced definition doesn't exist, or if
+            definitions use each other in a cycle.
     """
-    if "use" not in element:
-        return element
-
-    def_name = element["use"]
-    if def_name not in definitions:
-        raise ValueError(f"Unknown definition: {def_name}")
-
-    # Start with a copy of the definition
-    expanded = definitions[def_name].copy()
-
-    # Apply overrides from the use statement (except 'use' itself)
-    for key, value in element.items():
-        if key != "use":
-            expanded[key] = value
-
-    return expanded
+    return _DefinitionExpander(definitions).element(element)
 
 
-def _expand_definitions(spec: dict) -> dict:
+def _expand_definitions(spec: dict, libraries: list[dict] | None = None) -> dict:
     """Expand all 'use' references in a specification.
 
     Args:
         spec: The parsed YAML specification.
+        libraries: The spec's library definitions, if already loaded.
 
     Returns:
-        Specification with all 'use' references expanded.
+        Specification with all 'use' references expanded, at every depth.
     """
-    definitions = _load_all_definitions(spec)
+    expander = _DefinitionExpander(_load_all_definitions(spec, libraries))
     elements = spec.get("elements", [])
 
-    expanded_elements = [_expand_element(el, definitions) for el in elements]
+    expanded_elements = [expander.element(el) for el in elements]
 
     result = spec.copy()
     result["elements"] = expanded_elements
@@ -105,26 +284,57 @@ def _expand_definitions(spec: dict) -> dict:
     return result
 
 
-def create_diagram_from_yaml(yaml_content: str) -> str:
+def create_diagram_from_yaml(yaml_content: str, backend: str = "drawsvg") -> str:
     """Create an SVG diagram from a YAML specification.
 
     Args:
-        yaml_content: YAML string containing the diagram specification.
-            Should have the same structure as the dict passed to
+        yaml_content: YAML (or JSON) string containing the diagram
+            specification. Should have the same structure as the dict passed to
             create_animated_diagram:
             - width: Canvas width (default 400)
             - height: Canvas height (default 300)
             - definitions: Optional dict of reusable element definitions
             - elements: List of shape specifications (can use 'use' to
                 reference definitions)
+        backend: SVG backend, "drawsvg" (default) or "fast".
 
     Returns:
-        SVG content as a string.
+        SVG content as a string. Repeated requests for the same expanded
+        specification are served from the SVG render cache.
 
     Raises:
         ValueError: If the YAML contains invalid element specifications.
         yaml.YAMLError: If the YAML is malformed.
     """
-    spec = yaml.safe_load(yaml_content)
-    expanded_spec = _expand_definitions(spec)
-    return create_animated_diagram(expanded_spec)
+    expanded_spec = _expand_definitions(load_spec(yaml_content))
+
+    svg_cache = get_svg_cache()
+    if svg_cache is None:
+        return create_animated_diagram(expanded_spec, backend)
+
+    key = cache_key("svg", expanded_spec, backend)
+    svg_content = svg_cache.get(key)
+    if svg_content is None:
+        svg_content = create_animated_diagram(expanded_spec, backend)
+        svg_cache.put(key, svg_content)
+    return svg_content
+
+
+def write_diagram_from_yaml(yaml_content: str, out: TextIO) -> None:
+    """Stream an SVG diagram from a YAML specification to a file-like object.
+
+    Elements are written as they are generated, using the fast backend, so
+    the SVG document is never built in memory; the parsed specification and
+    resolved element positions still are. The render cache is not used.
+
+    Args:
+        yaml_content: YAML string containing the diagram specification.
+        out: Text stream to write the SVG to.
+
+    Raises:
+        ValueError: If the YAML contains invalid element specifications.
+        yaml.YAMLError: If the YAML is malformed.
+    """
+    from .svg_emitter import stream_diagram
+
+    stream_diagram(_expand_definitions(load_spec(yaml_content)), out)
@@ -0,0 +1,212 @@
+"""Rendering session that keeps its browser and caches warm across calls.
+
+`yaml_to_png` and `yaml_to_video` are convenient for one-off renders, but
+each call hands its render to the shared browser pool. A Renderer owns a
+private browser pool, a page kept open for PNG screenshots, and an LRU of
+compiled templates. Scripts that render many assets therefore pay the
+browser startup cost, and each template's parse, once.
+
+Example usage:
+    from mcp_svg_animator import Renderer
+
+    with Renderer() as renderer:
+        for name, spec in specs.items():
+            renderer.png(spec, f"out/{name}.png")
+        renderer.video(animated_spec, "out/intro.webm", fps=30)
+"""
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Union
+
+from .generators.animations import BACKENDS, create_animated_diagram
+from .generators.templates import DiagramTemplate, compile_template
+from .generators.yaml_loader import create_diagram_from_yaml
+
+if TYPE_CHECKING:
+    from .generators.browser_pool import BrowserPool
+
+Spec = Union[str, dict]
+
+
+class Renderer:
+    """A reusable rendering session.
+
+    YAML specs rendered with `params` are templates: they are compiled
+    once and kept in an LRU, so rendering one again with different values
+    for its `${name}` placeholders skips parsing and definition expansion.
+    YAML specs rendered without `params` are plain diagrams, in which
+    `${...}` is literal text; repeats of those are served from the SVG
+    render cache. The browser is launched on the first PNG or video render
+    and stays open until the renderer is closed.
+
+    Args:
+        backend: SVG backend, "drawsvg" (default) or "fast".
+        pool_size: Number of browsers kept warm.
+        max_renders: Recycle a browser after this many renders.
+        max_specs: Number of compiled YAML specs to keep.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+
+    def __init__(
+        self,
+        backend: str = "drawsvg",
+        pool_size: int = 1,
+        max_renders: int = 1000,
+        max_specs: int = 64,
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        self.backend = backend
+        self.pool_size = pool_size
+        self.max_renders = max_renders
+        self.max_specs = max_specs
+        self._templates: OrderedDict[str, DiagramTemplate] = OrderedDict()
+        self._pool: "BrowserPool | None" = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def template(self, yaml_spec: str) -> DiagramTemplate:
+        """Get the compiled template for a YAML spec, compiling it on first use."""
+        with self._lock:
+            template = self._templates.get(yaml_spec)
+            if template is not None:
+                self._templates.move_to_end(yaml_spec)
+                return template
+        template = compile_template(yaml_spec, self.backend)
+        with self._lock:
+            self._templates[yaml_spec] = template
+            while len(self._templates) > self.max_specs:
+                self._templates.popitem(last=False)
+        return template
+
+    def svg(self, spec: Spec, params: dict | None = None) -> str:
+        """Render a spec to SVG content.
+
+        Args:
+            spec: YAML (or JSON) string, or a specification dict.
+            params: Template parameters. If given, even empty, the YAML
+                spec is rendered as a template with `${name}` placeholders.
+
+        Returns:
+            SVG content as a string.
+
+        Raises:
+            ValueError: If the spec is invalid, or params are given with a dict spec.
+        """
+        if isinstance(spec, dict):
+            if params:
+                raise ValueError("Template parameters require a YAML spec")
+            return create_animated_diagram(spec, self.backend)
+        if params is None:
+            return create_diagram_from_yaml(spec, self.backend)
+        return self.template(spec).render(params)
+
+    def png(
+        self,
+        spec: Spec,
+        output_path: Union[str, Path],
+        width: int | None = None,
+        height: int | None = None,
+        params: dict | None = None,
+    ) -> Path:
+        """Render a spec to a PNG image.
+
+        Args:
+            spec: YAML (or JSON) string, or a specification dict.
+            output_path: Path where the PNG file will be written.
+            width: Image width (defaults to SVG width or 800).
+            height: Image height (defaults to SVG height or 600).
+            params: Template parameters, as for svg.
+
+        Returns:
+            Path object pointing to the created PNG file.
+
+        Raises:
+            RuntimeError: If the renderer has been closed.
+        """
+        from .generators.png_generator import create_png_from_svg
+
+        pool = self._browser_pool()
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        create_png_from_svg(
+            self.svg(spec, params),
+            str(output_path),
+            width=width,
+            height=height,
+            pool=pool,
+            reuse_page=True,
+        )
+        return output_path
+
+    def video(
+        self,
+        spec: Spec,
+        output_path: Union[str, Path],
+        duration_ms: int = 3000,
+        fps: int | None = None,
+        workers: int = 1,
+        params: dict | None = None,
+    ) -> Path:
+        """Render an animated spec to a .webm video.
+
+        Args:
+            spec: YAML (or JSON) string, or a specification dict.
+            output_path: Path where the video file will be written.
+            duration_ms: Duration of the video in milliseconds (default 3000).
+            fps: If given, step through the animation timeline at this frame
+                rate instead of recording in real time. Requires ffmpeg.
+            workers: With `fps`, capture this many chunks of frames in
+                parallel (bounded by pool_size).
+            params: Template parameters, as for svg.
+
+        Returns:
+            Path object pointing to the created video file.
+
+        Raises:
+            RuntimeError: If the renderer has been closed.
+        """
+        from .generators.video_generator import create_video_from_svg
+
+        pool = self._browser_pool()
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        create_video_from_svg(
+            self.svg(spec, params),
+            str(output_path),
+            duration_ms=duration_ms,
+            pool=pool,
+            fps=fps,
+            workers=workers,
+        )
+        return output_path
+
+    def close(self) -> None:
+        """Close the browser and drop the compiled specs. Safe to call twice."""
+        with self._lock:
+            self._closed = True
+            pool, self._pool = self._pool, None
+            self._templates.clear()
+        if pool is not None:
+            pool.close()
+
+    def __enter__(self) -> "Renderer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _browser_pool(self) -> "BrowserPool":
+        """The renderer's browser pool, created on first use."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Renderer is closed")
+            if self._pool is None:
+                from .generators.browser_pool import BrowserPool
+
+                self._pool = BrowserPool(size=self.pool_size, max_renders=self.max_renders)
+            return self._pool
@@ -1,8 +1,10 @@
 """MCP server for SVG diagram generation."""
 
+from functools import lru_cache
+
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
-from mcp.types import Tool, TextContent
+from mcp.types import ImageContent, TextContent, Tool
 
 server = Server("mcp-svg-animator")
 
@@ -62,6 +64,72 @@ elements:
                         "type": "string",
                         "description": "Optional path to write a PNG render of the SVG. Useful for previewing static images.",
                     },
+                    "inline_png": {
+                        "type": "boolean",
+                        "description": "If true, also return a PNG render of the SVG as an inline image. Previews this way need no file and no write permission.",
+                        "default": False,
+                    },
+                    "backend": {
+                        "type": "string",
+                        "enum": ["drawsvg", "fast"],
+                        "description": "SVG backend (default: drawsvg). 'fast' writes equivalent markup directly, which is quicker for large diagrams.",
+                        "default": "drawsvg",
+                    },
+                    "stream": {
+                        "type": "boolean",
+                        "description": "If true (and output_path is given without png_path or inline_png), write elements to the file as they are generated instead of building the whole SVG in memory. Streaming always uses the 'fast' backend; passing another backend is an error. The file is only replaced once complete. Use for very large diagrams.",
+                        "default": False,
+                    },
+                },
+                "required": ["yaml_spec"],
+            },
+        ),
+        Tool(
+            name="render_svg_template",
+            description="""Render an SVG diagram from a YAML template with parameters.
+
+Use this to generate many variants of the same diagram. String values in the
+template may contain ${name} placeholders; a value that is exactly one
+placeholder takes the parameter value as is (so numbers stay numbers). An
+optional top-level `parameters` mapping gives defaults. The template is parsed
+once and reused for later calls with the same yaml_spec.
+
+Example YAML:
+```yaml
+parameters:
+  color: red
+elements:
+  - type: circle
+    cx: "${x}"
+    cy: 50
+    r: 20
+    fill: "${color}"
+  - type: text
+    x: "${x}"
+    y: 90
+    text: "Node ${x}"
+```""",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "yaml_spec": {
+                        "type": "string",
+                        "description": "YAML template for the SVG diagram",
+                    },
+                    "params": {
+                        "type": "object",
+                        "description": "Values for the template's ${name} placeholders",
+                    },
+                    "output_path": {
+                        "type": "string",
+                        "description": "Optional path to write the SVG file. If provided, writes to file and returns confirmation instead of SVG content.",
+                    },
+                    "backend": {
+                        "type": "string",
+                        "enum": ["drawsvg", "fast"],
+                        "description": "SVG backend (default: drawsvg).",
+                        "default": "drawsvg",
+                    },
                 },
                 "required": ["yaml_spec"],
             },
@@ -92,6 +160,11 @@ Example usage:
                         "description": "Duration of the video in milliseconds (default: 3000)",
                         "default": 3000,
                     },
+                    "fps": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "description": "Optional frame rate. If provided, the animation timeline is stepped frame by frame instead of recorded in real time, giving deterministic output that renders faster than real time. Requires ffmpeg.",
+                    },
                 },
                 "required": ["svg_content", "output_path"],
             },
@@ -110,8 +183,28 @@ def _check_write_permission(file_path: str, file_type: str) -> None:
         )
 
 
-@server.call_tool()
-async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+def _integer_fps(fps: object) -> int | None:
+    """Accept integral JSON numbers (30 or 30.0) as a frame rate.
+
+    Raises:
+        ValueError: If fps is not a positive integer.
+    """
+    if isinstance(fps, float) and fps.is_integer():
+        fps = int(fps)
+    if fps is not None and (isinstance(fps, bool) or not isinstance(fps, int) or fps <= 0):
+        raise ValueError(f"fps must be a positive integer, got {fps!r}")
+    return fps
+
+
+@lru_cache(maxsize=32)
+def _compiled_template(yaml_spec: str, backend: str):
+    """Compile a template once per distinct spec and backend."""
+    from .generators.templates import compile_template
+
+    return compile_template(yaml_spec, backend)
+
+
+async def call_tool(name: str, arguments: dict) -> list[TextContent | ImageContent]:
     """Handle tool calls for SVG generation."""
     if name == "create_svg_from_yaml":
         from pathlib import Path
@@ -121,6 +214,9 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         yaml_spec = arguments.get("yaml_spec", "")
         output_path = arguments.get("output_path")
         png_path = arguments.get("png_path")
+        backend = arguments.get("backend", "drawsvg")
+        stream = bool(arguments.get("stream", False))
+        inline_png = bool(arguments.get("inline_png", False))
 
         # Check permissions before generating content
         if output_path:
@@ -128,7 +224,18 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         if png_path:
             _check_write_permission(png_path, "png")
 
-        svg_content = create_diagram_from_yaml(yaml_spec)
+        # The PNG renderer needs the SVG in memory, so only stream without it
+        if output_path and stream and not png_path and not inline_png:
+            from .generators.svg_emitter import open_replacing
+            from .generators.yaml_loader import write_diagram_from_yaml
+
+            if backend != "fast" and "backend" in arguments:
+                raise ValueError(f"stream always uses the fast backend, not {backend!r}")
+            with open_replacing(output_path) as out:
+                write_diagram_from_yaml(yaml_spec, out)
+            return [TextContent(type="text", text=f"SVG written to {output_path}")]
+
+        svg_content = create_diagram_from_yaml(yaml_spec, backend)
 
         messages = []
 
@@ -136,48 +243,101 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             Path(output_path).write_text(svg_content)
             messages.append(f"SVG written to {output_path}")
 
-        if png_path:
+        png_data = None
+        if png_path and inline_png:
             import asyncio
 
-            from .generators.png_generator import create_png_from_svg
+            from .generators.png_generator import render_png_from_svg_async
+
+            # Render once; the file and the inline image share the bytes
+            png_data = await render_png_from_svg_async(svg_content)
+            await asyncio.to_thread(Path(png_path).write_bytes, png_data)
+            messages.append(f"PNG written to {png_path}")
+        elif png_path:
+            from .generators.png_generator import create_png_from_svg_async
 
-            # Run sync Playwright code in a separate thread to avoid async conflict
-            await asyncio.to_thread(create_png_from_svg, svg_content, png_path)
+            await create_png_from_svg_async(svg_content, png_path)
             messages.append(f"PNG written to {png_path}")
 
-        if messages:
-            return [TextContent(type="text", text="\n".join(messages))]
+        text = "\n".join(messages) if messages else svg_content
+        contents: list[TextContent | ImageContent] = [TextContent(type="text", text=text)]
+
+        if inline_png:
+            import base64
+
+            from .generators.png_generator import render_png_from_svg_async
+
+            if png_data is None:
+                # Previews are returned, not kept, so they bypass the on-disk cache
+                png_data = await render_png_from_svg_async(svg_content, use_file_cache=False)
+            contents.append(ImageContent(
+                type="image",
+                data=base64.b64encode(png_data).decode("ascii"),
+                mimeType="image/png",
+            ))
+
+        return contents
 
+    if name == "render_svg_template":
+        from pathlib import Path
+
+        output_path = arguments.get("output_path")
+        if output_path:
+            _check_write_permission(output_path, "svg")
+
+        template = _compiled_template(
+            arguments.get("yaml_spec", ""), arguments.get("backend", "drawsvg")
+        )
+        svg_content = template.render(arguments.get("params") or {})
+
+        if output_path:
+            Path(output_path).write_text(svg_content)
+            return [TextContent(type="text", text=f"SVG written to {output_path}")]
         return [TextContent(type="text", text=svg_content)]
 
     if name == "create_animation_video":
-        import asyncio
-
-        from .generators.video_generator import create_video_from_svg
+        from .generators.video_generator import create_video_from_svg_async
 
         svg_content = arguments.get("svg_content", "")
         output_path = arguments.get("output_path", "animation.webm")
         duration_ms = int(arguments.get("duration_ms", 3000))
+        fps = arguments.get("fps")
 
         _check_write_permission(output_path, "webm")
 
-        # Run sync Playwright code in a separate thread to avoid async conflict
-        await asyncio.to_thread(
-            create_video_from_svg, svg_content, output_path, duration_ms=duration_ms
+        await create_video_from_svg_async(
+            svg_content,
+            output_path,
+            duration_ms=duration_ms,
+            fps=_integer_fps(fps),
         )
         return [TextContent(type="text", text=f"Video saved to {output_path}")]
 
     raise ValueError(f"Unknown tool: {name}")
 
 
+# Registered without rebinding the name: the decorator's annotations turn the
+# coroutine function into a plain Awaitable, which callers can't asyncio.run
+server.call_tool()(call_tool)
+
+
 async def main():
     """Run the MCP server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options(),
-        )
+    from .generators.browser_pool import (
+        shutdown_async_browser_pool,
+        shutdown_browser_pool,
+    )
+
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options(),
+            )
+    finally:
+        await shutdown_async_browser_pool()
+        shutdown_browser_pool()
 
 
 if __name__ == "__main__":
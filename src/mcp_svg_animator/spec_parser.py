@@ -0,0 +1,43 @@
+"""Parse YAML and JSON text into Python data.
+
+Uses libyaml's C loader when PyYAML was built with it, which is several
+times faster than the pure-Python loader, and falls back to the pure-Python
+loader otherwise. Specs that look like JSON are parsed with the json module
+first, as machine-generated specs usually are JSON and it parses much faster
+still.
+"""
+
+import json
+from typing import Any
+
+import yaml
+
+SafeLoader: type = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def safe_load(content: str) -> Any:
+    """Parse YAML with the fastest available safe loader.
+
+    Raises:
+        yaml.YAMLError: If the YAML is malformed.
+    """
+    return yaml.load(content, Loader=SafeLoader)
+
+
+def load_spec(content: str) -> Any:
+    """Parse a diagram specification written in YAML or JSON.
+
+    JSON is valid YAML, so any input is accepted. Input whose first
+    non-blank character is "{" or "[" is tried as JSON first; if it isn't
+    valid JSON (e.g. YAML flow style such as "{width: 100}"), it is parsed
+    as YAML.
+
+    Raises:
+        yaml.YAMLError: If the input is neither valid JSON nor valid YAML.
+    """
+    if content.lstrip()[:1] in ("{", "["):
+        try:
+            return json.loads(content)
+        except ValueError:
+            pass
+    return safe_load(content)
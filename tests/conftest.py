@@ -0,0 +1,31 @@
+"""Shared test fixtures."""
+
+from pathlib import Path
+
+import pytest
+
+from mcp_svg_animator import config
+from mcp_svg_animator.config import clear_config_cache
+from mcp_svg_animator.generators.render_cache import clear_file_cache, clear_svg_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_config_and_cache(tmp_path: Path, monkeypatch):
+    """Keep every test's config file and render cache inside tmp_path.
+
+    The config file is read from tmp_path/.config/mcp-svg-animator, and the
+    on-disk render cache defaults to tmp_path/renders, so tests never read
+    results cached by earlier runs or write to the developer's real cache.
+    HOME and XDG_CACHE_HOME are left alone, so Playwright still finds its
+    installed browsers.
+    """
+    config_path = tmp_path / ".config" / "mcp-svg-animator" / "config.yaml"
+    monkeypatch.setattr(config, "_get_config_path", lambda: config_path)
+    monkeypatch.setattr(config, "_default_cache_directory", lambda: str(tmp_path / "renders"))
+    clear_config_cache()
+    clear_svg_cache()
+    clear_file_cache()
+    yield
+    clear_config_cache()
+    clear_svg_cache()
+    clear_file_cache()
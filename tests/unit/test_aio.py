@@ -0,0 +1,133 @@
+"""Tests for the asyncio API."""
+
+import asyncio
+
+import pytest
+from hamcrest import assert_that, equal_to, instance_of, less_than_or_equal_to
+
+from mcp_svg_animator import aio, config
+from mcp_svg_animator.generators import png_generator, video_generator
+from mcp_svg_animator.api import yaml_to_svg
+
+CIRCLE = """
+width: 100
+height: 100
+elements:
+  - type: circle
+    cx: {x}
+    cy: 50
+    r: 10
+"""
+
+
+class TestYamlToSvg:
+    """Tests for aio.yaml_to_svg."""
+
+    def test_matches_sync_api(self):
+        spec = CIRCLE.format(x=30)
+
+        svg = asyncio.run(aio.yaml_to_svg(spec, backend="fast"))
+
+        assert_that(svg, equal_to(yaml_to_svg(spec, backend="fast")))
+
+    def test_raises_on_invalid_spec(self):
+        with pytest.raises(ValueError):
+            asyncio.run(aio.yaml_to_svg("elements:\n  - type: nonsense\n"))
+
+
+class TestRenderBackend:
+    """Tests for choosing the SVG backend of PNG and video renders."""
+
+    def test_png_and_video_use_requested_backend(self, tmp_path, monkeypatch):
+        rendered = []
+
+        async def capture(svg_content, *args, **kwargs):
+            rendered.append(svg_content)
+
+        monkeypatch.setattr(png_generator, "create_png_from_svg_async", capture)
+        monkeypatch.setattr(video_generator, "create_video_from_svg_async", capture)
+        spec = CIRCLE.format(x=30)
+
+        asyncio.run(aio.yaml_to_png(spec, tmp_path / "out.png", backend="fast"))
+        asyncio.run(aio.yaml_to_video(spec, tmp_path / "out.webm", backend="fast"))
+
+        expected = yaml_to_svg(spec, backend="fast")
+        assert_that(rendered, equal_to([expected, expected]))
+
+
+class TestGatherRender:
+    """Tests for aio.gather_render."""
+
+    def test_results_are_in_input_order(self):
+        specs = [CIRCLE.format(x=x) for x in range(5)]
+
+        async def render_all():
+            return await aio.gather_render((aio.yaml_to_svg(s) for s in specs), limit=2)
+
+        assert_that(asyncio.run(render_all()), equal_to([yaml_to_svg(s) for s in specs]))
+
+    def test_limits_concurrency(self):
+        running = 0
+        peak = 0
+
+        async def render(delay):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(delay)
+            running -= 1
+            return delay
+
+        async def render_all():
+            return await aio.gather_render([render(0.01) for _ in range(8)], limit=3)
+
+        assert_that(asyncio.run(render_all()), equal_to([0.01] * 8))
+        assert_that(peak, less_than_or_equal_to(3))
+
+    def test_return_exceptions(self):
+        async def render_all():
+            return await aio.gather_render(
+                [aio.yaml_to_svg(CIRCLE.format(x=1)), aio.yaml_to_svg("elements: [{use: nope}]")],
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(render_all())
+
+        assert_that(results[0], equal_to(yaml_to_svg(CIRCLE.format(x=1))))
+        assert_that(results[1], instance_of(ValueError))
+
+    def test_first_failure_cancels_the_rest(self):
+        started = []
+
+        async def render(index):
+            started.append(index)
+            if index == 0:
+                raise ValueError("boom")
+            await asyncio.sleep(10)
+
+        async def render_all():
+            return await aio.gather_render([render(i) for i in range(4)], limit=2)
+
+        with pytest.raises(ValueError, match="boom"):
+            asyncio.run(render_all())
+        assert_that(len(started), less_than_or_equal_to(3))
+
+    def test_default_limit_is_browser_pool_size(self, monkeypatch):
+        monkeypatch.setattr(config, "get_browser_pool_settings", lambda: {"size": 2})
+        running = 0
+        peak = 0
+
+        async def render():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        asyncio.run(aio.gather_render([render() for _ in range(6)]))
+
+        assert_that(peak, equal_to(2))
+
+    def test_rejects_invalid_limit(self):
+        with pytest.raises(ValueError, match="at least 1"):
+            asyncio.run(aio.gather_render([], limit=0))
@@ -1,7 +1,7 @@
 """Tests for the animations generator."""
 
 import pytest
-from hamcrest import assert_that, contains_string, equal_to
+from hamcrest import assert_that, contains_string, equal_to, is_not, matches_regexp
 
 from mcp_svg_animator.generators.animations import (
     CircleSpec,
@@ -262,3 +262,41 @@ class TestGroups:
         assert_that(result, contains_string('type="rotate"'))
         assert_that(result, contains_string('values="-20;20;-20"'))
         assert_that(result, contains_string('dur="0.5s"'))
+
+
+class TestArrowMarkers:
+    """Tests for shared arrow marker definitions."""
+
+    ARROWS = {
+        "elements": [
+            {"type": "line", "x1": 0, "y1": 0, "x2": 50, "y2": 0, "stroke": "red", "marker_end": "arrow"},
+            {"type": "line", "x1": 0, "y1": 10, "x2": 50, "y2": 10, "stroke": "red", "marker_end": "arrow"},
+            {
+                "type": "group",
+                "elements": [
+                    {"type": "line", "x1": 0, "y1": 20, "x2": 50, "y2": 20, "stroke": "#333", "marker_end": "arrow"},
+                ],
+            },
+        ]
+    }
+
+    @pytest.mark.parametrize("backend", ["drawsvg", "fast"])
+    def test_defines_one_marker_per_color(self, backend):
+        result = create_animated_diagram(self.ARROWS, backend=backend)
+
+        assert_that(result.count("<marker"), equal_to(2))
+        assert_that(result.count("<defs>"), equal_to(1))
+
+    @pytest.mark.parametrize("backend", ["drawsvg", "fast"])
+    def test_gives_each_color_its_own_id(self, backend):
+        result = create_animated_diagram(self.ARROWS, backend=backend)
+
+        assert_that(result.count('marker-end="url(#arrow-red)"'), equal_to(2))
+        assert_that(result, contains_string('id="arrow-red"'))
+        assert_that(result, contains_string('<path d="M-0.1,-0.5 L-0.1,0.5 L0.9,0 Z" fill="#333" />'))
+        assert_that(result, is_not(contains_string('url(#arrow)')))
+
+    def test_sanitizes_colors_in_ids(self):
+        result = create_animated_diagram(self.ARROWS)
+
+        assert_that(result, matches_regexp(r'id="arrow-333-[0-9a-f]{8}"'))
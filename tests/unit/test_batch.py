@@ -0,0 +1,155 @@
+"""Tests for batch rendering."""
+
+from pathlib import Path
+
+from hamcrest import (
+    assert_that,
+    contains_string,
+    equal_to,
+    has_length,
+    is_,
+    none,
+    starts_with,
+)
+
+from mcp_svg_animator.api import render_batch, yaml_to_svg
+from mcp_svg_animator.batch import main
+
+CIRCLE = """
+width: 100
+height: 100
+elements:
+  - type: circle
+    cx: {x}
+    cy: 50
+    r: 10
+"""
+
+BROKEN = """
+elements:
+  - type: circle
+    cx: "missing.x"
+    cy: 50
+    r: 10
+"""
+
+
+class TestRenderBatch:
+    """Tests for render_batch."""
+
+    def test_results_are_in_input_order(self):
+        specs = [CIRCLE.format(x=x) for x in range(10, 90, 10)]
+
+        results = render_batch(specs, workers=1)
+
+        assert_that([r.index for r in results], equal_to(list(range(len(specs)))))
+        assert_that([r.svg for r in results], equal_to([yaml_to_svg(s) for s in specs]))
+
+    def test_process_pool_matches_serial_rendering(self):
+        specs = [CIRCLE.format(x=x) for x in range(20)]
+
+        parallel = render_batch(specs, workers=2)
+
+        assert_that([r.svg for r in parallel], equal_to([yaml_to_svg(s) for s in specs]))
+
+    def test_failures_are_reported_per_item(self):
+        results = render_batch([CIRCLE.format(x=1), BROKEN, CIRCLE.format(x=2)], workers=2)
+
+        assert_that([r.ok for r in results], equal_to([True, False, True]))
+        assert_that(results[1].svg, is_(none()))
+        error = results[1].error
+        assert error is not None
+        assert_that(error, starts_with("ValueError: Unknown element reference"))
+
+    def test_accepts_dicts_and_paths(self, tmp_path):
+        path = tmp_path / "circle.yaml"
+        path.write_text(CIRCLE.format(x=5))
+        spec = {"elements": [{"type": "rectangle", "x": 0, "y": 0, "width": 5, "height": 5}]}
+
+        results = render_batch([path, spec], workers=1)
+
+        assert_that(results[0].source, equal_to(str(path)))
+        assert_that(results[0].svg, equal_to(yaml_to_svg(CIRCLE.format(x=5))))
+        svg = results[1].svg
+        assert svg is not None
+        assert_that(svg, contains_string("<rect"))
+
+    def test_writes_files_to_output_dir(self, tmp_path):
+        first = tmp_path / "a" / "diagram.yaml"
+        second = tmp_path / "b" / "diagram.yaml"
+        for path in (first, second):
+            path.parent.mkdir()
+            path.write_text(CIRCLE.format(x=5))
+        out = tmp_path / "out"
+
+        results = render_batch([first, second, CIRCLE.format(x=7)], output_dir=out, workers=1)
+
+        assert_that(
+            [r.output_path for r in results],
+            equal_to([out / "diagram.svg", out / "diagram-1.svg", out / "diagram-2.svg"]),
+        )
+        assert_that(results[0].svg, is_(none()))
+        output_path = results[2].output_path
+        assert output_path is not None
+        assert_that(output_path.read_text(), contains_string("<circle"))
+
+    def test_renamed_outputs_skip_names_already_taken(self, tmp_path):
+        paths = [tmp_path / "x" / "a.yaml", tmp_path / "a-2.yaml", tmp_path / "y" / "a.yaml"]
+        for path in paths:
+            path.parent.mkdir(exist_ok=True)
+            path.write_text(CIRCLE.format(x=5))
+        out = tmp_path / "out"
+
+        results = render_batch(paths, output_dir=out, workers=1)
+
+        assert_that(
+            [r.output_path for r in results],
+            equal_to([out / "a.svg", out / "a-2.svg", out / "a-3.svg"]),
+        )
+
+    def test_reports_progress(self):
+        calls = []
+
+        render_batch(
+            [CIRCLE.format(x=1), CIRCLE.format(x=2)],
+            workers=1,
+            chunksize=1,
+            progress=lambda result, done, total: calls.append((result.index, done, total)),
+        )
+
+        assert_that(calls, equal_to([(0, 1, 2), (1, 2, 2)]))
+
+    def test_empty_batch(self):
+        assert_that(render_batch([]), has_length(0))
+
+
+class TestBatchCommand:
+    """Tests for the svg-animator-batch command."""
+
+    def test_renders_files_and_reports_progress(self, tmp_path, capsys):
+        paths = []
+        for name in ("one", "two"):
+            path = tmp_path / f"{name}.yaml"
+            path.write_text(CIRCLE.format(x=5))
+            paths.append(str(path))
+        out = tmp_path / "out"
+
+        status = main([*paths, "--output-dir", str(out), "--workers", "1"])
+
+        assert_that(status, equal_to(0))
+        assert_that((out / "one.svg").exists(), is_(True))
+        assert_that((out / "two.svg").exists(), is_(True))
+        assert_that(capsys.readouterr().err, contains_string("[2/2]"))
+
+    def test_exits_nonzero_on_failure(self, tmp_path, capsys):
+        good = tmp_path / "good.yaml"
+        good.write_text(CIRCLE.format(x=5))
+        bad = tmp_path / "bad.yaml"
+        bad.write_text(BROKEN)
+
+        status = main([str(good), str(bad), "-o", str(tmp_path / "out"), "-j", "1"])
+
+        assert_that(status, equal_to(1))
+        err = capsys.readouterr().err
+        assert_that(err, contains_string("Unknown element reference"))
+        assert_that(err, contains_string("1 of 2 diagrams failed"))
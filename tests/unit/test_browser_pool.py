@@ -0,0 +1,176 @@
+"""Tests for the shared browser pool."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from hamcrest import assert_that, equal_to, is_, is_not, same_instance
+
+from mcp_svg_animator.generators.browser_pool import AsyncBrowserPool, BrowserPool
+from mcp_svg_animator.generators.png_generator import (
+    create_png_from_svg,
+    create_png_from_svg_async,
+)
+
+SVG_CONTENT = """<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
+  <circle cx="50" cy="50" r="25" fill="red"/>
+</svg>"""
+
+
+def _browser_of(slot):
+    return slot.browser
+
+
+def _browser_version(slot):
+    return slot.browser.version
+
+
+class TestBrowserPool:
+    """Tests for BrowserPool."""
+
+    def test_runs_job_with_a_browser(self):
+        with BrowserPool(size=1) as pool:
+            version = pool.run(_browser_version)
+
+        assert_that(len(version) > 0, is_(True))
+
+    def test_reuses_warm_browser_between_jobs(self):
+        with BrowserPool(size=1) as pool:
+            first = pool.run(_browser_of)
+            second = pool.run(_browser_of)
+
+        assert_that(second, same_instance(first))
+
+    def test_recycles_browser_after_max_renders(self):
+        with BrowserPool(size=1, max_renders=2) as pool:
+            first = pool.run(_browser_of)
+            pool.run(_browser_of)
+            third = pool.run(_browser_of)
+
+        assert_that(third, is_not(same_instance(first)))
+
+    def test_relaunches_disconnected_browser(self):
+        with BrowserPool(size=1) as pool:
+            first = pool.run(_browser_of)
+            pool.run(lambda slot: slot.browser.close())
+            second = pool.run(_browser_of)
+
+            assert_that(second, is_not(same_instance(first)))
+            assert_that(pool.run(lambda slot: slot.browser.is_connected()), is_(True))
+
+    def test_propagates_job_errors(self):
+        def failing_job(slot):
+            raise ValueError("render failed")
+
+        with BrowserPool(size=1) as pool:
+            with pytest.raises(ValueError, match="render failed"):
+                pool.run(failing_job)
+
+    def test_rejects_jobs_after_close(self):
+        pool = BrowserPool(size=1)
+        pool.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            pool.run(_browser_of)
+
+    def test_rejects_invalid_size(self):
+        with pytest.raises(ValueError, match="at least 1"):
+            BrowserPool(size=0)
+
+
+class TestPooledPngRendering:
+    """Tests for rendering PNGs through an explicit pool."""
+
+    def test_renders_several_pngs_with_one_pool(self, tmp_path: Path):
+        with BrowserPool(size=1) as pool:
+            for name in ("a.png", "b.png"):
+                create_png_from_svg(SVG_CONTENT, str(tmp_path / name), pool=pool)
+
+        for name in ("a.png", "b.png"):
+            content = (tmp_path / name).read_bytes()
+            assert_that(content[:8], equal_to(b"\x89PNG\r\n\x1a\n"))
+
+    def test_reused_page_matches_fresh_pages(self, tmp_path: Path):
+        small = SVG_CONTENT
+        large = SVG_CONTENT.replace('"100"', '"160"').replace("red", "blue")
+
+        with BrowserPool(size=1) as pool:
+            for name, svg in (("a", small), ("b", large), ("c", small)):
+                create_png_from_svg(svg, str(tmp_path / f"{name}-fresh.png"), pool=pool)
+                create_png_from_svg(
+                    svg, str(tmp_path / f"{name}-kept.png"), pool=pool, reuse_page=True
+                )
+
+        for name in ("a", "b", "c"):
+            assert_that(
+                (tmp_path / f"{name}-kept.png").read_bytes(),
+                equal_to((tmp_path / f"{name}-fresh.png").read_bytes()),
+            )
+
+
+class TestAsyncBrowserPool:
+    """Tests for AsyncBrowserPool."""
+
+    def test_concurrent_renders_share_one_browser(self):
+        async def browser_of(pool):
+            async with pool.page() as page:
+                return page.context.browser
+
+        async def scenario():
+            pool = AsyncBrowserPool(size=2)
+            try:
+                return await asyncio.gather(*(browser_of(pool) for _ in range(4)))
+            finally:
+                await pool.close()
+
+        browsers = asyncio.run(scenario())
+
+        for browser in browsers[1:]:
+            assert_that(browser, same_instance(browsers[0]))
+
+    def test_replaces_browser_after_max_renders(self):
+        async def browser_of(pool):
+            async with pool.page() as page:
+                return page.context.browser
+
+        async def scenario():
+            pool = AsyncBrowserPool(size=1, max_renders=1)
+            try:
+                first = await browser_of(pool)
+                second = await browser_of(pool)
+                return first, second, first.is_connected()
+            finally:
+                await pool.close()
+
+        first, second, first_connected = asyncio.run(scenario())
+
+        assert_that(second, is_not(same_instance(first)))
+        assert_that(first_connected, is_(False))
+
+    def test_rejects_renders_after_close(self):
+        async def scenario():
+            pool = AsyncBrowserPool(size=1)
+            await pool.close()
+            async with pool.page():
+                pass
+
+        with pytest.raises(RuntimeError, match="closed"):
+            asyncio.run(scenario())
+
+    def test_renders_pngs_concurrently(self, tmp_path: Path):
+        paths = [tmp_path / f"image{i}.png" for i in range(3)]
+
+        async def scenario():
+            pool = AsyncBrowserPool(size=3)
+            try:
+                await asyncio.gather(*(
+                    create_png_from_svg_async(SVG_CONTENT, str(path), pool=pool)
+                    for path in paths
+                ))
+            finally:
+                await pool.close()
+
+        asyncio.run(scenario())
+
+        for path in paths:
+            assert_that(path.read_bytes()[:8], equal_to(b"\x89PNG\r\n\x1a\n"))
@@ -5,15 +5,21 @@ from pathlib import Path
 import pytest
 from hamcrest import assert_that, is_
 
-from mcp_svg_animator.config import clear_config_cache, is_path_allowed, load_config
+from mcp_svg_animator import config
+from mcp_svg_animator.config import (
+    _default_cache_directory,
+    get_browser_pool_settings,
+    get_render_cache_settings,
+    get_video_settings,
+    is_path_allowed,
+    load_config,
+)
 
 
-@pytest.fixture(autouse=True)
-def reset_config_cache():
-    """Clear config cache before and after each test."""
-    clear_config_cache()
-    yield
-    clear_config_cache()
+@pytest.fixture
+def default_cache_directory(monkeypatch):
+    """Undo the shared fixture's redirect of the default render cache directory."""
+    monkeypatch.setattr(config, "_default_cache_directory", _default_cache_directory)
 
 
 class TestLoadConfig:
@@ -186,3 +192,85 @@ file_output:
       types: [webm]
 """)
         assert_that(is_path_allowed(f"{tmp_path}/videos/anim.webm", "webm"), is_(True))
+
+
+class TestXdgCacheHome:
+    """Tests for honouring XDG_CACHE_HOME."""
+
+    @pytest.mark.usefixtures("default_cache_directory")
+    def test_default_cache_directory_is_under_xdg_cache_home(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+        assert get_render_cache_settings()["directory"] == str(
+            tmp_path / "cache" / "mcp-svg-animator" / "renders"
+        )
+
+
+class TestBrowserPoolSettings:
+    """Tests for browser pool configuration."""
+
+    def test_uses_defaults_when_not_configured(self, tmp_path: Path, monkeypatch):
+        """Without a browser_pool section, defaults are returned."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        assert get_browser_pool_settings() == {"size": 2, "max_renders": 100}
+
+    def test_loads_pool_settings_from_file(self, tmp_path: Path, monkeypatch):
+        """browser_pool settings override the defaults."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        config_dir = tmp_path / ".config" / "mcp-svg-animator"
+        config_dir.mkdir(parents=True)
+        (config_dir / "config.yaml").write_text("""
+browser_pool:
+  size: 4
+  max_renders: 25
+""")
+        assert get_browser_pool_settings() == {"size": 4, "max_renders": 25}
+
+
+class TestRenderCacheSettings:
+    """Tests for render cache configuration."""
+
+    @pytest.mark.usefixtures("default_cache_directory")
+    def test_enabled_by_default(self, tmp_path: Path, monkeypatch):
+        """Without a render_cache section, caching is enabled."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+        settings = get_render_cache_settings()
+        assert settings["enabled"] is True
+        assert settings["directory"] == "~/.cache/mcp-svg-animator/renders"
+
+    def test_loads_cache_settings_from_file(self, tmp_path: Path, monkeypatch):
+        """render_cache settings override the defaults."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        config_dir = tmp_path / ".config" / "mcp-svg-animator"
+        config_dir.mkdir(parents=True)
+        (config_dir / "config.yaml").write_text("""
+render_cache:
+  enabled: false
+  max_bytes: 1000
+  svg_max_bytes: 100
+""")
+        settings = get_render_cache_settings()
+        assert settings["enabled"] is False
+        assert settings["max_bytes"] == 1000
+        assert settings["svg_max_bytes"] == 100
+
+
+class TestVideoSettings:
+    """Tests for video configuration."""
+
+    def test_no_scratch_dir_by_default(self, tmp_path: Path, monkeypatch):
+        """Without a video section, jobs work next to their output file."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        assert get_video_settings() == {"scratch_dir": None}
+
+    def test_loads_scratch_dir_from_file(self, tmp_path: Path, monkeypatch):
+        """video.scratch_dir is read from the config file."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        config_dir = tmp_path / ".config" / "mcp-svg-animator"
+        config_dir.mkdir(parents=True)
+        (config_dir / "config.yaml").write_text("""
+video:
+  scratch_dir: /dev/shm/svg-animator
+""")
+        assert get_video_settings() == {"scratch_dir": "/dev/shm/svg-animator"}
@@ -0,0 +1,101 @@
+"""Tests for compiled position expressions."""
+
+import pytest
+from hamcrest import assert_that, equal_to, same_instance
+
+from mcp_svg_animator.generators.expressions import compile_expression
+from mcp_svg_animator.generators.position_resolver import resolve_positions
+
+VALUES = {("a", "x"): 10.0, ("b", "x"): 30.0, ("a", "y"): 4.0}
+
+
+def lookup(element_id, attr):
+    return VALUES[(element_id, attr)]
+
+
+class TestCompileExpression:
+    """Tests for parsing and evaluating expressions."""
+
+    @pytest.mark.parametrize("expr, expected", [
+        ("a.x", 10),
+        ("a.x + 70", 80),
+        ("a.x - 2.5", 7.5),
+        ("a.x * 2 + 1", 21),
+        ("(a.x + b.x) / 2", 20),
+        ("-a.x + b.x", 20),
+        ("a.x * (a.y - 1)", 30),
+        ("2 * 3 + a.x / 4", 8.5),
+    ])
+    def test_evaluates_arithmetic(self, expr, expected):
+        assert_that(compile_expression(expr).evaluate(lookup), equal_to(expected))
+
+    def test_lists_references_once(self):
+        compiled = compile_expression("(a.x + b.x + a.x) / a.y")
+
+        assert_that(compiled.references, equal_to((("a", "x"), ("b", "x"), ("a", "y"))))
+
+    def test_caches_compiled_expressions(self):
+        assert_that(compile_expression("a.x + 1"), same_instance(compile_expression("a.x + 1")))
+
+    @pytest.mark.parametrize("expr", ["a.x +", "(a.x", "a.x)", "a.x % 2", "", "a.x b.x"])
+    def test_rejects_malformed_expressions(self, expr):
+        with pytest.raises(ValueError, match="Invalid position expression"):
+            compile_expression(expr)
+
+    def test_reports_division_by_zero(self):
+        with pytest.raises(ValueError, match="Division by zero"):
+            compile_expression("a.x / (a.y - 4)").evaluate(lookup)
+
+
+class TestComputedAttributes:
+    """Tests for attributes derived from an element's bounding box."""
+
+    def test_edges_of_a_circle(self):
+        elements = [
+            {"id": "c", "type": "circle", "cx": 50, "cy": 50, "r": 10},
+            {"id": "label", "type": "text", "x": "c.right + 5", "y": "c.bottom"},
+        ]
+
+        resolved = resolve_positions(elements)
+
+        assert_that((resolved[1]["x"], resolved[1]["y"]), equal_to((65, 60)))
+
+    def test_center_of_a_rectangle(self):
+        elements = [
+            {"id": "box", "type": "rectangle", "x": 0, "y": 0, "width": 100, "height": 40},
+            {"id": "dot", "type": "circle", "cx": "box.cx", "cy": "box.cy", "r": 2},
+        ]
+
+        resolved = resolve_positions(elements)
+
+        assert_that((resolved[1]["cx"], resolved[1]["cy"]), equal_to((50, 20)))
+
+    def test_midpoint_between_two_elements(self):
+        elements = [
+            {"id": "a", "type": "rectangle", "x": 0, "y": 0, "width": 20, "height": 20},
+            {"id": "b", "type": "rectangle", "x": 100, "y": 0, "width": 20, "height": 20},
+            {"id": "m", "type": "circle", "cx": "(a.right + b.left) / 2", "cy": "a.cy", "r": 3},
+        ]
+
+        resolved = resolve_positions(elements)
+
+        assert_that(resolved[2]["cx"], equal_to(60))
+
+    def test_set_attributes_take_precedence(self):
+        elements = [
+            {"id": "a", "type": "rectangle", "x": 0, "y": 0, "width": 20, "height": 20},
+            {"id": "b", "type": "rectangle", "x": "a.width * 2", "y": 0},
+        ]
+
+        resolved = resolve_positions(elements)
+
+        assert_that(resolved[1]["x"], equal_to(40))
+
+    def test_raises_error_for_unknown_computed_attribute(self):
+        elements = [
+            {"id": "a", "type": "circle", "cx": 0, "cy": 0, "r": 1},
+            {"id": "b", "type": "circle", "cx": "a.middle", "cy": 0, "r": 1},
+        ]
+
+        with pytest.raises(ValueError, match="Unknown attribute 'middle' on element 'a'"):
+            resolve_positions(elements)
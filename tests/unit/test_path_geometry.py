@@ -0,0 +1,153 @@
+"""Tests for path geometry."""
+
+import math
+
+import pytest
+from hamcrest import assert_that, close_to, contains_exactly, equal_to
+
+from mcp_svg_animator.generators.path_geometry import (
+    parse_path_data,
+    parse_segments,
+    path_geometry,
+)
+from mcp_svg_animator.generators.position_resolver import get_element_bbox, get_element_center
+
+
+def assert_close(actual, expected, delta=1e-9):
+    assert_that(list(actual), contains_exactly(*[close_to(v, delta) for v in expected]))
+
+
+class TestParsePathData:
+    """Tests for parsing path data into absolute coordinates."""
+
+    def test_handles_horizontal_and_vertical_commands(self):
+        geometry = parse_path_data("M 0 0 H 10 V 20 H 0 Z")
+
+        assert_that(geometry.vertices.tolist(), equal_to([[0, 0], [10, 0], [10, 20], [0, 20]]))
+
+    def test_handles_relative_commands(self):
+        geometry = parse_path_data("m 5 5 l 10 0 h 5 v 10 l -15 0 z")
+
+        assert_that(
+            geometry.vertices.tolist(),
+            equal_to([[5, 5], [15, 5], [20, 5], [20, 15], [5, 15]]),
+        )
+
+    def test_treats_extra_move_pairs_as_lines(self):
+        geometry = parse_path_data("M 0 0 10 0 10 10")
+
+        assert_that(geometry.length(), equal_to(20))
+
+    def test_handles_compact_numbers(self):
+        geometry = parse_path_data("M10-5l5.5.5z")
+
+        assert_that(geometry.vertices.tolist(), equal_to([[10, -5], [15.5, -4.5]]))
+
+    def test_matches_segments(self):
+        from_d = parse_path_data("M 0 0 L 10 0 Q 15 5 10 10 C 5 15 0 15 0 10 Z")
+        from_segments = parse_segments([
+            {"type": "move_to", "x": 0, "y": 0},
+            {"type": "line_to", "x": 10, "y": 0},
+            {"type": "quadratic_bezier", "x1": 15, "y1": 5, "x": 10, "y": 10},
+            {"type": "cubic_bezier", "x1": 5, "y1": 15, "x2": 0, "y2": 15, "x": 0, "y": 10},
+            {"type": "close"},
+        ])
+
+        assert_that(from_segments.bounds(), equal_to(from_d.bounds()))
+        assert_that(from_segments.centroid(), equal_to(from_d.centroid()))
+
+
+class TestCentroid:
+    """Tests for area centroids."""
+
+    def test_uses_area_rather_than_vertex_average(self):
+        # Extra vertices along one edge don't pull the centroid
+        geometry = parse_path_data("M 0 0 L 1 0 L 2 0 L 3 0 L 4 0 L 4 4 L 0 4 Z")
+
+        assert_that(geometry.centroid(), equal_to((2.0, 2.0)))
+
+    def test_subtracts_holes(self):
+        geometry = parse_path_data("M 0 0 H 100 V 100 H 0 Z M 0 0 V 50 H 50 V 0 Z")
+
+        assert_close(geometry.centroid(), (175 / 3, 175 / 3))
+
+    def test_circle_from_arcs(self):
+        geometry = parse_path_data("M 0 50 A 50 50 0 0 1 100 50 A 50 50 0 0 1 0 50 Z")
+
+        assert_close(geometry.centroid(), (50, 50))
+
+    def test_falls_back_to_vertex_mean_without_area(self):
+        geometry = parse_path_data("M 0 0 L 10 0 L 20 0 Z")
+
+        assert_that(geometry.centroid(), equal_to((10.0, 0.0)))
+
+
+class TestBounds:
+    """Tests for bounding boxes."""
+
+    def test_includes_cubic_extent(self):
+        geometry = parse_path_data("M 0 0 C 0 10 10 10 10 0")
+
+        assert_that(geometry.bounds(), equal_to((0.0, 0.0, 10.0, 7.5)))
+
+    def test_includes_smooth_quadratic_extent(self):
+        geometry = parse_path_data("M 0 0 Q 5 10 10 0 T 20 0")
+
+        assert_that(geometry.bounds(), equal_to((0.0, -5.0, 20.0, 5.0)))
+
+    def test_includes_arc_extent(self):
+        geometry = parse_path_data("M 0 50 A 50 50 0 0 1 100 50")
+
+        assert_close(geometry.bounds(), (0, 0, 100, 50))
+
+    def test_element_bbox_uses_path_geometry(self):
+        element = {"type": "path", "d": "M 0 0 C 0 10 10 10 10 0"}
+
+        assert_that(get_element_bbox(element), equal_to((0.0, 0.0, 10.0, 7.5)))
+
+
+class TestLength:
+    """Tests for path lengths."""
+
+    def test_polyline_length(self):
+        assert_that(parse_path_data("M 0 0 l 3 4 h 5 v -4 z").length(), close_to(5 + 5 + 4 + 8, 1e-9))
+
+    def test_arc_length(self):
+        geometry = parse_path_data("M 0 50 A 50 50 0 0 1 100 50")
+
+        assert_that(geometry.length(), close_to(50 * math.pi, 0.1))
+
+
+class TestPathElements:
+    """Tests for path elements in position resolution."""
+
+    def test_requires_path_data(self):
+        with pytest.raises(ValueError, match="requires either 'd' or 'segments'"):
+            path_geometry({"type": "path"})
+
+    def test_names_unknown_segment_type(self):
+        element = {"type": "path", "id": "wave", "segments": [
+            {"type": "move_to", "x": 0, "y": 0},
+            {"type": "spline_to", "x": 10, "y": 10},
+        ]}
+
+        with pytest.raises(ValueError, match="'spline_to' in segment 2 of path 'wave'"):
+            path_geometry(element)
+
+    def test_names_missing_segment_coordinate(self):
+        element = {"type": "path", "id": "wave", "segments": [
+            {"type": "move_to", "x": 0, "y": 0},
+            {"type": "line_to", "x": 10},
+        ]}
+
+        with pytest.raises(ValueError, match=r"Segment 2 \(line_to\) of path 'wave' is missing 'y'"):
+            path_geometry(element)
+
+    def test_center_of_large_polygon(self):
+        points = " ".join(
+            f"{100 + 50 * math.cos(a):.6f},{100 + 50 * math.sin(a):.6f}"
+            for a in (2 * math.pi * i / 100_000 for i in range(100_000))
+        )
+        element = {"type": "path", "d": f"M {points} Z"}
+
+        assert_close(get_element_center(element), (100, 100), delta=1e-6)
@@ -1,9 +1,11 @@
 """Tests for relative position resolution."""
 
 import pytest
-from hamcrest import assert_that, equal_to
+from hamcrest import assert_that, equal_to, same_instance
 
-from mcp_svg_animator.generators.position_resolver import resolve_positions
+from mcp_svg_animator.generators import position_resolver
+from mcp_svg_animator.generators.position_resolver import PositionRegistry, resolve_positions
+from mcp_svg_animator.generators.transforms import IDENTITY, apply, parse_transform
 
 
 class TestResolvePositions:
@@ -91,3 +93,300 @@ class TestResolvePositions:
 
         assert_that(resolved[1]["x"], equal_to(60))
         assert_that(resolved[2]["x"], equal_to(110))
+
+
+class TestDependencyOrder:
+    """Tests for resolving references regardless of declaration order."""
+
+    def test_resolves_forward_reference(self):
+        elements = [
+            {"id": "label", "type": "text", "x": "box.x + 5", "y": "box.y"},
+            {"id": "box", "type": "rectangle", "x": 10, "y": 20},
+        ]
+
+        resolved = resolve_positions(elements)
+
+        assert_that(resolved[0]["x"], equal_to(15))
+        assert_that(resolved[0]["y"], equal_to(20))
+
+    def test_resolves_chain_declared_in_reverse(self):
+        elements = [
+            {"id": "box3", "type": "rectangle", "x": "box2.x + 50", "y": 20},
+            {"id": "box2", "type": "rectangle", "x": "box1.x + 50", "y": 20},
+            {"id": "box1", "type": "rectangle", "x": 10, "y": 20},
+        ]
+
+        resolved = resolve_positions(elements)
+
+        assert_that([el["id"] for el in resolved], equal_to(["box3", "box2", "box1"]))
+        assert_that(resolved[0]["x"], equal_to(110))
+
+    def test_resolves_long_chains_without_recursion(self):
+        count = 5000
+        elements = [
+            {"id": f"c{i}", "type": "circle", "cx": f"c{i + 1}.cx + 1", "cy": 0}
+            for i in range(count)
+        ]
+        elements.append({"id": f"c{count}", "type": "circle", "cx": 0, "cy": 0})
+
+        resolved = resolve_positions(elements)
+
+        assert_that(resolved[0]["cx"], equal_to(count))
+
+    def test_raises_error_for_cycle(self):
+        elements = [
+            {"id": "a", "type": "rectangle", "x": "b.x", "y": 0},
+            {"id": "b", "type": "rectangle", "x": "c.x", "y": 0},
+            {"id": "c", "type": "rectangle", "x": "a.x", "y": 0},
+        ]
+
+        with pytest.raises(ValueError, match="Circular position reference: a -> b -> c -> a"):
+            resolve_positions(elements)
+
+    def test_raises_error_for_self_reference(self):
+        elements = [{"id": "a", "type": "rectangle", "x": 10, "y": "a.x"}]
+
+        with pytest.raises(ValueError, match="Circular position reference: a -> a"):
+            resolve_positions(elements)
+
+    def test_connections_can_target_later_elements(self):
+        elements = [
+            {"type": "connection", "from": "a", "to": "b"},
+            {"id": "b", "type": "circle", "cx": "a.cx + 100", "cy": 50},
+            {"id": "a", "type": "circle", "cx": 50, "cy": 50},
+        ]
+
+        resolved = resolve_positions(elements)
+
+        assert_that(resolved[0]["x2"], equal_to(150))
+
+
+class TestNestedGroups:
+    """Tests for references into and out of groups."""
+
+    def test_resolves_references_inside_groups(self):
+        elements = [
+            {"type": "group", "elements": [
+                {"id": "a", "type": "rectangle", "x": 10, "y": 20},
+                {"id": "b", "type": "rectangle", "x": "a.x + 5", "y": "a.y"},
+            ]},
+        ]
+
+        resolved = resolve_positions(elements)
+
+        assert_that(resolved[0]["elements"][1]["x"], equal_to(15))
+
+    def test_converts_reference_into_group_coordinates(self):
+        elements = [
+            {"id": "box", "type": "rectangle", "x": 100, "y": 50},
+            {"type": "group", "transform": "translate(30, 10)", "elements": [
+                {"id": "label", "type": "text", "x": "box.x", "y": "box.y"},
+            ]},
+        ]
+
+        resolved = resolve_positions(elements)
+
+        label = resolved[1]["elements"][0]
+        assert_that((label["x"], label["y"]), equal_to((70, 40)))
+
+    def test_scales_lengths_between_groups(self):
+        elements = [
+            {"type": "group", "transform": "scale(2)", "elements": [
+                {"id": "a", "type": "rectangle", "width": 10},
+            ]},
+            {"id": "b", "type": "rectangle", "width": "a.width"},
+        ]
+
+        resolved = resolve_positions(elements)
+
+        assert_that(resolved[1]["width"], equal_to(20))
+
+    def test_connection_uses_absolute_center_of_nested_target(self):
+        elements = [
+            {"id": "a", "type": "circle", "cx": 0, "cy": 0, "r": 5},
+            {"type": "group", "transform": "translate(100, 0)", "elements": [
+                {"type": "group", "transform": "translate(0, 50)", "elements": [
+                    {"id": "b", "type": "circle", "cx": 10, "cy": 10, "r": 5},
+                ]},
+            ]},
+            {"type": "connection", "from": "a", "to": "b"},
+        ]
+
+        resolved = resolve_positions(elements)
+
+        connection = resolved[0]
+        assert_that((connection["x2"], connection["y2"]), equal_to((110, 60)))
+
+    def test_connection_inside_group_uses_group_coordinates(self):
+        elements = [
+            {"id": "a", "type": "circle", "cx": 0, "cy": 0, "r": 5},
+            {"type": "group", "transform": "translate(100, 0)", "elements": [
+                {"id": "b", "type": "circle", "cx": 10, "cy": 10, "r": 5},
+                {"type": "connection", "from": "a", "to": "b"},
+            ]},
+        ]
+
+        resolved = resolve_positions(elements)
+
+        connection = resolved[1]["elements"][0]
+        assert_that(connection["type"], equal_to("connection"))
+        assert_that((connection["x1"], connection["x2"]), equal_to((-100, 10)))
+
+    def test_raises_error_for_connection_without_an_end(self):
+        elements = [
+            {"id": "a", "type": "circle", "cx": 0, "cy": 0, "r": 5},
+            {"type": "connection", "from": "a"},
+        ]
+
+        with pytest.raises(ValueError, match="requires both 'from' and 'to'"):
+            resolve_positions(elements)
+
+    def test_only_parses_transforms_that_references_cross(self):
+        elements = [
+            {"type": "group", "transform": "perspective(100)", "elements": [
+                {"id": "a", "type": "rectangle", "x": 5},
+                {"id": "b", "type": "rectangle", "x": "a.x"},
+            ]},
+        ]
+
+        resolved = resolve_positions(elements)
+
+        assert_that(resolved[0]["elements"][1]["x"], equal_to(5))
+
+    def test_raises_error_for_malformed_transform_crossed_by_reference(self):
+        elements = [
+            {"type": "group", "transform": "perspective(100)", "elements": [
+                {"id": "a", "type": "rectangle", "x": 5},
+            ]},
+            {"id": "b", "type": "rectangle", "x": "a.x"},
+        ]
+
+        with pytest.raises(ValueError, match="Invalid transform"):
+            resolve_positions(elements)
+
+    def test_prefers_ids_from_own_group(self):
+        elements = [
+            {"type": "group", "elements": [
+                {"id": "node", "type": "rectangle", "x": 1},
+                {"id": "first", "type": "rectangle", "x": "node.x"},
+            ]},
+            {"type": "group", "elements": [
+                {"id": "node", "type": "rectangle", "x": 2},
+                {"id": "second", "type": "rectangle", "x": "node.x"},
+            ]},
+        ]
+
+        resolved = resolve_positions(elements)
+
+        assert_that(resolved[0]["elements"][1]["x"], equal_to(1))
+        assert_that(resolved[1]["elements"][1]["x"], equal_to(2))
+
+    def test_registry_reports_local_and_absolute_positions(self):
+        registry = PositionRegistry([
+            {"type": "group", "transform": "translate(10, 20) scale(2)", "elements": [
+                {"id": "a", "type": "rectangle", "x": 5, "y": 5, "width": 4, "height": 4},
+            ]},
+        ])
+
+        assert_that(registry.local("a")["x"], equal_to(5))
+        assert_that(
+            registry.absolute("a"),
+            equal_to({"x": 20, "y": 30, "width": 8, "height": 8}),
+        )
+
+
+class TestTransforms:
+    """Tests for SVG transform parsing."""
+
+    def test_parses_translate_and_scale(self):
+        matrix = parse_transform("translate(10, 20) scale(2)")
+
+        assert_that(apply(matrix, 1, 1), equal_to((12, 22)))
+
+    def test_rotates_around_center(self):
+        matrix = parse_transform("rotate(90 10 10)")
+
+        x, y = apply(matrix, 20, 10)
+        assert_that((round(x, 9), round(y, 9)), equal_to((10, 20)))
+
+    def test_empty_transform_is_identity(self):
+        assert_that(parse_transform(None), equal_to(IDENTITY))
+
+    def test_raises_error_for_malformed_transform(self):
+        with pytest.raises(ValueError, match="Invalid transform"):
+            parse_transform("translate(1, 2) wobble(3)")
+
+
+class TestGeometryCache:
+    """Tests for per-element center and bounding box caching."""
+
+    def test_computes_hub_center_once(self, monkeypatch):
+        calls = []
+        original = position_resolver.get_element_center
+
+        def counting(element):
+            calls.append(element.get("id"))
+            return original(element)
+
+        monkeypatch.setattr(position_resolver, "get_element_center", counting)
+        elements: list[dict] = [{"id": "hub", "type": "path", "d": "M 0 0 L 10 0 L 10 10 Z"}]
+        for i in range(50):
+            elements.append({"id": f"n{i}", "type": "circle", "cx": i, "cy": 0, "r": 1})
+            elements.append({"type": "connection", "from": "hub", "to": f"n{i}"})
+
+        resolve_positions(elements)
+
+        assert_that(calls.count("hub"), equal_to(1))
+        assert_that(len(calls), equal_to(51))
+
+    def test_reports_bounding_boxes(self):
+        registry = PositionRegistry([
+            {"id": "c", "type": "circle", "cx": 10, "cy": 10, "r": 5},
+            {"id": "p", "type": "path", "d": "M 0 0 L 20 5 L 5 30"},
+        ])
+
+        assert_that(registry.bbox("c"), equal_to((5, 5, 15, 15)))
+        assert_that(registry.bbox("p"), equal_to((0, 0, 20, 30)))
+        assert_that(registry.center("c"), equal_to((10, 10)))
+
+
+class TestCopyFreeResolution:
+    """Tests that resolution copies only what it changes."""
+
+    def test_passes_elements_without_references_through(self):
+        circle = {"id": "a", "type": "circle", "cx": 1, "cy": 2, "r": 3}
+
+        resolved = resolve_positions([circle])
+
+        assert_that(resolved[0], same_instance(circle))
+
+    def test_shares_unchanged_values_with_resolved_copy(self):
+        animations = [{"attribute": "r", "from_value": "1", "to_value": "2", "dur": "1s"}]
+        elements = [
+            {"id": "a", "type": "circle", "cx": 1, "cy": 2, "r": 3},
+            {"id": "b", "type": "circle", "cx": "a.cx", "cy": 2, "r": 3, "animations": animations},
+        ]
+
+        resolved = resolve_positions(elements)
+
+        assert_that(resolved[1]["cx"], equal_to(1))
+        assert_that(resolved[1]["animations"], same_instance(animations))
+        assert_that(elements[1]["cx"], equal_to("a.cx"))
+
+    def test_passes_unchanged_groups_through(self):
+        group = {"type": "group", "elements": [{"type": "circle", "cx": 1, "cy": 1, "r": 1}]}
+
+        resolved = resolve_positions([group])
+
+        assert_that(resolved[0], same_instance(group))
+
+    def test_copies_groups_with_resolved_children(self):
+        child = {"type": "circle", "cx": "a.cx", "cy": 1, "r": 1}
+        group = {"type": "group", "elements": [child]}
+        elements = [{"id": "a", "type": "circle", "cx": 5, "cy": 1, "r": 1}, group]
+
+        resolved = resolve_positions(elements)
+
+        assert_that(resolved[1]["elements"][0]["cx"], equal_to(5))
+        assert_that(group["elements"][0], same_instance(child))
+        assert_that(child["cx"], equal_to("a.cx"))
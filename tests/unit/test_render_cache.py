@@ -0,0 +1,255 @@
+"""Tests for the content-addressed render cache."""
+
+import os
+from pathlib import Path
+
+from hamcrest import assert_that, equal_to, is_, is_not
+
+from mcp_svg_animator.config import clear_config_cache
+from mcp_svg_animator.generators.browser_pool import BrowserPool
+from mcp_svg_animator.generators.png_generator import (
+    create_png_from_svg,
+    render_png_from_svg,
+)
+from mcp_svg_animator.generators.render_cache import (
+    FileCache,
+    SvgCache,
+    cache_key,
+    get_file_cache,
+    get_svg_cache,
+)
+from mcp_svg_animator.generators.yaml_loader import create_diagram_from_yaml
+
+
+def _write_config(tmp_path: Path, content: str) -> None:
+    config_dir = tmp_path / ".config" / "mcp-svg-animator"
+    config_dir.mkdir(parents=True, exist_ok=True)
+    (config_dir / "config.yaml").write_text(content)
+    clear_config_cache()
+
+
+class TestCacheKey:
+    """Tests for cache_key."""
+
+    def test_ignores_dict_key_order(self):
+        first = cache_key("svg", {"width": 100, "height": 50})
+        second = cache_key("svg", {"height": 50, "width": 100})
+
+        assert_that(first, equal_to(second))
+
+    def test_distinguishes_render_parameters(self):
+        assert_that(
+            cache_key("png", "<svg/>", 100, 100),
+            is_not(equal_to(cache_key("png", "<svg/>", 200, 100))),
+        )
+
+    def test_distinguishes_output_kinds(self):
+        assert_that(
+            cache_key("png", "<svg/>"), is_not(equal_to(cache_key("video", "<svg/>")))
+        )
+
+
+class TestSvgCache:
+    """Tests for the in-memory SVG cache."""
+
+    def test_returns_none_on_miss(self):
+        cache = SvgCache()
+
+        assert_that(cache.get("missing"), equal_to(None))
+        assert_that(cache.misses, equal_to(1))
+
+    def test_returns_stored_svg(self):
+        cache = SvgCache()
+        cache.put("key", "<svg/>")
+
+        assert_that(cache.get("key"), equal_to("<svg/>"))
+        assert_that(cache.hits, equal_to(1))
+
+    def test_evicts_least_recently_used_beyond_max_bytes(self):
+        cache = SvgCache(max_bytes=30)
+        cache.put("a", "<svg id='a'/>")
+        cache.put("b", "<svg id='b'/>")
+        cache.get("a")
+        cache.put("c", "<svg id='c'/>")
+
+        assert_that(cache.get("b"), equal_to(None))
+        assert_that(cache.get("a"), equal_to("<svg id='a'/>"))
+        assert_that(cache._total_bytes, equal_to(26))
+
+    def test_replacing_an_entry_updates_its_size(self):
+        cache = SvgCache(max_bytes=30)
+        cache.put("a", "<svg id='a'/>")
+        cache.put("a", "<svg/>")
+
+        assert_that(cache._total_bytes, equal_to(6))
+
+    def test_skips_svg_larger_than_max_bytes(self):
+        cache = SvgCache(max_bytes=10)
+        cache.put("a", "<svg/>")
+        cache.put("b", "<svg id='b'/>")
+
+        assert_that(cache.get("b"), equal_to(None))
+        assert_that(cache.get("a"), equal_to("<svg/>"))
+
+
+class TestFileCache:
+    """Tests for the on-disk file cache."""
+
+    def test_fetch_misses_unknown_key(self, tmp_path: Path):
+        cache = FileCache(tmp_path / "cache", max_bytes=1000)
+
+        assert_that(cache.fetch("missing", tmp_path / "out.png"), is_(False))
+
+    def test_fetch_copies_stored_file(self, tmp_path: Path):
+        cache = FileCache(tmp_path / "cache", max_bytes=1000)
+        source = tmp_path / "source.png"
+        source.write_bytes(b"image")
+        cache.store("key", source)
+
+        output = tmp_path / "out.png"
+        assert_that(cache.fetch("key", output), is_(True))
+        assert_that(output.read_bytes(), equal_to(b"image"))
+
+    def test_read_returns_stored_bytes(self, tmp_path: Path):
+        cache = FileCache(tmp_path / "cache", max_bytes=1000)
+        cache.store_bytes("key", b"image")
+
+        assert_that(cache.read("key"), equal_to(b"image"))
+        assert_that(cache.read("missing"), is_(None))
+
+    def test_stored_bytes_can_be_fetched_to_a_file(self, tmp_path: Path):
+        cache = FileCache(tmp_path / "cache", max_bytes=1000)
+        cache.store_bytes("key", b"image")
+
+        output = tmp_path / "out.png"
+        assert_that(cache.fetch("key", output), is_(True))
+        assert_that(output.read_bytes(), equal_to(b"image"))
+
+    def test_overwriting_output_does_not_corrupt_entry(self, tmp_path: Path):
+        cache = FileCache(tmp_path / "cache", max_bytes=1000)
+        source = tmp_path / "source.png"
+        source.write_bytes(b"image")
+        cache.store("key", source)
+        output = tmp_path / "out.png"
+        cache.fetch("key", output)
+
+        output.write_bytes(b"something else")
+
+        cache.fetch("key", output)
+        assert_that(output.read_bytes(), equal_to(b"image"))
+
+    def test_evicts_least_recently_used_beyond_max_bytes(self, tmp_path: Path):
+        cache = FileCache(tmp_path / "cache", max_bytes=10)
+        source = tmp_path / "source.bin"
+        source.write_bytes(b"12345")
+        cache.store("old", source)
+        os.utime(tmp_path / "cache" / "old", (0, 0))
+        cache.store("newer", source)
+        cache.store("newest", source)
+
+        assert_that((tmp_path / "cache" / "old").exists(), is_(False))
+        assert_that((tmp_path / "cache" / "newest").exists(), is_(True))
+
+    def test_stores_below_max_bytes_do_not_rescan_directory(self, tmp_path: Path, monkeypatch):
+        cache = FileCache(tmp_path / "cache", max_bytes=100)
+        cache.store_bytes("first", b"12345")
+        scans = []
+        monkeypatch.setattr(cache, "_scan", lambda: scans.append(1) or ([], 0))
+
+        cache.store_bytes("second", b"12345")
+        cache.store_bytes("second", b"1234567")
+
+        assert_that(scans, equal_to([]))
+        assert_that(cache._total_bytes, equal_to(12))
+
+    def test_running_total_starts_from_existing_entries(self, tmp_path: Path):
+        FileCache(tmp_path / "cache", max_bytes=10).store_bytes("old", b"12345")
+        os.utime(tmp_path / "cache" / "old", (0, 0))
+        cache = FileCache(tmp_path / "cache", max_bytes=10)
+
+        cache.store_bytes("new", b"1234567")
+
+        assert_that((tmp_path / "cache" / "old").exists(), is_(False))
+        assert_that(cache._total_bytes, equal_to(7))
+
+
+class TestCacheSettings:
+    """Tests for enabling and disabling the cache."""
+
+    def test_caches_are_enabled_by_default(self):
+        assert_that(get_svg_cache() is not None, is_(True))
+        assert_that(get_file_cache() is not None, is_(True))
+
+    def test_caches_can_be_disabled(self, tmp_path: Path):
+        _write_config(tmp_path, "render_cache:\n  enabled: false\n")
+
+        assert_that(get_svg_cache(), equal_to(None))
+        assert_that(get_file_cache(), equal_to(None))
+
+    def test_svg_cache_is_replaced_when_its_limit_changes(self, tmp_path: Path):
+        cache = get_svg_cache()
+        _write_config(tmp_path, "render_cache:\n  svg_max_bytes: 100\n")
+
+        resized = get_svg_cache()
+        assert_that(resized is cache, is_(False))
+        assert_that(resized is not None and resized.max_bytes, equal_to(100))
+
+    def test_file_cache_lives_in_configured_directory(self, tmp_path: Path):
+        _write_config(tmp_path, f"render_cache:\n  directory: {tmp_path}/renders\n")
+
+        cache = get_file_cache()
+
+        assert cache is not None
+        assert_that(cache.directory, equal_to(tmp_path / "renders"))
+
+    def test_file_cache_is_shared_until_settings_change(self, tmp_path: Path):
+        cache = get_file_cache()
+
+        assert_that(get_file_cache(), is_(cache))
+
+        _write_config(tmp_path, "render_cache:\n  max_bytes: 1024\n")
+
+        assert_that(get_file_cache(), is_not(cache))
+
+
+class TestCachedRendering:
+    """Tests for cache use by the generators."""
+
+    def test_repeated_yaml_is_served_from_svg_cache(self):
+        yaml_content = """
+elements:
+  - type: circle
+    cx: 50
+    cy: 50
+"""
+        first = create_diagram_from_yaml(yaml_content)
+        second = create_diagram_from_yaml(yaml_content)
+
+        cache = get_svg_cache()
+        assert cache is not None
+        assert_that(second, equal_to(first))
+        assert_that(cache.hits, equal_to(1))
+
+    def test_cached_png_is_copied_without_a_browser(self, tmp_path: Path):
+        svg_content = """<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100">
+  <rect x="10" y="10" width="80" height="80" fill="green"/>
+</svg>"""
+        first = tmp_path / "first.png"
+        second = tmp_path / "second.png"
+        with BrowserPool(size=1) as pool:
+            create_png_from_svg(svg_content, str(first), pool=pool)
+
+        # The pool is closed, so this only succeeds if served from the cache
+        create_png_from_svg(svg_content, str(second), pool=pool)
+
+        assert_that(second.read_bytes(), equal_to(first.read_bytes()))
+
+    def test_cached_png_bytes_are_returned_without_a_browser(self):
+        svg_content = '<svg xmlns="http://www.w3.org/2000/svg" width="40" height="30"/>'
+        file_cache = get_file_cache()
+        assert file_cache is not None
+        file_cache.store_bytes(cache_key("png", svg_content, 40, 30), b"cached png")
+        pool = BrowserPool(size=1)
+        pool.close()
+
+        assert_that(render_png_from_svg(svg_content, pool=pool), equal_to(b"cached png"))
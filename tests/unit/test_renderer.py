@@ -0,0 +1,122 @@
+"""Tests for the Renderer session object."""
+
+from pathlib import Path
+
+import pytest
+from hamcrest import (
+    assert_that,
+    contains_string,
+    equal_to,
+    is_,
+    none,
+    not_none,
+    same_instance,
+)
+
+from mcp_svg_animator import Renderer
+from mcp_svg_animator.api import dict_to_svg, yaml_to_svg
+
+CIRCLE = """
+width: 100
+height: 100
+elements:
+  - type: circle
+    cx: 50
+    cy: 50
+    r: 10
+"""
+
+TEMPLATE = """
+width: 100
+height: 100
+elements:
+  - type: circle
+    cx: "${x}"
+    cy: 50
+    r: 10
+"""
+
+
+class TestRendererSvg:
+    """Tests for Renderer.svg and its spec cache."""
+
+    def test_matches_the_direct_api(self):
+        with Renderer() as renderer:
+            assert_that(renderer.svg(CIRCLE), equal_to(yaml_to_svg(CIRCLE)))
+
+    def test_renders_dict_specs(self):
+        spec = {"elements": [{"type": "circle", "cx": 5, "cy": 5, "r": 2}]}
+
+        with Renderer(backend="fast") as renderer:
+            assert_that(renderer.svg(spec), equal_to(dict_to_svg(spec, backend="fast")))
+
+    def test_compiles_each_template_once(self):
+        with Renderer() as renderer:
+            first = renderer.template(TEMPLATE)
+            renderer.svg(TEMPLATE, {"x": 1})
+
+            assert_that(renderer.template(TEMPLATE), same_instance(first))
+
+    def test_placeholders_are_literal_without_params(self):
+        spec = CIRCLE + "  - type: text\n    x: 5\n    y: 5\n    text: \"cost: ${price}\"\n"
+
+        with Renderer() as renderer:
+            svg = renderer.svg(spec)
+
+        assert_that(svg, equal_to(yaml_to_svg(spec)))
+        assert_that(svg, contains_string("cost: ${price}"))
+
+    def test_evicts_least_recently_used_specs(self):
+        with Renderer(max_specs=1) as renderer:
+            first = renderer.template(CIRCLE)
+            renderer.template(TEMPLATE)
+
+            assert_that(renderer.template(CIRCLE), is_(not_none()))
+            assert_that(renderer.template(CIRCLE) is first, is_(False))
+
+    def test_substitutes_template_params(self):
+        with Renderer() as renderer:
+            svg = renderer.svg(TEMPLATE, {"x": 30})
+
+        assert_that(svg, equal_to(yaml_to_svg(TEMPLATE.replace('"${x}"', "30"))))
+
+    def test_rejects_params_for_dict_specs(self):
+        with Renderer() as renderer:
+            with pytest.raises(ValueError, match="require a YAML spec"):
+                renderer.svg({"elements": []}, {"x": 1})
+
+    def test_rejects_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unknown backend"):
+            Renderer(backend="nope")
+
+
+class TestRendererLifecycle:
+    """Tests for opening and closing a Renderer."""
+
+    def test_svg_rendering_does_not_start_a_browser(self):
+        with Renderer() as renderer:
+            renderer.svg(CIRCLE)
+
+            assert_that(renderer._pool, is_(none()))
+
+    def test_rejects_renders_after_close(self, tmp_path: Path):
+        renderer = Renderer()
+        renderer.close()
+        renderer.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            renderer.png(CIRCLE, tmp_path / "circle.png")
+
+
+class TestRendererPng:
+    """Tests for Renderer.png."""
+
+    def test_renders_several_pngs_with_one_browser(self, tmp_path: Path):
+        with Renderer() as renderer:
+            paths = [
+                renderer.png(TEMPLATE, tmp_path / f"{x}.png", params={"x": x})
+                for x in (20, 50, 80)
+            ]
+
+        for path in paths:
+            assert_that(path.read_bytes()[:8], equal_to(b"\x89PNG\r\n\x1a\n"))
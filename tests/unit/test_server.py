@@ -1,25 +1,27 @@
 """Tests for MCP server functionality."""
 
 import asyncio
+import base64
 from pathlib import Path
 
 import pytest
-from hamcrest import assert_that, contains_string, is_not
+from hamcrest import assert_that, contains_string, is_, is_not
+
+from mcp.types import ImageContent, TextContent
 
 from mcp_svg_animator.config import clear_config_cache
 from mcp_svg_animator.server import call_tool
 
 
+def _text(content: TextContent | ImageContent) -> str:
+    """Get the text of a tool result item that should be text."""
+    assert isinstance(content, TextContent)
+    return content.text
+
+
 @pytest.fixture(autouse=True)
-def reset_config(tmp_path: Path, monkeypatch):
+def allow_writes_to_tmp_path(tmp_path: Path):
     """Set up config to allow writing to tmp_path for all tests."""
-    import os
-
-    clear_config_cache()
-    # Preserve original home for Playwright browser cache
-    original_home = os.environ.get("HOME", "")
-    monkeypatch.setenv("PLAYWRIGHT_BROWSERS_PATH", f"{original_home}/.cache/ms-playwright")
-    monkeypatch.setenv("HOME", str(tmp_path))
     config_dir = tmp_path / ".config" / "mcp-svg-animator"
     config_dir.mkdir(parents=True)
     (config_dir / "config.yaml").write_text(f"""
@@ -80,10 +82,49 @@ elements:
             )
         )
 
-        response_text = result[0].text
+        response_text = _text(result[0])
         assert_that(response_text, contains_string(str(output_file)))
         assert_that(response_text, is_not(contains_string("<svg")))
 
+    def test_streams_svg_to_file_when_requested(self, tmp_path: Path):
+        """With stream set, the SVG is written to the file element by element."""
+        output_file = tmp_path / "output.svg"
+        yaml_spec = """
+elements:
+  - type: circle
+    cx: 50
+    cy: 50
+    r: 25
+"""
+        result = asyncio.run(
+            call_tool(
+                "create_svg_from_yaml",
+                {"yaml_spec": yaml_spec, "output_path": str(output_file), "stream": True},
+            )
+        )
+
+        assert_that(_text(result[0]), contains_string(str(output_file)))
+        assert_that(output_file.read_text(), contains_string("<circle"))
+
+    def test_rejects_stream_with_another_backend(self, tmp_path: Path):
+        """Streaming always uses the fast backend, so asking for drawsvg is an error."""
+        output_file = tmp_path / "output.svg"
+
+        with pytest.raises(ValueError, match="fast backend"):
+            asyncio.run(
+                call_tool(
+                    "create_svg_from_yaml",
+                    {
+                        "yaml_spec": "elements: []",
+                        "output_path": str(output_file),
+                        "stream": True,
+                        "backend": "drawsvg",
+                    },
+                )
+            )
+
+        assert_that(output_file.exists(), is_(False))
+
     def test_returns_svg_content_when_no_output_path(self):
         """When output_path is not provided, return SVG content (existing behavior)."""
         yaml_spec = """
@@ -100,7 +141,7 @@ elements:
             call_tool("create_svg_from_yaml", {"yaml_spec": yaml_spec})
         )
 
-        response_text = result[0].text
+        response_text = _text(result[0])
         assert_that(response_text, contains_string("<svg"))
         assert_that(response_text, contains_string("<circle"))
 
@@ -153,7 +194,7 @@ elements:
             )
         )
 
-        response_text = result[0].text
+        response_text = _text(result[0])
         assert_that(response_text, contains_string(str(png_file)))
 
     def test_creates_both_svg_and_png_when_both_paths_provided(self, tmp_path: Path):
@@ -183,11 +224,102 @@ elements:
 
         assert svg_file.exists()
         assert png_file.exists()
-        response_text = result[0].text
+        response_text = _text(result[0])
         assert_that(response_text, contains_string(str(svg_file)))
         assert_that(response_text, contains_string(str(png_file)))
 
 
+class TestCreateSvgFromYamlWithInlinePng:
+    """Tests for create_svg_from_yaml with inline_png."""
+
+    YAML_SPEC = """
+width: 200
+height: 100
+elements:
+  - type: circle
+    cx: 50
+    cy: 50
+    r: 25
+    fill: red
+"""
+
+    def test_returns_svg_and_inline_image(self):
+        result = asyncio.run(
+            call_tool("create_svg_from_yaml", {"yaml_spec": self.YAML_SPEC, "inline_png": True})
+        )
+
+        assert_that(_text(result[0]), contains_string("<svg"))
+        image = result[1]
+        assert isinstance(image, ImageContent)
+        assert image.mimeType == "image/png"
+        assert base64.b64decode(image.data)[:8] == b"\x89PNG\r\n\x1a\n"
+
+    def test_inline_image_bypasses_file_cache(self, monkeypatch):
+        from mcp_svg_animator.generators import png_generator
+        from mcp_svg_animator.generators.render_cache import cache_key, get_file_cache
+        from mcp_svg_animator.generators.yaml_loader import create_diagram_from_yaml
+
+        async def screenshot(*args):
+            return b"fresh png"
+
+        monkeypatch.setattr(png_generator, "_screenshot_async", screenshot)
+        file_cache = get_file_cache()
+        assert file_cache is not None
+        svg_content = create_diagram_from_yaml(self.YAML_SPEC)
+        file_cache.store_bytes(cache_key("png", svg_content, 200, 100), b"cached png")
+
+        result = asyncio.run(
+            call_tool("create_svg_from_yaml", {"yaml_spec": self.YAML_SPEC, "inline_png": True})
+        )
+
+        image = result[1]
+        assert isinstance(image, ImageContent)
+        assert base64.b64decode(image.data) == b"fresh png"
+        assert len(list(file_cache.directory.iterdir())) == 1
+
+    def test_png_file_and_inline_image_share_one_render(self, tmp_path: Path, monkeypatch):
+        from mcp_svg_animator.generators import png_generator
+
+        renders = []
+
+        async def screenshot(*args):
+            renders.append(args)
+            return b"rendered png"
+
+        monkeypatch.setattr(png_generator, "_screenshot_async", screenshot)
+        png_file = tmp_path / "output.png"
+
+        result = asyncio.run(
+            call_tool(
+                "create_svg_from_yaml",
+                {"yaml_spec": self.YAML_SPEC, "png_path": str(png_file), "inline_png": True},
+            )
+        )
+
+        image = result[1]
+        assert isinstance(image, ImageContent)
+        assert len(renders) == 1
+        assert png_file.read_bytes() == b"rendered png"
+        assert base64.b64decode(image.data) == b"rendered png"
+
+
+class TestCreateAnimationVideoArguments:
+    """Tests for create_animation_video argument checking."""
+
+    def test_rejects_fractional_fps(self, tmp_path: Path):
+        output_path = tmp_path / "video.webm"
+
+        with pytest.raises(ValueError, match="fps must be a positive integer"):
+            asyncio.run(
+                call_tool(
+                    "create_animation_video",
+                    {"svg_content": "<svg/>", "output_path": str(output_path), "fps": 12.5},
+                )
+            )
+
+        assert not output_path.exists()
+
+
 class TestFileOutputPermissions:
     """Tests for file output permission checking."""
 
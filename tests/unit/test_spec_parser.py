@@ -0,0 +1,56 @@
+"""Tests for YAML and JSON spec parsing."""
+
+import json
+
+import pytest
+import yaml
+from hamcrest import assert_that, contains_string, equal_to
+
+from mcp_svg_animator import spec_parser
+from mcp_svg_animator.generators.yaml_loader import create_diagram_from_yaml
+
+
+class TestSafeLoad:
+    """Tests for the YAML loader selection."""
+
+    def test_uses_c_loader_when_available(self):
+        expected = yaml.CSafeLoader if yaml.__with_libyaml__ else yaml.SafeLoader
+
+        assert_that(spec_parser.SafeLoader, equal_to(expected))
+
+    def test_parses_yaml(self):
+        assert_that(spec_parser.safe_load("a: 1\nb: [x, y]\n"), equal_to({"a": 1, "b": ["x", "y"]}))
+
+    def test_rejects_unsafe_tags(self):
+        with pytest.raises(yaml.YAMLError):
+            spec_parser.safe_load("!!python/object/apply:os.system ['true']")
+
+
+class TestLoadSpec:
+    """Tests for JSON sniffing."""
+
+    def test_parses_json_with_json_module(self, monkeypatch):
+        def fail(content):
+            raise AssertionError("YAML loader used for JSON input")
+
+        monkeypatch.setattr(spec_parser, "safe_load", fail)
+        spec = {"width": 100, "elements": [{"type": "circle", "r": 5}]}
+
+        assert_that(spec_parser.load_spec("  " + json.dumps(spec)), equal_to(spec))
+
+    def test_falls_back_to_yaml_for_flow_style(self):
+        assert_that(spec_parser.load_spec("{width: 100}"), equal_to({"width": 100}))
+
+    def test_parses_block_yaml(self):
+        assert_that(spec_parser.load_spec("width: 100\n"), equal_to({"width": 100}))
+
+    def test_reports_malformed_input_as_yaml_error(self):
+        with pytest.raises(yaml.YAMLError):
+            spec_parser.load_spec("{width: [100")
+
+    def test_diagram_from_json(self):
+        spec = {"elements": [{"type": "circle", "cx": 10, "cy": 10, "r": 5}]}
+
+        result = create_diagram_from_yaml(json.dumps(spec))
+
+        assert_that(result, contains_string("<circle"))
@@ -0,0 +1,79 @@
+"""Tests for bulk element spec validation."""
+
+import pytest
+from hamcrest import assert_that, equal_to, instance_of
+
+from mcp_svg_animator.generators.specs import (
+    AnimationSpec,
+    CircleSpec,
+    GroupSpec,
+    PathSpec,
+    RectangleSpec,
+    validate_element,
+    validate_elements,
+)
+
+ELEMENTS = [
+    {
+        "type": "circle", "cx": 10.0, "cy": 20.0, "r": 5.0,
+        "animations": [{"attribute": "r", "from_value": "5", "to_value": "9", "dur": "1s"}],
+    },
+    {
+        "type": "group",
+        "transform": "translate(10, 10)",
+        "transform_animations": [{"type": "rotate", "values": "0;360", "dur": "2s"}],
+        "elements": [
+            {"type": "rectangle", "x": 0.0, "y": 0.0, "width": 10.0, "height": 10.0},
+            {"type": "group", "elements": [
+                {"type": "path", "segments": [
+                    {"type": "move_to", "x": 0.0, "y": 0.0},
+                    {"type": "line_to", "x": 10.0, "y": 0.0},
+                    {"type": "close"},
+                ]},
+            ]},
+        ],
+    },
+]
+
+
+class TestValidateElements:
+    """Tests for validate_elements and validate_element."""
+
+    def test_validates_nested_groups_in_one_call(self):
+        circle, group = validate_elements(ELEMENTS)
+
+        assert_that(circle, instance_of(CircleSpec))
+        assert_that(circle.animations[0], instance_of(AnimationSpec))
+        assert_that(group.elements[0], instance_of(RectangleSpec))
+        assert_that(group.elements[1], instance_of(GroupSpec))
+        assert_that(group.elements[1].elements[0], instance_of(PathSpec))
+
+    def test_validates_single_element(self):
+        spec = validate_element({"type": "circle", "cx": "15"})
+
+        assert_that(spec.cx, equal_to(15.0))
+
+    def test_raises_error_for_unknown_nested_element_type(self):
+        elements = [{"type": "group", "elements": [{"type": "hexagon"}]}]
+
+        with pytest.raises(ValueError, match="Unknown element type: hexagon"):
+            validate_elements(elements)
+
+    def test_raises_error_for_missing_nested_type_key(self):
+        elements = [{"type": "group", "elements": [{"cx": 10}]}]
+
+        with pytest.raises(ValueError, match="Element spec missing 'type' key"):
+            validate_elements(elements)
+
+    def test_reports_invalid_segment_type_as_validation_error(self):
+        elements = [{"type": "path", "segments": [{"type": "spiral"}]}]
+
+        with pytest.raises(ValueError, match="spiral") as exc_info:
+            validate_elements(elements)
+
+        assert_that("Unknown element type" in str(exc_info.value), equal_to(False))
+
+    def test_raises_error_for_invalid_attribute(self):
+        with pytest.raises(ValueError, match="cx"):
+            validate_elements([{"type": "circle", "cx": "not a number"}])
+
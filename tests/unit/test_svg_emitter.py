@@ -0,0 +1,216 @@
+"""Tests for the fast SVG emitter backend."""
+
+import io
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+from hamcrest import assert_that, contains_string, ends_with, equal_to, starts_with
+
+from mcp_svg_animator.api import dict_to_svg_file, yaml_file_to_svg_file, yaml_to_svg_file
+from mcp_svg_animator.generators.animations import create_animated_diagram
+from mcp_svg_animator.generators.svg_emitter import emit_diagram, stream_diagram
+from mcp_svg_animator.generators.yaml_loader import create_diagram_from_yaml
+
+DIAGRAM = {
+    "width": 500,
+    "height": 400,
+    "elements": [
+        {
+            "type": "circle", "id": "a", "cx": 100, "cy": 100, "r": 30,
+            "fill": "red", "stroke": "black", "stroke_width": 2,
+            "animations": [
+                {"attribute": "r", "from_value": "30", "to_value": "40", "dur": "1s"},
+                {"attribute": "opacity", "from_value": "1;0.5;1", "dur": "2s"},
+            ],
+        },
+        {
+            "type": "rectangle", "id": "b", "x": 300, "y": 250, "width": 80,
+            "height": 40, "rx": 5, "fill": "blue", "opacity": 0.5,
+        },
+        {"type": "ellipse", "cx": 250, "cy": 50, "rx": 40, "ry": 20},
+        {
+            "type": "line", "x1": 0, "y1": 0, "x2": 50, "y2": 50,
+            "stroke": "green", "marker_end": "arrow",
+        },
+        {
+            "type": "text", "x": 20, "y": 380, "text": "Tom & \"Jerry\" <3",
+            "font_size": 14, "text_anchor": "middle", "background": "yellow",
+            "animations": [{"attribute": "opacity", "from_value": "0", "to_value": "1", "dur": "1s"}],
+        },
+        {
+            "type": "text", "x": 20, "y": 20, "text": "Plain", "font_family": "serif",
+            "animations": [{"attribute": "x", "from_value": "20", "to_value": "40", "dur": "1s"}],
+        },
+        {
+            "type": "text", "x": 20, "y": 60, "text": "First\n<Second>\n\nFourth",
+            "animations": [{"attribute": "opacity", "from_value": "0", "to_value": "1", "dur": "1s"}],
+        },
+        {"type": "text", "x": 20, "y": 120, "text": "Boxed\nlines", "background": "white"},
+        {"type": "path", "d": "M 10 10 L 20 20 Z", "fill": "none", "stroke": "black"},
+        {
+            "type": "connection", "from": "a", "to": "b", "stroke": "#333",
+            "stroke_width": 2, "stroke_dasharray": "4,2", "marker_end": "arrow",
+        },
+        {
+            "type": "group", "transform": "translate(200, 150)",
+            "transform_animations": [
+                {"type": "rotate", "values": "0;360", "dur": "2s", "repeatCount": "indefinite"},
+            ],
+            "elements": [
+                {"type": "rectangle", "x": -25, "y": -25, "width": 50, "height": 50},
+                {"type": "group", "elements": []},
+            ],
+        },
+    ],
+}
+
+
+class TestEmitDiagram:
+    """Tests for emit_diagram."""
+
+    def test_matches_drawsvg_backend(self):
+        assert_that(emit_diagram(DIAGRAM), equal_to(create_animated_diagram(DIAGRAM)))
+
+    def test_matches_drawsvg_backend_without_markers(self):
+        spec = {"elements": [{"type": "circle"}]}
+
+        assert_that(emit_diagram(spec), equal_to(create_animated_diagram(spec)))
+
+    def test_output_is_well_formed(self):
+        root = ET.fromstring(emit_diagram(DIAGRAM).encode())
+
+        assert_that(root.tag, equal_to("{http://www.w3.org/2000/svg}svg"))
+
+    def test_writes_xml_header_and_dimensions(self):
+        result = emit_diagram({"width": 800, "height": 600})
+
+        assert_that(result, starts_with('<?xml version="1.0" encoding="UTF-8"?>'))
+        assert_that(result, contains_string('width="800" height="600" viewBox="0 0 800 600"'))
+
+    def test_escapes_text_and_attributes(self):
+        result = emit_diagram({
+            "elements": [{"type": "text", "x": 0, "y": 0, "text": "a < b & c", "fill": '"x"'}]
+        })
+
+        assert_that(result, contains_string(">a &lt; b &amp; c</text>"))
+        assert_that(result, contains_string('fill="&quot;x&quot;"'))
+
+    def test_raises_error_for_unknown_element_type(self):
+        with pytest.raises(ValueError, match="Unknown element type: hexagon"):
+            emit_diagram({"elements": [{"type": "hexagon"}]})
+
+    def test_raises_error_for_missing_type_key(self):
+        with pytest.raises(ValueError, match="missing 'type'"):
+            emit_diagram({"elements": [{"cx": 10}]})
+
+
+class TestBackendSelection:
+    """Tests for choosing the SVG backend per call."""
+
+    def test_create_animated_diagram_uses_fast_backend(self):
+        result = create_animated_diagram(DIAGRAM, backend="fast")
+
+        assert_that(result, equal_to(emit_diagram(DIAGRAM)))
+
+    def test_rejects_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unknown backend: cairo"):
+            create_animated_diagram({}, backend="cairo")
+
+    def test_yaml_loader_accepts_backend(self):
+        yaml_content = """
+elements:
+  - type: circle
+    cx: 10
+    cy: 10
+    r: 5
+"""
+        result = create_diagram_from_yaml(yaml_content, backend="fast")
+
+        assert_that(result, contains_string('<circle cx="10.0" cy="10.0" r="5.0"'))
+
+
+class TestStreamDiagram:
+    """Tests for stream_diagram and the streaming file writers."""
+
+    def test_matches_emit_diagram_without_markers(self):
+        spec = {"elements": [e for e in DIAGRAM["elements"] if "marker_end" not in e]}
+        out = io.StringIO()
+
+        stream_diagram(spec, out)
+
+        expected = emit_diagram(spec).replace("<defs>\n</defs>\n", "")
+        assert_that(out.getvalue(), equal_to(expected))
+
+    def test_writes_marker_definitions_after_elements(self):
+        out = io.StringIO()
+
+        stream_diagram(DIAGRAM, out)
+
+        result = out.getvalue()
+        assert_that(result, ends_with("</defs>\n</svg>"))
+        assert_that(result.index("<defs>") > result.index("</g>"), equal_to(True))
+        ET.fromstring(result.encode())
+
+    def test_writes_elements_before_later_ones_are_created(self):
+        out = io.StringIO()
+        spec = {"elements": [
+            {"type": "circle", "cx": 10, "cy": 10, "r": 5},
+            {"type": "hexagon"},
+        ]}
+
+        with pytest.raises(ValueError, match="Unknown element type"):
+            stream_diagram(spec, out)
+
+        assert_that(out.getvalue(), contains_string("<circle"))
+
+    def test_dict_to_svg_file_streams(self, tmp_path: Path):
+        output_path = dict_to_svg_file(DIAGRAM, tmp_path / "out.svg", stream=True)
+
+        out = io.StringIO()
+        stream_diagram(DIAGRAM, out)
+        assert_that(output_path.read_text(), equal_to(out.getvalue()))
+
+    def test_yaml_to_svg_file_streams(self, tmp_path: Path):
+        yaml_spec = """
+elements:
+  - type: circle
+    cx: 10
+    cy: 10
+    r: 5
+"""
+        output_path = yaml_to_svg_file(yaml_spec, tmp_path / "out.svg", stream=True)
+
+        assert_that(output_path.read_text(), contains_string('<circle cx="10.0"'))
+
+    def test_failed_stream_leaves_existing_file_untouched(self, tmp_path: Path):
+        output_path = tmp_path / "out.svg"
+        output_path.write_text("previous")
+        spec = {"elements": [
+            {"type": "circle", "cx": 10, "cy": 10, "r": 5},
+            {"type": "hexagon"},
+        ]}
+
+        with pytest.raises(ValueError, match="Unknown element type"):
+            dict_to_svg_file(spec, output_path, stream=True)
+
+        assert_that(output_path.read_text(), equal_to("previous"))
+        assert_that([p.name for p in tmp_path.iterdir()], equal_to(["out.svg"]))
+
+    def test_failed_yaml_file_stream_leaves_existing_file_untouched(self, tmp_path: Path):
+        yaml_path = tmp_path / "diagram.yaml"
+        yaml_path.write_text("""
+elements:
+  - type: circle
+  - type: hexagon
+""")
+        output_path = tmp_path / "out.svg"
+        output_path.write_text("previous")
+
+        with pytest.raises(ValueError, match="Unknown element type"):
+            yaml_file_to_svg_file(yaml_path, output_path, stream=True)
+
+        assert_that(output_path.read_text(), equal_to("previous"))
+        assert_that(
+            sorted(p.name for p in tmp_path.iterdir()), equal_to(["diagram.yaml", "out.svg"])
+        )
@@ -0,0 +1,157 @@
+"""Tests for compiled diagram templates."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from hamcrest import assert_that, contains_string, equal_to, is_not, same_instance
+from mcp.types import TextContent
+
+from mcp_svg_animator.api import compile_template, yaml_to_svg
+from mcp_svg_animator.generators import templates
+from mcp_svg_animator.generators.specs.validation import validate_elements
+from mcp_svg_animator.server import call_tool
+
+TEMPLATE = """
+parameters:
+  color: red
+definitions:
+  node:
+    type: circle
+    r: 10
+    fill: "${color}"
+elements:
+  - use: node
+    id: a
+    cx: "${x}"
+    cy: 50
+  - type: text
+    x: "a.cx + 20"
+    y: 50
+    text: "Node at ${x}"
+"""
+
+
+class TestCompileTemplate:
+    """Tests for compile_template and render."""
+
+    def test_renders_like_the_substituted_yaml(self):
+        template = compile_template(TEMPLATE)
+
+        expected = yaml_to_svg(
+            TEMPLATE.replace('"${color}"', "blue")
+            .replace('"${x}"', "30")
+            .replace("${x}", "30")
+            .replace("parameters:\n  color: red\n", "")
+        )
+        assert_that(template.render({"x": 30, "color": "blue"}), equal_to(expected))
+
+    def test_exact_placeholders_keep_parameter_types(self):
+        spec = compile_template(TEMPLATE).spec({"x": 30})
+
+        assert_that(spec["elements"][0]["cx"], equal_to(30))
+        assert_that(spec["elements"][1]["text"], equal_to("Node at 30"))
+
+    def test_uses_defaults(self):
+        result = compile_template(TEMPLATE).render({"x": 1})
+
+        assert_that(result, contains_string('fill="red"'))
+
+    def test_renders_are_independent(self):
+        template = compile_template(TEMPLATE)
+
+        first = template.render({"x": 10, "color": "blue"})
+        second = template.render({"x": 20})
+
+        assert_that(first, contains_string('fill="blue"'))
+        assert_that(second, is_not(contains_string('fill="blue"')))
+        assert_that(second, contains_string('cx="20.0"'))
+
+    def test_shares_static_parts_between_renders(self):
+        template = compile_template(TEMPLATE + "  - type: circle\n    cx: 1\n    cy: 1\n    r: 1\n")
+
+        first = template.spec({"x": 1})
+        second = template.spec({"x": 2})
+
+        assert_that(second["elements"][2], same_instance(first["elements"][2]))
+
+    def test_validates_static_elements_once(self, monkeypatch):
+        template = compile_template(TEMPLATE + "  - type: circle\n    cx: 1\n    cy: 1\n    r: 1\n")
+        validated = []
+
+        def record(elements):
+            validated.append(len(elements))
+            return validate_elements(elements)
+
+        monkeypatch.setattr(templates, "validate_elements", record)
+        template.render({"x": 1})
+        template.render({"x": 2})
+
+        # Each render validates the two parameterized elements, not the static circle
+        assert_that(validated, equal_to([2, 2]))
+
+    def test_reports_invalid_element_by_its_position(self):
+        template = compile_template("""
+elements:
+  - type: circle
+    cx: 1
+    cy: 1
+    r: 1
+  - type: circle
+    cx: 2
+    cy: 2
+    r: 2
+    opacity: "${opacity}"
+""")
+
+        with pytest.raises(ValueError, match=r"\n1\.circle\.opacity"):
+            template.render({"opacity": "opaque"})
+
+    def test_picks_up_library_edits(self, tmp_path: Path):
+        library_file = tmp_path / "shapes.yaml"
+        library_file.write_text("dot:\n  type: circle\n  r: 2\n  fill: red\n")
+        template = compile_template(f"""
+libraries:
+  - {library_file}
+elements:
+  - use: dot
+    cx: "${{x}}"
+    cy: 5
+""")
+        template.render({"x": 1})
+
+        library_file.write_text("dot:\n  type: circle\n  r: 2\n  fill: green\n")
+
+        assert_that(template.render({"x": 1}), contains_string('fill="green"'))
+
+    def test_raises_error_for_missing_parameter(self):
+        with pytest.raises(ValueError, match="Missing template parameter: x"):
+            compile_template(TEMPLATE).render()
+
+    def test_raises_error_for_unknown_parameter(self):
+        with pytest.raises(ValueError, match="Unknown template parameter: size"):
+            compile_template(TEMPLATE).render({"x": 1, "size": 3})
+
+    def test_rejects_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unknown backend: cairo"):
+            compile_template(TEMPLATE, backend="cairo")
+
+
+class TestRenderSvgTemplateTool:
+    """Tests for the render_svg_template MCP tool."""
+
+    def test_returns_rendered_svg(self):
+        result = asyncio.run(
+            call_tool("render_svg_template", {"yaml_spec": TEMPLATE, "params": {"x": 42}})
+        )
+
+        assert isinstance(result[0], TextContent)
+        assert_that(result[0].text, contains_string('cx="42.0"'))
+
+    def test_denies_write_without_permission(self, tmp_path: Path):
+        with pytest.raises(PermissionError, match="not allowed"):
+            asyncio.run(call_tool("render_svg_template", {
+                "yaml_spec": TEMPLATE,
+                "params": {"x": 1},
+                "output_path": str(tmp_path / "out.svg"),
+            }))
@@ -1,11 +1,53 @@
 """Tests for video generation from SVG animations."""
 
+import asyncio
+import errno
+import os
+import shutil
+import sys
+import threading
 from pathlib import Path
 
 import pytest
-from hamcrest import assert_that, greater_than, is_
+from hamcrest import assert_that, equal_to, greater_than, is_, is_not
 
-from mcp_svg_animator.generators.video_generator import create_video_from_svg
+from mcp_svg_animator.config import clear_config_cache
+from mcp_svg_animator.generators import video_generator
+from mcp_svg_animator.generators.browser_pool import AsyncBrowserPool, BrowserPool
+from mcp_svg_animator.generators.video_generator import (
+    CHUNK_BUFFER_FRAMES,
+    _AsyncFrameEncoder,
+    _ChunkBuffer,
+    _FrameEncoder,
+    _frame_times,
+    _move_into_place,
+    _scratch_directory,
+    _split_frames,
+    create_video_from_svg,
+    create_video_from_svg_async,
+)
+
+requires_ffmpeg = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None, reason="ffmpeg is not installed"
+)
+
+
+@pytest.fixture(autouse=True)
+def disable_render_cache(tmp_path: Path):
+    """Render every video for real, so tests don't pass via cache hits."""
+    config_dir = tmp_path / ".config" / "mcp-svg-animator"
+    config_dir.mkdir(parents=True)
+    (config_dir / "config.yaml").write_text("render_cache:\n  enabled: false\n")
+    clear_config_cache()
+    yield
+    clear_config_cache()
+
+
+ANIMATED_SVG = """<svg xmlns="http://www.w3.org/2000/svg" width="200" height="200">
+  <circle cx="100" cy="100" r="50" fill="red">
+    <animate attributeName="r" from="50" to="80" dur="1s" repeatCount="indefinite"/>
+  </circle>
+</svg>"""
 
 
 class TestCreateVideoFromSvg:
@@ -24,6 +66,7 @@ class TestCreateVideoFromSvg:
 
         assert_that(output_path.exists(), is_(True))
         assert_that(output_path.stat().st_size, greater_than(0))
+        assert_that(sorted(os.listdir(tmp_path)), equal_to([".config", "animation.webm"]))
 
     def test_creates_video_with_custom_dimensions(self, tmp_path: Path):
         svg_content = """<?xml version="1.0" encoding="UTF-8"?>
@@ -41,3 +84,367 @@ class TestCreateVideoFromSvg:
         )
 
         assert_that(output_path.exists(), is_(True))
+
+
+class TestCreateVideoFromSvgAsync:
+    """Tests for create_video_from_svg_async function."""
+
+    def test_creates_video_file(self, tmp_path: Path):
+        output_path = tmp_path / "animation.webm"
+
+        async def scenario():
+            pool = AsyncBrowserPool(size=1)
+            try:
+                await create_video_from_svg_async(
+                    ANIMATED_SVG, str(output_path), duration_ms=500, pool=pool
+                )
+            finally:
+                await pool.close()
+
+        asyncio.run(scenario())
+
+        assert_that(output_path.exists(), is_(True))
+        assert_that(output_path.stat().st_size, greater_than(0))
+
+
+class TestFpsValidation:
+    """Tests for rejecting bad frame rates before any work starts."""
+
+    @pytest.mark.parametrize("fps", [0, -5, 2.5, "30", True])
+    def test_rejects_non_positive_integer_fps(self, tmp_path: Path, fps):
+        output_path = tmp_path / "video.webm"
+
+        with pytest.raises(ValueError, match="fps must be a positive integer"):
+            create_video_from_svg(ANIMATED_SVG, str(output_path), fps=fps)
+
+        assert_that(output_path.exists(), is_(False))
+
+    def test_async_rejects_zero_fps(self, tmp_path: Path):
+        with pytest.raises(ValueError, match="fps must be a positive integer"):
+            asyncio.run(
+                create_video_from_svg_async(ANIMATED_SVG, str(tmp_path / "v.webm"), fps=0)
+            )
+
+
+@requires_ffmpeg
+class TestFrameEncoderFailures:
+    """Tests for cleaning up after ffmpeg fails."""
+
+    def test_removes_partial_output_when_encoding_fails(self, tmp_path: Path):
+        output_path = tmp_path / "broken.webm"
+
+        with pytest.raises(RuntimeError, match="ffmpeg failed"):
+            with _FrameEncoder(str(output_path), 10) as encoder:
+                encoder.write(b"not a png")
+
+        assert_that(output_path.exists(), is_(False))
+
+    def test_removes_partial_output_when_capture_fails(self, tmp_path: Path):
+        output_path = tmp_path / "abandoned.webm"
+
+        with pytest.raises(KeyError):
+            with _FrameEncoder(str(output_path), 10):
+                raise KeyError("capture failed")
+
+        assert_that(output_path.exists(), is_(False))
+
+    def test_async_encoder_removes_partial_output(self, tmp_path: Path):
+        output_path = tmp_path / "broken.webm"
+
+        async def encode():
+            async with _AsyncFrameEncoder(str(output_path), 10) as encoder:
+                await encoder.write(b"not a png")
+
+        with pytest.raises(RuntimeError, match="ffmpeg failed"):
+            asyncio.run(encode())
+
+        assert_that(output_path.exists(), is_(False))
+
+
+class TestChunkBuffer:
+    """Tests for streaming a chunk's frames to the encoder."""
+
+    def test_yields_frames_in_order_until_finished(self):
+        buffer = _ChunkBuffer(threading.Event())
+        buffer.put(b"a")
+        buffer.put(b"b")
+        buffer.finish()
+
+        assert_that(list(buffer), equal_to([b"a", b"b"]))
+
+    def test_holds_at_most_a_bounded_number_of_frames(self):
+        buffer = _ChunkBuffer(threading.Event())
+        producer = threading.Thread(
+            target=lambda: [buffer.put(b"f") for _ in range(CHUNK_BUFFER_FRAMES * 3)]
+        )
+        producer.start()
+        producer.join(timeout=0.5)
+
+        assert_that(producer.is_alive(), is_(True))
+        assert_that(buffer._frames.qsize(), equal_to(CHUNK_BUFFER_FRAMES))
+        consumed = 0
+        for _ in buffer:
+            consumed += 1
+            if consumed == CHUNK_BUFFER_FRAMES * 3:
+                break
+        producer.join()
+
+    def test_waiting_producer_gives_up_when_abandoned(self):
+        abandoned = threading.Event()
+        buffer = _ChunkBuffer(abandoned)
+        for _ in range(CHUNK_BUFFER_FRAMES):
+            buffer.put(b"f")
+        errors = []
+
+        def produce():
+            try:
+                buffer.put(b"one too many")
+            except RuntimeError as e:
+                errors.append(e)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        abandoned.set()
+        producer.join(timeout=5)
+
+        assert_that(producer.is_alive(), is_(False))
+        assert_that(len(errors), equal_to(1))
+
+
+class _FailingEncoder:
+    """Stands in for _AsyncFrameEncoder, failing like a crashed ffmpeg."""
+
+    def __init__(self, output_path: str, fps: int, fail_at: int = 5):
+        self.written = 0
+        self.fail_at = fail_at
+
+    async def __aenter__(self) -> "_FailingEncoder":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+    async def write(self, frame: bytes) -> None:
+        self.written += 1
+        if self.written == self.fail_at:
+            # Let the other chunks fill their queues first
+            await asyncio.sleep(0.05)
+            raise RuntimeError("ffmpeg failed to encode video: broken")
+
+
+async def _fake_capture(pool, html_content, width, height, times, on_frame):
+    for _ in times:
+        await asyncio.sleep(0)
+        await on_frame(b"frame")
+
+
+class TestStepVideoAsyncFailures:
+    """Tests for abandoning parallel async capture when encoding fails."""
+
+    def test_encoder_failure_is_raised_instead_of_hanging(self, monkeypatch):
+        monkeypatch.setattr(video_generator, "_capture_frames_async", _fake_capture)
+        monkeypatch.setattr(video_generator, "_AsyncFrameEncoder", _FailingEncoder)
+
+        async def step():
+            # 100 frames in 4 chunks, so the later chunks fill their queues
+            await asyncio.wait_for(
+                video_generator._step_video_async(
+                    AsyncBrowserPool(size=4), "", "out.webm",
+                    duration_ms=10_000, fps=10, workers=4, width=10, height=10,
+                ),
+                timeout=5,
+            )
+
+        with pytest.raises(RuntimeError, match="ffmpeg failed"):
+            asyncio.run(step())
+
+
+class TestEncoderExits:
+    """Tests for writing frames after ffmpeg has exited."""
+
+    @pytest.fixture(autouse=True)
+    def exiting_ffmpeg(self, monkeypatch):
+        monkeypatch.setattr(
+            video_generator,
+            "_ffmpeg_command",
+            lambda output_path, fps: [
+                sys.executable, "-c", "import sys; sys.stderr.write('bad input'); sys.exit(1)"
+            ],
+        )
+
+    def test_write_raises_runtime_error(self, tmp_path: Path):
+        with pytest.raises(RuntimeError, match="ffmpeg failed to encode video: bad input"):
+            with _FrameEncoder(str(tmp_path / "video.webm"), 10) as encoder:
+                for _ in range(1000):
+                    encoder.write(b"x" * 65536)
+
+    def test_async_write_raises_runtime_error(self, tmp_path: Path):
+        async def encode():
+            async with _AsyncFrameEncoder(str(tmp_path / "video.webm"), 10) as encoder:
+                for _ in range(1000):
+                    await encoder.write(b"x" * 65536)
+
+        with pytest.raises(RuntimeError, match="ffmpeg failed to encode video: bad input"):
+            asyncio.run(encode())
+
+
+class TestScratchDirectory:
+    """Tests for per-job scratch directories."""
+
+    def test_created_next_to_output_and_removed(self, tmp_path: Path):
+        output_path = tmp_path / "out" / "video.webm"
+        output_path.parent.mkdir()
+
+        with _scratch_directory(str(output_path)) as scratch:
+            assert_that(Path(scratch).parent, equal_to(output_path.parent))
+            (Path(scratch) / "partial.webm").write_bytes(b"data")
+
+        assert_that(os.listdir(output_path.parent), equal_to([]))
+
+    def test_each_job_gets_its_own_directory(self, tmp_path: Path):
+        output_path = str(tmp_path / "video.webm")
+
+        with _scratch_directory(output_path) as first:
+            with _scratch_directory(output_path) as second:
+                assert_that(first, is_not(equal_to(second)))
+
+    def test_removed_when_the_job_fails(self, tmp_path: Path):
+        with pytest.raises(RuntimeError):
+            with _scratch_directory(str(tmp_path / "video.webm")):
+                raise RuntimeError("recording failed")
+
+        assert_that(sorted(os.listdir(tmp_path)), equal_to([".config"]))
+
+    def test_uses_configured_scratch_dir(self, tmp_path: Path):
+        scratch_root = tmp_path / "scratch"
+        (tmp_path / ".config" / "mcp-svg-animator" / "config.yaml").write_text(
+            f"render_cache:\n  enabled: false\nvideo:\n  scratch_dir: {scratch_root}\n"
+        )
+        clear_config_cache()
+
+        with _scratch_directory(str(tmp_path / "video.webm")) as scratch:
+            assert_that(Path(scratch).parent, equal_to(scratch_root))
+
+
+class TestMoveIntoPlace:
+    """Tests for moving finished videos to their output path."""
+
+    def test_replaces_existing_output(self, tmp_path: Path):
+        source = tmp_path / "source.webm"
+        source.write_bytes(b"new")
+        output = tmp_path / "output.webm"
+        output.write_bytes(b"old")
+
+        _move_into_place(str(source), str(output))
+
+        assert_that(output.read_bytes(), equal_to(b"new"))
+        assert_that(source.exists(), is_(False))
+
+    def test_copies_across_filesystems(self, tmp_path: Path, monkeypatch):
+        source = tmp_path / "source.webm"
+        source.write_bytes(b"video")
+        output = tmp_path / "output.webm"
+        real_replace = os.replace
+
+        def replace(src, dst):
+            if Path(src) == source:
+                raise OSError(errno.EXDEV, "Invalid cross-device link")
+            real_replace(src, dst)
+
+        monkeypatch.setattr(os, "replace", replace)
+
+        _move_into_place(str(source), str(output))
+
+        assert_that(output.read_bytes(), equal_to(b"video"))
+        assert_that(list(tmp_path.glob(".tmp-*")), equal_to([]))
+
+
+class TestFrameTimes:
+    """Tests for frame timeline positions."""
+
+    def test_one_frame_per_interval(self):
+        assert_that(_frame_times(500, 4), equal_to([0.0, 0.25]))
+
+    def test_rounds_partial_frames_up(self):
+        assert_that(len(_frame_times(1010, 10)), equal_to(11))
+
+    def test_always_has_at_least_one_frame(self):
+        assert_that(_frame_times(0, 30), equal_to([0.0]))
+
+    def test_rejects_non_positive_fps(self):
+        with pytest.raises(ValueError, match="fps must be positive"):
+            _frame_times(1000, 0)
+
+
+class TestSplitFrames:
+    """Tests for splitting frames into parallel chunks."""
+
+    def test_splits_into_contiguous_chunks_in_order(self):
+        chunks = _split_frames([0.0, 0.1, 0.2, 0.3, 0.4], 2)
+
+        assert_that(chunks, equal_to([[0.0, 0.1, 0.2], [0.3, 0.4]]))
+
+    def test_never_creates_empty_chunks(self):
+        chunks = _split_frames([0.0, 0.1], 4)
+
+        assert_that(chunks, equal_to([[0.0], [0.1]]))
+
+    def test_rejects_fewer_than_one_worker(self):
+        with pytest.raises(ValueError, match="workers must be at least 1"):
+            _split_frames([0.0], 0)
+
+
+@requires_ffmpeg
+class TestFrameSteppedVideo:
+    """Tests for frame-stepped (fps) video export."""
+
+    def test_creates_video_file(self, tmp_path: Path):
+        output_path = tmp_path / "stepped.webm"
+
+        create_video_from_svg(ANIMATED_SVG, str(output_path), duration_ms=500, fps=10)
+
+        assert_that(output_path.stat().st_size, greater_than(0))
+
+    def test_output_is_identical_across_runs(self, tmp_path: Path):
+        first = tmp_path / "first.webm"
+        second = tmp_path / "second.webm"
+
+        create_video_from_svg(ANIMATED_SVG, str(first), duration_ms=500, fps=10)
+        create_video_from_svg(ANIMATED_SVG, str(second), duration_ms=500, fps=10)
+
+        assert_that(first.read_bytes(), equal_to(second.read_bytes()))
+
+    def test_parallel_capture_matches_serial_capture(self, tmp_path: Path):
+        serial = tmp_path / "serial.webm"
+        parallel = tmp_path / "parallel.webm"
+
+        with BrowserPool(size=3) as pool:
+            create_video_from_svg(
+                ANIMATED_SVG, str(serial), duration_ms=1000, fps=10, pool=pool
+            )
+            create_video_from_svg(
+                ANIMATED_SVG, str(parallel), duration_ms=1000, fps=10, pool=pool, workers=3
+            )
+
+        assert_that(parallel.read_bytes(), equal_to(serial.read_bytes()))
+
+    def test_async_parallel_capture_matches_serial_capture(self, tmp_path: Path):
+        serial = tmp_path / "serial.webm"
+        parallel = tmp_path / "parallel.webm"
+
+        async def scenario():
+            pool = AsyncBrowserPool(size=3)
+            try:
+                await create_video_from_svg_async(
+                    ANIMATED_SVG, str(serial), duration_ms=1000, fps=10, pool=pool
+                )
+                await create_video_from_svg_async(
+                    ANIMATED_SVG, str(parallel), duration_ms=1000, fps=10, pool=pool,
+                    workers=3,
+                )
+            finally:
+                await pool.close()
+
+        asyncio.run(scenario())
+
+        assert_that(parallel.read_bytes(), equal_to(serial.read_bytes()))
@@ -3,9 +3,15 @@
 from pathlib import Path
 
 import pytest
-from hamcrest import assert_that, contains_string
+from hamcrest import assert_that, contains_string, equal_to, has_entries, same_instance
 
-from mcp_svg_animator.generators.yaml_loader import create_diagram_from_yaml
+from mcp_svg_animator.generators.yaml_loader import (
+    LibraryCache,
+    _DefinitionExpander,
+    _expand_element,
+    create_diagram_from_yaml,
+    get_library_cache,
+)
 
 
 class TestCreateDiagramFromYaml:
@@ -243,7 +249,7 @@ elements:
         result = create_diagram_from_yaml(yaml_content)
 
         assert_that(result, contains_string('<marker'))
-        assert_that(result, contains_string('marker-end="url(#arrow)"'))
+        assert_that(result, contains_string('marker-end="url(#arrow-black)"'))
 
 
 class TestTextElements:
@@ -280,3 +286,157 @@ elements:
         result = create_diagram_from_yaml(yaml_content)
 
         assert_that(result, contains_string('text-anchor="middle"'))
+
+
+class TestLibraryCache:
+    """Tests for the library file cache."""
+
+    def test_parses_each_library_once(self, tmp_path: Path):
+        library_file = tmp_path / "shapes.yaml"
+        library_file.write_text("dot:\n  type: circle\n  r: 2\n")
+        cache = LibraryCache()
+
+        first = cache.load(library_file)
+        second = cache.load(library_file)
+
+        assert_that(second, same_instance(first))
+        assert_that(cache.stats(), has_entries(hits=1, misses=1, entries=1))
+
+    def test_reloads_changed_library(self, tmp_path: Path):
+        library_file = tmp_path / "shapes.yaml"
+        library_file.write_text("dot:\n  type: circle\n  r: 2\n")
+        cache = LibraryCache()
+        cache.load(library_file)
+
+        library_file.write_text("dot:\n  type: circle\n  r: 20\n")
+
+        assert_that(cache.load(library_file)["dot"]["r"], equal_to(20))
+        assert_that(cache.stats(), has_entries(hits=0, misses=2, entries=1))
+
+    def test_evicts_least_recently_used(self, tmp_path: Path):
+        cache = LibraryCache(max_entries=2)
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / f"{name}.yaml"
+            path.write_text(f"{name}:\n  type: circle\n")
+            paths.append(path)
+
+        cache.load(paths[0])
+        cache.load(paths[1])
+        cache.load(paths[0])
+        cache.load(paths[2])
+        cache.load(paths[0])
+
+        assert_that(cache.stats(), has_entries(hits=2, misses=3, entries=2))
+
+    def test_evicts_by_size(self, tmp_path: Path):
+        library_file = tmp_path / "big.yaml"
+        library_file.write_text("big:\n  type: circle\n")
+        cache = LibraryCache(max_bytes=1)
+
+        cache.load(library_file)
+
+        assert_that(cache.stats(), has_entries(entries=0, bytes=0))
+
+    def test_raises_error_for_missing_library(self, tmp_path: Path):
+        with pytest.raises(FileNotFoundError, match="Library file not found"):
+            LibraryCache().load(tmp_path / "missing.yaml")
+
+    def test_diagrams_share_the_process_wide_cache(self, tmp_path: Path):
+        library_file = tmp_path / "shapes.yaml"
+        library_file.write_text("dot:\n  type: circle\n  cx: 5\n  cy: 5\n  r: 2\n")
+        get_library_cache().clear()
+        for fill in ("red", "blue"):
+            create_diagram_from_yaml(f"""
+libraries:
+  - {library_file}
+elements:
+  - use: dot
+    fill: {fill}
+""")
+
+        assert_that(get_library_cache().stats(), has_entries(hits=1, misses=1))
+
+
+class TestNestedDefinitions:
+    """Tests for definitions that use other definitions and nested uses."""
+
+    def test_definition_uses_another_definition(self):
+        definitions = {
+            "base": {"type": "circle", "r": 5, "fill": "red"},
+            "big": {"use": "base", "r": 50},
+            "big_blue": {"use": "big", "fill": "blue"},
+        }
+
+        expanded = _expand_element({"use": "big_blue", "cx": 1}, definitions)
+
+        assert_that(expanded, equal_to({"type": "circle", "r": 50, "fill": "blue", "cx": 1}))
+
+    def test_expands_uses_inside_groups(self):
+        yaml_content = """
+definitions:
+  dot:
+    type: circle
+    r: 3
+    fill: green
+  pair:
+    type: group
+    elements:
+      - use: dot
+        cx: 0
+        cy: 0
+      - use: dot
+        cx: 10
+        cy: 0
+elements:
+  - type: group
+    transform: "translate(5, 5)"
+    elements:
+      - use: pair
+"""
+        result = create_diagram_from_yaml(yaml_content)
+
+        assert_that(result.count('fill="green"'), equal_to(2))
+
+    def test_shares_expanded_definitions(self):
+        definitions = {
+            "base": {"type": "circle", "r": 5},
+            "child": {"use": "base", "fill": "red"},
+        }
+        expander = _DefinitionExpander(definitions)
+
+        first = expander.element({"use": "child"})
+        second = expander.element({"use": "child"})
+
+        assert_that(second, same_instance(first))
+        assert_that(definitions["child"], equal_to({"use": "base", "fill": "red"}))
+
+    def test_leaves_elements_without_uses_alone(self):
+        group = {"type": "group", "elements": [{"type": "circle", "r": 1}]}
+
+        assert_that(_expand_element(group, {}), same_instance(group))
+
+    def test_expands_long_inheritance_chains(self):
+        definitions = {"d0": {"type": "circle", "r": 1}}
+        for i in range(1, 5000):
+            definitions[f"d{i}"] = {"use": f"d{i - 1}", "r": i}
+
+        expanded = _expand_element({"use": "d4999"}, definitions)
+
+        assert_that(expanded, equal_to({"type": "circle", "r": 4999}))
+
+    def test_raises_error_for_cycle(self):
+        definitions = {
+            "a": {"use": "b"},
+            "b": {"type": "group", "elements": [{"use": "c"}]},
+            "c": {"use": "a", "fill": "red"},
+        }
+
+        with pytest.raises(ValueError, match="Circular definition reference: a -> b -> c -> a"):
+            _expand_element({"use": "a"}, definitions)
+
+    def test_raises_error_for_unknown_nested_definition(self):
+        definitions = {"a": {"use": "missing"}}
+
+        with pytest.raises(ValueError, match="Unknown definition: missing"):
+            _expand_element({"use": "a"}, definitions)